@@ -1,8 +1,13 @@
 """TBA"""
 
 import inspect
+import random
+import bisect
+import itertools
+import heapq
 import json
-import re
+import time
+import io
 
 from ..package import enforce_hard_deps as _enforce_hard_deps
 from ..package.autocli import (
@@ -19,7 +24,11 @@ if _ty.TYPE_CHECKING:
     import _typeshed as _tsh
 import types as _ts
 
-__deps__: list[str] = []
+from ..package import optional_import as _optional_import
+
+_np = _optional_import("numpy")
+
+__deps__: list[str] = ["numpy==1.26.4"]
 __hard_deps__: list[str] = []
 _enforce_hard_deps(__hard_deps__, __name__)
 
@@ -155,16 +164,30 @@ class Sorters(_ty.Generic[_T]):
         - bubble_sort: Sorts using bubble sort.
         - quick_sort: Sorts using the quicksort algorithm.
         - merge_sort: Sorts using the merge sort algorithm.
+        - intro_sort: Quicksort with heapsort and insertion sort fallbacks, O(n log n) worst case.
+        - tim_sort: Natural runs, binary insertion sort and pairwise run merging.
+        - radix_sort: LSD radix sort for integers.
+        - numpy_sort: Sorts numeric lists with numpy.argsort.
 
-    Quicksort and merge sort utilize recursive helper methods (_quick_helper and _merge)
-    and partition/merge functions to efficiently sort the list.
+    `sort()` dispatches to any of them by name and picks one with "auto", `argsort()` returns
+    the sorting order and `benchmark()` times the algorithms on different data shapes.
 
-    All sorting methods operate on a copy of the input list, ensuring that the original
-    list remains unchanged.
+    Quicksort and merge sort utilize helper methods (_quick_helper and _merge) and
+    partition/merge functions to efficiently sort the list.
 
-    This class works with any elements that support comparison operations (e.g., <, >, <=, >=).
+    The classic sorting methods operate on a copy of the input list, ensuring that the original
+    list remains unchanged, the newer ones can sort in place with `in_place=True`.
+
+    This class works with any elements that support comparison operations (e.g., <, >, <=, >=),
+    except radix_sort, which needs integers.
     """
 
+    _SMALL_RANGE: int = 16  # Ranges up to this size are insertion sorted by intro_sort
+    _MIN_RUN: int = 32  # The minimum run length of tim_sort
+    _QUADRATIC: frozenset[str] = frozenset({"selection", "insertion", "switch", "bubble"})
+    _QUADRATIC_LIMIT: int = 2_000  # benchmark() skips quadratic algorithms above this size
+    _COPYING: frozenset[str] = _QUADRATIC | {"quick", "merge"}  # No in_place parameter
+
     @staticmethod
     def selection_sort(iterable: list[_T]) -> list[_T]:
         """
@@ -258,22 +281,30 @@ class Sorters(_ty.Generic[_T]):
     @classmethod
     def _quick_helper(cls, iterable: list[_T], low: int, high: int) -> None:
         """
-        Recursively sorts sublists in quicksort.
+        Sorts sublists in quicksort. Only the smaller side of every partition is sorted
+        recursively, the larger one is handled by the loop, so the recursion depth stays
+        below log2(n) even for sorted input.
 
         Args:
             iterable (list[T]): The list to be sorted.
             low (int): The starting index of the sublist to sort.
             high (int): The ending index of the sublist to sort.
         """
-        if low < high:
-            pi = cls._partition(iterable, low, high)
-            cls._quick_helper(iterable, low, pi - 1)
-            cls._quick_helper(iterable, pi + 1, high)
+        while low < high:
+            lt, gt = cls._partition(iterable, low, high)
+            if lt - low < high - gt:
+                cls._quick_helper(iterable, low, lt - 1)
+                low = gt + 1
+            else:
+                cls._quick_helper(iterable, gt + 1, high)
+                high = lt - 1
 
     @classmethod
-    def _partition(cls, iterable: list[_T], low: int, high: int) -> int:
+    def _partition(cls, iterable: list[_T], low: int, high: int) -> tuple[int, int]:
         """
-        Partitions the list for quicksort by selecting a pivot and arranging elements.
+        Partitions the list for quicksort around the median of the first, middle and last element.
+        Elements equal to the pivot are gathered in the middle, so runs of duplicates are not
+        partitioned again.
 
         Args:
             iterable (list[T]): The list to be partitioned.
@@ -281,16 +312,22 @@ class Sorters(_ty.Generic[_T]):
             high (int): The ending index of the partition.
 
         Returns:
-            int: The partition index where the pivot element is placed.
+            tuple[int, int]: The first and last index of the elements equal to the pivot.
         """
-        pivot = iterable[high]
-        i = low - 1
-        for j in range(low, high):
-            if iterable[j] <= pivot:
+        pivot = sorted((iterable[low], iterable[(low + high) // 2], iterable[high]))[1]
+        lt, i, gt = low, low, high
+        while i <= gt:
+            item = iterable[i]
+            if item < pivot:
+                iterable[lt], iterable[i] = item, iterable[lt]
+                lt += 1
+                i += 1
+            elif pivot < item:
+                iterable[gt], iterable[i] = item, iterable[gt]
+                gt -= 1
+            else:
                 i += 1
-                iterable[i], iterable[j] = iterable[j], iterable[i]
-        iterable[i + 1], iterable[high] = iterable[high], iterable[i + 1]
-        return i + 1
+        return lt, gt
 
     @classmethod
     def quick_sort(cls, iterable: list[_T]) -> list[_T]:
@@ -378,6 +415,371 @@ class Sorters(_ty.Generic[_T]):
         cls._merge(iterable, help_arr, 0, len(iterable) - 1)
         return iterable
 
+    @staticmethod
+    def _insertion_sort_range(iterable: list[_T], low: int, high: int) -> None:
+        """
+        Stable binary insertion sort of iterable[low:high], moving elements with slice assignments.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            low (int): The starting index of the range.
+            high (int): The index behind the end of the range.
+        """
+        for i in range(low + 1, high):
+            item = iterable[i]
+            position = bisect.bisect_right(iterable, item, low, i)
+            if position != i:
+                iterable[position + 1 : i + 1] = iterable[position:i]
+                iterable[position] = item
+
+    @staticmethod
+    def _heap_sort_range(iterable: list[_T], low: int, high: int) -> None:
+        """
+        Heapsorts iterable[low:high], the O(n log n) fallback of introsort.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            low (int): The starting index of the range.
+            high (int): The index behind the end of the range.
+        """
+        heap = iterable[low:high]
+        heapq.heapify(heap)
+        iterable[low:high] = [heapq.heappop(heap) for _ in range(high - low)]
+
+    @classmethod
+    def _intro_helper(cls, iterable: list[_T], low: int, high: int, depth: int) -> None:
+        """
+        Sorts iterable[low:high] with quicksort until `depth` partitions were made, after that
+        the range is heapsorted. Small ranges are finished with insertion sort.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            low (int): The starting index of the range.
+            high (int): The index behind the end of the range.
+            depth (int): The number of partitions left before falling back to heapsort.
+        """
+        while high - low > cls._SMALL_RANGE:
+            if depth == 0:
+                cls._heap_sort_range(iterable, low, high)
+                return
+            depth -= 1
+            lt, gt = cls._partition(iterable, low, high - 1)
+            if lt - low < high - gt:
+                cls._intro_helper(iterable, low, lt, depth)
+                low = gt + 1
+            else:
+                cls._intro_helper(iterable, gt + 1, high, depth)
+                high = lt
+        cls._insertion_sort_range(iterable, low, high)
+
+    @classmethod
+    def intro_sort(cls, iterable: list[_T], in_place: bool = False) -> list[_T]:
+        """
+        Performs introsort: quicksort with a median-of-three pivot that switches to heapsort
+        once the recursion gets deeper than 2 * log2(n) and to insertion sort for small ranges.
+        This keeps the worst case at O(n log n). It is not stable.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            in_place (bool): Sort the list itself instead of a copy.
+
+        Returns:
+            list[T]: The sorted list.
+        """
+        iterable = iterable if in_place else iterable.copy()
+        depth = 2 * max(1, len(iterable)).bit_length()
+        cls._intro_helper(iterable, 0, len(iterable), depth)
+        return iterable
+
+    @staticmethod
+    def _merge_runs(left: list[_T], right: list[_T]) -> list[_T]:
+        """
+        Stably merges two sorted runs. Instead of comparing element by element, it binary searches
+        how many elements of one run come before the next element of the other one and copies them
+        as a slice, which is a lot faster for partially ordered data.
+
+        Args:
+            left (list[T]): The first run.
+            right (list[T]): The second run.
+
+        Returns:
+            list[T]: The merged run.
+        """
+        result: list[_T] = []
+        i = j = 0
+        while i < len(left) and j < len(right):
+            end = bisect.bisect_right(left, right[j], i)  # Ties keep the left run first
+            result.extend(left[i:end])
+            i = end
+            if i < len(left):
+                end = bisect.bisect_left(right, left[i], j)
+                result.extend(right[j:end])
+                j = end
+        result.extend(left[i:])
+        result.extend(right[j:])
+        return result
+
+    @classmethod
+    def tim_sort(cls, iterable: list[_T], in_place: bool = False) -> list[_T]:
+        """
+        Performs a timsort-style hybrid: the list is split into natural runs (strictly descending
+        ones are reversed), runs shorter than `_MIN_RUN` are extended with binary insertion sort
+        and neighbouring runs are merged pairwise until one is left. Already ordered neighbours
+        are not merged at all, so presorted data is handled in O(n). It is stable.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            in_place (bool): Sort the list itself instead of a copy.
+
+        Returns:
+            list[T]: The sorted list.
+        """
+        iterable = iterable if in_place else iterable.copy()
+        length = len(iterable)
+        runs: list[tuple[int, int]] = []
+        start = 0
+        while start < length:
+            end = start + 1
+            if end < length and iterable[end] < iterable[start]:
+                while end < length and iterable[end] < iterable[end - 1]:
+                    end += 1
+                iterable[start:end] = iterable[start:end][::-1]
+            else:
+                while end < length and not iterable[end] < iterable[end - 1]:
+                    end += 1
+            if end - start < cls._MIN_RUN:
+                end = min(length, start + cls._MIN_RUN)
+                cls._insertion_sort_range(iterable, start, end)
+            runs.append((start, end))
+            start = end
+
+        while len(runs) > 1:
+            merged: list[tuple[int, int]] = []
+            for (left, mid), (_, right) in zip(runs[::2], runs[1::2]):
+                if iterable[mid] < iterable[mid - 1]:
+                    iterable[left:right] = cls._merge_runs(
+                        iterable[left:mid], iterable[mid:right]
+                    )
+                merged.append((left, right))
+            if len(runs) % 2:
+                merged.append(runs[-1])
+            runs = merged
+        return iterable
+
+    @staticmethod
+    def radix_sort(iterable: list[int], in_place: bool = False) -> list[int]:
+        """
+        Performs a least significant digit radix sort with 256 buckets per pass. Only works for
+        integers, negative ones are handled by offsetting every key by the minimum. It is stable
+        and needs one pass per byte of max - min.
+
+        Args:
+            iterable (list[int]): The list to be sorted.
+            in_place (bool): Sort the list itself instead of a copy.
+
+        Returns:
+            list[int]: The sorted list.
+        """
+        if not all(isinstance(item, int) for item in iterable):
+            raise TypeError("radix_sort can only sort integers.")
+        items = list(iterable)
+        if items:
+            low = min(items)
+            span = max(items) - low
+            shift = 0
+            while span >> shift:
+                buckets: list[list[int]] = [[] for _ in range(256)]
+                for item in items:
+                    buckets[((item - low) >> shift) & 0xFF].append(item)
+                items = [item for bucket in buckets for item in bucket]
+                shift += 8
+        if in_place:
+            iterable[:] = items
+            return iterable
+        return items
+
+    @staticmethod
+    def _numeric_array(iterable: list[_ty.Any]) -> "_np.ndarray | None":
+        """
+        Returns the list as a one dimensional int, uint or float ndarray, or None if NumPy is
+        missing, the elements are not plain numbers or they can't be converted exactly.
+        """
+        if _np is None or len(iterable) == 0:
+            return None
+        try:
+            array = _np.asarray(iterable)
+        except (ValueError, TypeError, OverflowError):
+            return None
+        if array.ndim != 1 or array.dtype.kind not in "iuf":
+            return None
+        if array.dtype.kind == "f" and any(
+            isinstance(item, (int, _np.integer)) and not -2 ** 53 <= item <= 2 ** 53 for item in iterable
+        ):
+            return None  # Mixed in floats (or ints beyond 64 bits) would round large ints
+        return array
+
+    @classmethod
+    def argsort(cls, iterable: list[_T]) -> list[int]:
+        """
+        Returns the indices that would sort the list, stable. Numeric lists are handled by
+        `numpy.argsort`, everything else by the builtin sort.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+
+        Returns:
+            list[int]: The indices of the elements in sorted order.
+        """
+        array = cls._numeric_array(iterable)
+        if array is not None:
+            return _np.argsort(array, kind="stable").tolist()
+        return sorted(range(len(iterable)), key=iterable.__getitem__)
+
+    @classmethod
+    def numpy_sort(cls, iterable: list[_T], in_place: bool = False) -> list[_T]:
+        """
+        Sorts numeric lists with `numpy.argsort` and reorders the original elements, so ints stay
+        ints even if the list also contains floats. ndarrays are sorted directly. Falls back to the
+        builtin sort for other elements or if NumPy is not installed. It is stable.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            in_place (bool): Sort the list itself instead of a copy.
+
+        Returns:
+            list[T]: The sorted list.
+        """
+        array = cls._numeric_array(iterable)
+        if array is iterable:  # Already an ndarray, no need to reorder python objects
+            items = _np.sort(array, kind="stable")
+        elif array is None:
+            items = sorted(iterable)
+        else:
+            items = [iterable[i] for i in _np.argsort(array, kind="stable").tolist()]
+        if in_place:
+            iterable[:] = items
+            return iterable
+        return items
+
+    @classmethod
+    def sort(
+        cls, iterable: list[_T], algorithm: str = "auto", in_place: bool = False
+    ) -> list[_T]:
+        """
+        Sorts with the given algorithm, the production entry point of this class.
+
+        Args:
+            iterable (list[T]): The list to be sorted.
+            algorithm (str): The name of any `*_sort` method without the suffix (e.g. "intro"),
+                "builtin" for `sorted` or "auto", which uses NumPy for ndarrays and the builtin
+                sort for lists. Converting a list to an ndarray and back costs more than the
+                builtin sort saves, see `benchmark()`.
+            in_place (bool): Sort the list itself instead of a copy.
+
+        Returns:
+            list[T]: The sorted list.
+        """
+        if algorithm == "auto":
+            is_ndarray = _np is not None and isinstance(iterable, _np.ndarray)
+            algorithm = "numpy" if is_ndarray else "builtin"
+        if algorithm == "builtin":
+            if in_place:
+                iterable.sort()
+                return iterable
+            return sorted(iterable)
+        sorter = getattr(cls, f"{algorithm}_sort", None)
+        if sorter is None:
+            raise ValueError(f"Unknown sorting algorithm '{algorithm}'.")
+        if algorithm in cls._COPYING:
+            result = sorter(iterable)
+            if in_place:
+                iterable[:] = result
+                return iterable
+            return result
+        return sorter(iterable, in_place=in_place)
+
+    @staticmethod
+    def _benchmark_data(distribution: str, size: int, rng: random.Random) -> list[int]:
+        if distribution == "random":
+            return [rng.randrange(size * 10) for _ in range(size)]
+        elif distribution == "sorted":
+            return list(range(size))
+        elif distribution == "reversed":
+            return list(range(size, 0, -1))
+        elif distribution == "nearly_sorted":
+            data = list(range(size))
+            for _ in range(max(1, size // 100)):
+                i, j = rng.randrange(size), rng.randrange(size)
+                data[i], data[j] = data[j], data[i]
+            return data
+        elif distribution == "few_unique":
+            return [rng.randrange(10) for _ in range(size)]
+        raise ValueError(f"Unknown distribution '{distribution}'.")
+
+    @classmethod
+    def benchmark(
+        cls,
+        sizes: _a.Iterable[int] = (1_000, 10_000),
+        distributions: _a.Iterable[str] = (
+            "random",
+            "sorted",
+            "reversed",
+            "nearly_sorted",
+            "few_unique",
+        ),
+        algorithms: _a.Iterable[str] | None = None,
+        repeat: int = 3,
+        seed: int = 0,
+    ) -> dict[str, dict[int, dict[str, float]]]:
+        """
+        Times the sorting algorithms on generated integer data, so the fastest one for a
+        data shape can be picked, e.g. `min(result["random"][10_000].items(), key=lambda x: x[1])`.
+
+        Args:
+            sizes (Iterable[int]): The list lengths to test.
+            distributions (Iterable[str]): Any of "random", "sorted", "reversed",
+                "nearly_sorted" and "few_unique".
+            algorithms (Iterable[str] | None): Names as accepted by `sort()`. By default all
+                algorithms and "builtin", the quadratic ones only for sizes up to
+                `_QUADRATIC_LIMIT`.
+            repeat (int): How often every measurement is repeated, the best time counts.
+            seed (int): The seed for the generated data.
+
+        Returns:
+            dict[str, dict[int, dict[str, float]]]: The best time in seconds per
+                distribution, size and algorithm.
+        """
+        rng = random.Random(seed)
+        explicit = algorithms is not None
+        if algorithms is None:
+            algorithms = [
+                name[: -len("_sort")]
+                for name in dir(cls)
+                if name.endswith("_sort") and not name.startswith("_")
+            ] + ["builtin"]
+        algorithms = list(algorithms)
+        results: dict[str, dict[int, dict[str, float]]] = {}
+        for distribution in distributions:
+            results[distribution] = {}
+            for size in sizes:
+                data = cls._benchmark_data(distribution, size, rng)
+                timings: dict[str, float] = {}
+                for algorithm in algorithms:
+                    if (
+                        not explicit
+                        and algorithm in cls._QUADRATIC
+                        and size > cls._QUADRATIC_LIMIT
+                    ):
+                        continue
+                    best = float("inf")
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        cls.sort(data, algorithm)
+                        best = min(best, time.perf_counter() - start)
+                    timings[algorithm] = best
+                results[distribution][size] = timings
+        return results
+
 
 def _custom_serializer(obj: _ty.Any) -> str:
     """
@@ -395,9 +797,134 @@ def _custom_serializer(obj: _ty.Any) -> str:
         raise TypeError(f"Type {type(obj)} not serializable")
 
 
+def _encode_json_scalar(value: _ty.Any) -> str | None:
+    """
+    Encodes strings, numbers, bools and None exactly like `json.dumps`, returns None for anything else.
+
+    Args:
+        value (any): The value to encode.
+
+    Returns:
+        str | None: The JSON text of the value or None if it is not a scalar.
+    """
+    if isinstance(value, str):
+        return json.encoder.encode_basestring_ascii(value)
+    elif value is None:
+        return "null"
+    elif value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif isinstance(value, int):
+        return int.__repr__(value)
+    elif isinstance(value, float):
+        if value != value:
+            return "NaN"
+        elif value in (float("inf"), float("-inf")):
+            return "Infinity" if value > 0 else "-Infinity"
+        return float.__repr__(value)
+    return None
+
+
+def _encode_json_key(key: _ty.Any) -> str:
+    """
+    Encodes a dictionary key the way `json.dumps` does, non-string scalars become strings.
+
+    Args:
+        key (any): The key to encode.
+
+    Returns:
+        str: The key as a JSON string.
+    """
+    if isinstance(key, str):
+        return json.encoder.encode_basestring_ascii(key)
+    encoded = _encode_json_scalar(key)
+    if encoded is None:
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+    return json.encoder.encode_basestring_ascii(encoded)
+
+
+def dump_beautified_json(data: _ty.Any, f: _ty.TextIO, indent: int = 4) -> None:
+    """
+    Writes `data` to `f` as pretty-printed JSON in a single pass.
+
+    Dicts and lists are indented like `json.dumps(indent=indent)`, except lists that only contain
+    strings, numbers, bools, null and other non-container values, which are written on a single
+    line. This is decided while walking the structure, so nothing is serialized twice and only
+    small chunks of text are kept in memory. Objects JSON does not support are written as their
+    str() representation.
+
+    Args:
+        data (any): The data to write, usually a dictionary.
+        f (TextIO): The file-like object to write to.
+        indent (int): The number of spaces per nesting level.
+    """
+    parts: list[str] = []
+    markers: set[int] = set()
+
+    def write_value(value: _ty.Any, level: int) -> None:
+        encoded = _encode_json_scalar(value)
+        if encoded is not None:
+            parts.append(encoded)
+        elif isinstance(value, (list, tuple)):
+            write_list(value, level)
+        elif isinstance(value, dict):
+            write_dict(value, level)
+        else:
+            parts.append(json.encoder.encode_basestring_ascii(_custom_serializer(value)))
+        if len(parts) >= 4096:
+            f.write("".join(parts))
+            parts.clear()
+
+    def enter(container: list | tuple | dict) -> None:
+        if id(container) in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(id(container))
+
+    def write_list(value: list | tuple, level: int) -> None:
+        if not value:
+            parts.append("[]")
+            return
+        enter(value)
+        if not any(isinstance(item, (list, tuple, dict)) for item in value):
+            parts.append("[")
+            for i, item in enumerate(value):
+                if i:
+                    parts.append(", ")
+                write_value(item, level)
+            parts.append("]")
+        else:
+            inner = "\n" + " " * (indent * (level + 1))
+            parts.append("[")
+            for i, item in enumerate(value):
+                parts.append("," + inner if i else inner)
+                write_value(item, level + 1)
+            parts.append("\n" + " " * (indent * level) + "]")
+        markers.discard(id(value))
+
+    def write_dict(value: dict, level: int) -> None:
+        if not value:
+            parts.append("{}")
+            return
+        enter(value)
+        inner = "\n" + " " * (indent * (level + 1))
+        parts.append("{")
+        for i, (key, item) in enumerate(value.items()):
+            parts.append("," + inner if i else inner)
+            parts.append(_encode_json_key(key))
+            parts.append(": ")
+            write_value(item, level + 1)
+        parts.append("\n" + " " * (indent * level) + "}")
+        markers.discard(id(value))
+
+    write_value(data, 0)
+    f.write("".join(parts))
+
+
 def beautify_json(data_dict: dict[str, _ty.Any]) -> str:
     """
-    Beautifies a dictionary by converting it to a pretty-printed JSON string.
+    Beautifies a dictionary by converting it to a pretty-printed JSON string,
+    see `dump_beautified_json` for the format.
 
     Args:
         data_dict (dict): The dictionary to be beautified.
@@ -405,31 +932,9 @@ def beautify_json(data_dict: dict[str, _ty.Any]) -> str:
     Returns:
         str: The beautified JSON string.
     """
-    # Convert dictionary to a pretty-printed JSON string using custom serializer
-    pretty_json = json.dumps(
-        data_dict, indent=4, sort_keys=False, default=_custom_serializer
-    )
-
-    def compact_simple_lists(
-        match,
-    ):  # Replace simple lists with compact versions, but leave complex ones alone
-        contents = match.group(1)
-        # Check if all items are primitives (strings/numbers/bools/null)
-        try:
-            parsed = json.loads(f"[{contents}]")
-            if all(isinstance(x, (str, int, float, bool, type(None))) for x in parsed):
-                return f"[{', '.join(json.dumps(x) for x in parsed)}]"
-        except Exception:
-            pass
-        return match.group(0)
-
-    pretty_json = re.sub(  # Regex matches lists that span multiple lines with only simple elements
-        r"\[\s*((?:[^{}\[\]]|\n)+?)\s*]",  # Match contents inside [...]
-        compact_simple_lists,
-        pretty_json,
-        flags=re.MULTILINE,
-    )
-    return pretty_json
+    buffer = io.StringIO()
+    dump_beautified_json(data_dict, buffer)
+    return buffer.getvalue()
 
 
 if _ty.TYPE_CHECKING:
@@ -523,19 +1028,62 @@ def isOddFloat(x: float | str) -> tuple[bool, bool]:
     return isOddInt(int(expo)) == 1, isOddInt(int(dec)) == 1
 
 
-class StdList(list):
-    """A list with extended behavior for setting defaults and flexible indexing.
+class _StdListBase(list):
+    """The behavior shared by StdList and SlottedStdList, see StdList."""
 
-    Supports:
-    - Default value generation for out-of-bounds indices.
-    - Tuple indexing for retrieving multiple elements.
-    - Custom default values for non-existent indices.
-    """
+    __slots__ = ("default_factory",)
 
     def __init__(self, default_factory=None, *args) -> None:
         super().__init__(*args)
         self.default_factory = default_factory
 
+    def _expand(self, size: int) -> None:
+        """Grows the list to `size` elements in one go if there is a default factory."""
+        missing = size - len(self)
+        if missing > 0 and self.default_factory is not None:
+            factory = self.default_factory
+            self.extend([factory() for _ in range(missing)])
+
+    def _native_slice(self, indices: range) -> slice | None:
+        """
+        Expands the list to hold all `indices` and returns the equivalent native slice, or None if
+        some of them are negative and have to be used one by one.
+        """
+        if not indices:
+            return None
+        first, last = indices[0], indices[-1]
+        if min(first, last) < 0:  # Negative indices depend on the length while expanding
+            return None
+        self._expand(max(first, last) + 1)
+        if max(first, last) >= len(self):
+            raise IndexError("list index out of range")
+        stop = last + (1 if indices.step > 0 else -1)
+        return slice(first, None if stop < 0 else stop, indices.step)
+
+    def _get_slice(self, key: slice) -> tuple[_ty.Any, ...]:
+        indices = range(key.start or 0, key.stop or len(self), key.step or 1)
+        native = self._native_slice(indices)
+        if native is not None:
+            return tuple(super().__getitem__(native))
+        return tuple(self[index] for index in indices)
+
+    def _set_slice(self, key: slice, value: _ty.Any, exact: bool = True) -> None:
+        indices = range(key.start or 0, key.stop or len(self), key.step or 1)
+        if isinstance(value, (list, tuple)):
+            if not exact:  # Tuple keys only use as many values as the slice covers
+                value = value[: len(indices)]
+            if len(value) != len(indices):
+                raise ValueError("Value must match length of slice range.")
+        else:
+            value = [value] * len(indices)
+        native = self._native_slice(indices)
+        if native is not None:
+            super().__setitem__(native, value)
+            return
+        for index, item in zip(indices, value):
+            self._expand(index + 1)
+            super().__setitem__(index, item)
+
     def __getitem__(self, key: _ty.Union[int, slice, tuple]) -> _ty.Any:
         # Handle tuple access: (i1, i2, ...), (slice1, slice2, ...), or (index, default)
         if isinstance(key, tuple):
@@ -551,23 +1099,16 @@ class StdList(list):
             result = []
             for part in key:
                 if isinstance(part, slice):
-                    result.extend(self[part])
+                    result.extend(self._get_slice(part))
                 else:
                     result.append(self[part])
-            return tuple(x for x in result)
-        elif isinstance(key, slice):
-            result = []
-            for part in range(key.start or 0, key.stop or len(self), key.step or 1):
-                result.append(self[part])
             return tuple(result)
+        elif isinstance(key, slice):
+            return self._get_slice(key)
 
         # Normal list indexing, auto-expand if needed
-        if (
-            isinstance(key, int)
-            and key >= len(self)
-            and self.default_factory is not None
-        ):
-            self.extend(self.default_factory() for _ in range(len(self), key + 1))
+        if isinstance(key, int) and key >= len(self):
+            self._expand(key + 1)
         return super().__getitem__(key)
 
     def __setitem__(self, key: _ty.Union[int, slice, tuple], value: _ty.Any) -> None:
@@ -580,41 +1121,16 @@ class StdList(list):
             for i, part in enumerate(key):
                 val = value[i] if isinstance(value, (list, tuple)) else value
                 if isinstance(part, slice):
-                    indices = range(
-                        part.start or 0, part.stop or len(self), part.step or 1
-                    )
-                    for j, idx in enumerate(indices):
-                        if idx >= len(self) and self.default_factory is not None:
-                            self.extend(
-                                self.default_factory()
-                                for _ in range(len(self), idx + 1)
-                            )
-                        self[idx] = val[j] if isinstance(val, (list, tuple)) else val
+                    self._set_slice(part, val, exact=False)
                 else:
-                    if part >= len(self) and self.default_factory is not None:
-                        self.extend(
-                            self.default_factory() for _ in range(len(self), part + 1)
-                        )
+                    self._expand(part + 1)
                     super().__setitem__(part, val)
             return
         elif isinstance(key, slice):
-            indices = range(key.start or 0, key.stop or len(self), key.step or 1)
-            if isinstance(value, (list, tuple)) and len(value) != len(indices):
-                raise ValueError("Value must match length of slice range.")
-            for i, idx in enumerate(indices):
-                val = value[i] if isinstance(value, (list, tuple)) else value
-                if idx >= len(self) and self.default_factory is not None:
-                    self.extend(
-                        self.default_factory() for _ in range(len(self), idx + 1)
-                    )
-                super().__setitem__(idx, val)
+            self._set_slice(key, value)
             return
-        if (
-            isinstance(key, int)
-            and key >= len(self)
-            and self.default_factory is not None
-        ):
-            self.extend(self.default_factory() for _ in range(len(self), key + 1))
+        if isinstance(key, int) and key >= len(self):
+            self._expand(key + 1)
         super().__setitem__(key, value)
 
     def get(self, key: int, default_factory=None) -> _ty.Any:
@@ -623,6 +1139,53 @@ class StdList(list):
         return super().__getitem__(key)
 
 
+class StdList(_StdListBase):
+    """A list with extended behavior for setting defaults and flexible indexing.
+
+    Supports:
+    - Default value generation for out-of-bounds indices.
+    - Tuple indexing for retrieving multiple elements.
+    - Custom default values for non-existent indices.
+
+    Slices are read and written with the native list slice operations, growing the list to
+    the needed size in a single step first.
+    """
+
+
+class SlottedStdList(_StdListBase):
+    """A StdList without an instance __dict__.
+
+    Behaves exactly like StdList, but every instance is a lot smaller because it only stores
+    its default factory in a slot. Use it for many small lists, like the rows of a large grid.
+    """
+
+    __slots__ = ()
+
+
+def iter_unnest(iterable: _a.Iterable, max_depth: int = 4) -> _a.Iterator[_ty.Any]:
+    """Lazily flatten a nested iterable structure up to a specified depth.
+
+    Nested lists are walked with an explicit stack of iterators, so neither the depth nor the
+    size of the structure is limited by the recursion limit or copied into memory.
+
+    Args:
+        iterable (Any): The nested structure to flatten.
+        max_depth (int): Maximum depth to flatten.
+
+    Yields:
+        Any: The elements in order, lists deeper than `max_depth` are yielded as they are.
+    """
+    stack: list[_a.Iterator[_ty.Any]] = [iter(iterable)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list) and len(stack) <= max_depth:
+                stack.append(iter(item))
+                break
+            yield item
+        else:
+            stack.pop()
+
+
 def unnest_iterable(iterable: _a.Iterable, max_depth: int = 4) -> list[_ty.Any]:
     """Flatten a nested iterable structure up to a specified depth.
 
@@ -633,18 +1196,42 @@ def unnest_iterable(iterable: _a.Iterable, max_depth: int = 4) -> list[_ty.Any]:
     Returns:
         list: A flattened list of elements up to `max_depth`.
     """
+    return list(iter_unnest(iterable, max_depth))
 
-    def _lod_helper(
-        curr_lod: list[_ty.Any | list], big_lster: list[_ty.Any], depth: int
-    ) -> list[_ty.Any]:
-        for x in curr_lod:
-            if isinstance(x, list) and depth > 0:
-                _lod_helper(x, big_lster, depth - 1)
-            else:
-                big_lster.append(x)
-        return big_lster
 
-    return _lod_helper(list(iterable), [], max_depth)
+def _pick_elements(
+    iterable: list | tuple | dict | set, indices: _a.Iterable[int]
+) -> dict[int, _ty.Any]:
+    """Fetch only the elements at `indices`, dict items are formatted as "key: value".
+
+    Lists and tuples are indexed directly, sets and dicts are iterated with `itertools.islice`
+    up to the largest requested position, so they are never copied.
+
+    Args:
+        iterable (list | tuple | dict | set): The container to pick from.
+        indices (Iterable[int]): The positions to fetch, negative ones count from the end.
+
+    Returns:
+        dict[int, Any]: The requested positions mapped to their elements.
+    """
+    if isinstance(iterable, (list, tuple)):
+        return {index: iterable[index] for index in indices}
+    n = len(iterable)
+    wanted: dict[int, list[int]] = {}  # Normalized position -> requested indices
+    for index in indices:
+        position = index + n if index < 0 else index
+        if not 0 <= position < n:
+            raise IndexError(f"{type(iterable).__name__} index out of range")
+        wanted.setdefault(position, []).append(index)
+    elements = iterable.items() if isinstance(iterable, dict) else iterable
+    picked: dict[int, _ty.Any] = {}
+    for position, element in enumerate(itertools.islice(elements, max(wanted, default=-1) + 1)):
+        if position in wanted:
+            if isinstance(iterable, dict):
+                element = f"{element[0]}: {element[1]}"
+            for index in wanted[position]:
+                picked[index] = element
+    return picked
 
 
 def cutoff_iterable(
@@ -675,12 +1262,9 @@ def cutoff_iterable(
         type(iterable).__name__
     ]
 
-    if isinstance(iterable, (tuple, set)):
-        iterable = list(iterable)
-    elif isinstance(iterable, dict):
-        iterable = [f"{key}: {value}" for key, value in iterable.items()]
-
     n = len(iterable)
+    if n == 0:
+        return [] if return_lst else braces
     max_elements_right, max_elements_left = (
         abs(max_elements_right),
         abs(max_elements_left),
@@ -688,6 +1272,7 @@ def cutoff_iterable(
     elements_shown = max_elements_right + max_elements_left + 1
     elements_start = max_elements_left
     show_lst: list[_ty.Any | None] = [None] * elements_shown
+    slots: list[tuple[int, int]] = []  # (index in show_lst, index in iterable)
 
     if start < max_elements_left:  # Adjusting for left overspill
         elements_start = start
@@ -695,16 +1280,15 @@ def cutoff_iterable(
         elements_start = (n - start) * -1
 
     for i in range(max_elements_right):
-        show_lst[(elements_start + i + 1) % elements_shown] = iterable[
-            (start + i + 1) % n
-        ]
+        slots.append(((elements_start + i + 1) % elements_shown, (start + i + 1) % n))
 
     for i in range(max_elements_left + 1, 1, -1):
-        show_lst[(elements_start - i + 1) % elements_shown] = iterable[
-            (start - i + 1) % n
-        ]
+        slots.append(((elements_start - i + 1) % elements_shown, (start - i + 1) % n))
 
-    show_lst[elements_start] = iterable[start]
+    slots.append((elements_start, start))
+    elements = _pick_elements(iterable, {index for _, index in slots})
+    for slot, index in slots:
+        show_lst[slot] = elements[index]
 
     left_hidden, right_hidden = (
         start - max_elements_left,
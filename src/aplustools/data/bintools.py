@@ -1,9 +1,21 @@
 """TBA"""
 
+import itertools
 import warnings
+import tempfile
+import bisect
+import pickle
 import struct
+import array
+import mmap
 import math
+import shutil
+import json
+import time
 import sys
+import os
+
+import concurrent.futures as _concurrent_futures
 
 from ..package import enforce_hard_deps as _enforce_hard_deps
 from . import cutoff_iterable as _cutoff_iterable
@@ -60,13 +72,8 @@ def encode_float(
     elif precision == "double":  # 64-bit float
         return struct.pack(">d", fp)
     elif precision == "quad":  # 128-bit float (if supported)
-        if sys.maxsize > 2**32:
-            try:
-                return struct.pack(">e", fp)
-            except struct.error:
-                raise ValueError("128-bit floats are not supported on this system.")
-        else:
-            raise ValueError("128-bit floats are not supported on this system.")
+        dtype = _quad_dtype()  # Raises if there is no real 128-bit float
+        return _np.array(fp, dtype=dtype).tobytes()
     else:
         raise ValueError(
             "Unsupported precision. Choose from 'half', 'single', 'double', 'quad'."
@@ -108,19 +115,113 @@ def decode_float(
     elif precision == "double":  # 64-bit float
         return struct.unpack(">d", bytes_like)[0]
     elif precision == "quad":  # 128-bit float (if supported)
-        if sys.maxsize > 2**32:
-            try:
-                return struct.unpack(">e", bytes_like)[0]
-            except struct.error:
-                raise ValueError("128-bit floats are not supported on this system.")
-        else:
-            raise ValueError("128-bit floats are not supported on this system.")
+        dtype = _quad_dtype()  # Raises if there is no real 128-bit float
+        return _np.frombuffer(bytes_like, dtype=dtype)[0]
     else:
         raise ValueError(
             "Unsupported precision. Choose from 'half', 'single', 'double', 'quad'."
         )
 
 
+def _quad_dtype() -> "_np.dtype":
+    """
+    Returns the big-endian NumPy dtype of a IEEE 754 binary128 float. This only exists if NumPy is
+    installed and `longdouble` is a real quad, x87 80-bit extended precision does not count.
+    """
+    if _np is None or _np.finfo(_np.longdouble).nmant != 112:
+        raise ValueError("128-bit floats are not supported on this system.")
+    return _np.dtype(_np.longdouble).newbyteorder(">")
+
+
+_FLOAT_FORMATS: dict[str, tuple[str, str, int]] = {
+    # precision: (numpy dtype, struct format, itemsize), the byte orders match encode_float
+    "half": ("=f2", "=e", 2),
+    "single": (">f4", ">f", 4),
+    "double": (">f8", ">d", 8),
+}
+
+
+def encode_floats(
+    values: "_a.Iterable[float] | _np.ndarray",
+    precision: _ty.Literal["half", "single", "double", "quad"] = "single",
+) -> bytes:
+    """
+    Encode a whole sequence of floating-point numbers into one contiguous byte string.
+
+    The result is the same as joining `encode_float` for every value, but the precision is only
+    looked at once and the conversion happens in a single NumPy `astype` or `struct.pack` call.
+
+    Args:
+        values: The floating-point numbers to encode.
+        precision: The precision of the floating-point representation. Options are 'half', 'single', 'double', 'quad'.
+
+    Returns:
+        The concatenated byte representation of all values.
+
+    Raises:
+        ValueError: If an unsupported precision is specified or 'quad' is not supported on this system.
+    """
+    if precision == "quad":
+        dtype = _quad_dtype()  # Raises if there is no real 128-bit float
+        return _np.asarray(values, dtype=dtype).tobytes()
+    try:
+        dtype, struct_format, _ = _FLOAT_FORMATS[precision]
+    except KeyError:
+        raise ValueError(
+            "Unsupported precision. Choose from 'half', 'single', 'double', 'quad'."
+        ) from None
+    if _np is not None:
+        return _np.asarray(values, dtype=dtype).tobytes()
+    values = values if isinstance(values, _a.Sequence) else list(values)
+    return struct.pack(f"{struct_format[0]}{len(values)}{struct_format[1]}", *values)
+
+
+def decode_floats(
+    bytes_like: "bytes | bytearray | memoryview | mmap.mmap",
+    precision: _ty.Literal["half", "single", "double", "quad"] = "single",
+) -> "_np.ndarray | array.array | list[float]":
+    """
+    Decode a contiguous buffer of floating-point numbers, as written by `encode_floats`.
+
+    Args:
+        bytes_like: The byte data to decode, its length has to be a multiple of the value size.
+        precision: The precision of the floating-point representation. Options are 'half', 'single', 'double', 'quad'.
+
+    Returns:
+        A native byte order ndarray of the given precision if NumPy is installed. Without it, an
+        array.array('f') or array.array('d') for 'single' and 'double' and a list for 'half'.
+
+    Raises:
+        ValueError: If an unsupported precision is specified, the buffer has a partial value at
+            the end or 'quad' is not supported on this system.
+    """
+    if precision == "quad":
+        dtype = _quad_dtype()
+        return _np.frombuffer(bytes_like, dtype=dtype).astype(dtype.newbyteorder("="))
+    try:
+        dtype, struct_format, itemsize = _FLOAT_FORMATS[precision]
+    except KeyError:
+        raise ValueError(
+            "Unsupported precision. Choose from 'half', 'single', 'double', 'quad'."
+        ) from None
+    data = memoryview(bytes_like).cast("B")
+    if len(data) % itemsize:
+        raise ValueError(
+            f"The buffer length {len(data)} is not a multiple of the {itemsize} byte value size."
+        )
+    if _np is not None:
+        return _np.frombuffer(data, dtype=dtype).astype(dtype[1:])
+    if precision == "half":
+        return list(struct.unpack(f"={len(data) // 2}e", data))
+    result = array.array(struct_format[1])
+    if result.itemsize != itemsize:  # Platforms where C float/double are unusual
+        return list(struct.unpack(f">{len(data) // itemsize}{struct_format[1]}", data))
+    result.frombytes(data)
+    if sys.byteorder == "little":
+        result.byteswap()
+    return result
+
+
 def bytes_length(data: int | float | str) -> int:
     """
     Calculate the number of bytes required to represent the given data.
@@ -463,15 +564,708 @@ def read_progressive_length(f: _ty.BinaryIO) -> int:
     return current_length
 
 
+def encode_varints(numbers: "_a.Iterable[int] | _np.ndarray") -> bytes:
+    """
+    Encode a whole sequence of integers back to back using varint encoding.
+
+    The output is the same as joining `to_varint_length` for every number, but with NumPy
+    all numbers below 2**64 are encoded at once, one pass per output byte position.
+
+    :param numbers: Non-negative integers.
+    :return: The concatenated varint-encoded byte sequence.
+    :raises ValueError: If any number is negative.
+    """
+    if _np is not None:
+        if not isinstance(numbers, (_a.Sequence, _np.ndarray)):
+            numbers = list(numbers)
+        try:
+            values = _np.asarray(numbers)
+        except (OverflowError, ValueError):
+            values = None  # Wider than 64 bits
+        if values is not None and values.dtype.kind in "iu" and values.ndim == 1:
+            if values.dtype.kind == "i":
+                if values.size and values.min() < 0:
+                    raise ValueError("Varint encoding does not support negative values.")
+            values = values.astype(_np.uint64, copy=False)
+            if values.size == 0:
+                return b""
+            counts = _np.ones(len(values), dtype=_np.int64)
+            for byte_index in range(1, 10):  # Bytes needed per number, at most 10 for 64 bits
+                counts += values >= _np.uint64(1 << (7 * byte_index))
+            starts = _np.cumsum(counts) - counts
+            result = _np.empty(int(counts.sum()), dtype=_np.uint8)
+            for byte_index in range(int(counts.max())):
+                used = counts > byte_index
+                part = (values[used] >> _np.uint64(7 * byte_index)) & _np.uint64(0x7F)
+                part |= _np.where(counts[used] > byte_index + 1, 0x80, 0).astype(_np.uint64)
+                result[starts[used] + byte_index] = part
+            return result.tobytes()
+
+    result = bytearray()
+    for x in numbers:
+        if x < 0:
+            raise ValueError("Varint encoding does not support negative values.")
+        while x > 0x7F:
+            result.append(0x80 | (x & 0x7F))  # Set MSB to 1 (continue)
+            x >>= 7
+        result.append(x)  # MSB 0 = end of sequence
+    return bytes(result)
+
+
+def decode_varints(
+    buffer: "bytes | bytearray | memoryview | mmap.mmap", count: int | None = None
+) -> array.array | list[int]:
+    """
+    Decode consecutive varint-encoded integers from a buffer.
+
+    Works directly on anything supporting the buffer protocol, no file object and no per-byte
+    `read()` calls are involved. With NumPy the end of every varint is found in one vectorized
+    pass and all numbers are assembled with `bitwise_or.reduceat`.
+
+    :param buffer: The bytes-like object holding the varints, starting at index 0.
+    :param count: How many numbers to decode, all of them if None.
+    :return: An array.array("Q") of the numbers, or a list if any of them is wider than 64 bits.
+    :raises EOFError: If the buffer ends inside a varint or holds fewer than `count` numbers.
+    """
+    data = memoryview(buffer).cast("B")
+    if count == 0:
+        return array.array("Q")
+
+    if _np is not None:
+        raw = _np.frombuffer(data, dtype=_np.uint8)
+        ends = _np.flatnonzero(raw < 0x80)
+        if count is not None:
+            if len(ends) < count:
+                raise EOFError("Unexpected EOF while reading varints.")
+            ends = ends[:count]
+        elif len(ends) == 0 or ends[-1] != len(raw) - 1:
+            if len(raw):
+                raise EOFError("Unexpected EOF while reading varint.")
+            return array.array("Q")
+        starts = _np.concatenate(([0], ends[:-1] + 1))
+        lengths = ends - starts + 1
+        if int(lengths.max()) < 10 or not (
+            (lengths > 10).any() or (raw[ends[lengths == 10]] > 1).any()
+        ):  # All numbers fit into 64 bits
+            used = raw[: int(ends[-1]) + 1]
+            shifts = (
+                _np.arange(len(used), dtype=_np.uint64)
+                - _np.repeat(starts, lengths).astype(_np.uint64)
+            ) * _np.uint64(7)
+            values = _np.bitwise_or.reduceat(
+                (used & 0x7F).astype(_np.uint64) << shifts, starts
+            )
+            result = array.array("Q")
+            result.frombytes(values.astype("=u8", copy=False).tobytes())
+            return result
+
+    numbers: list[int] = []
+    result_number = shift = 0
+    for byte in data:
+        result_number |= (byte & 0x7F) << shift
+        if byte & 0x80:  # MSB set means the varint goes on
+            shift += 7
+            continue
+        numbers.append(result_number)
+        result_number = shift = 0
+        if len(numbers) == count:
+            break
+    else:
+        if shift or (count is not None and len(numbers) < count):
+            raise EOFError("Unexpected EOF while reading varints.")
+    try:
+        return array.array("Q", numbers)
+    except OverflowError:
+        return numbers
+
+
+def iter_variable_bytes_like(
+    buffer: "bytes | bytearray | memoryview | mmap.mmap",
+) -> _a.Generator[memoryview, None, None]:
+    """
+    Iterate over consecutive varint-prefixed byte sequences, as written by `get_variable_bytes_like`.
+
+    The records are zero-copy memoryview slices of the buffer, so a whole file can be mapped
+    or read at once and parsed at memory speed.
+
+    :param buffer: The bytes-like object holding the records.
+    :return: A generator yielding one memoryview per record.
+    :raises EOFError: If the buffer ends inside a record.
+    """
+    data = memoryview(buffer).cast("B")
+    position, end = 0, len(data)
+    while position < end:
+        length = shift = 0
+        while True:
+            if position >= end:
+                raise EOFError("Unexpected EOF while reading varint.")
+            byte = data[position]
+            position += 1
+            length |= (byte & 0x7F) << shift
+            if not (byte & 0x80):
+                break
+            shift += 7
+        if position + length > end:
+            raise EOFError("Unexpected EOF while reading a varint-prefixed record.")
+        yield data[position : position + length]
+        position += length
+
+
+def encode_progressive_lengths(lengths: _a.Iterable[int]) -> bytes:
+    """
+    Encode a whole sequence of integers back to back using progressive length encoding.
+
+    Lengths below 256 are looked up in a table instead of being encoded one by one.
+
+    :param lengths: Non-negative integers.
+    :return: The concatenated progressive-length-encoded byte sequence.
+    :raises ValueError: If any length is negative.
+    """
+    table = _progressive_length_table()
+    return b"".join(
+        table[length] if 0 <= length < 256 else to_progressive_length(length)
+        for length in lengths
+    )
+
+
+def decode_progressive_lengths(
+    buffer: "bytes | bytearray | memoryview | mmap.mmap", count: int | None = None
+) -> list[int]:
+    """
+    Decode consecutive progressive length-encoded integers from a buffer.
+
+    :param buffer: The bytes-like object holding the encoded lengths, starting at index 0.
+    :param count: How many lengths to decode, all of them if None.
+    :return: The decoded lengths.
+    :raises EOFError: If the buffer ends inside a length or holds fewer than `count` lengths.
+    """
+    data = memoryview(buffer).cast("B")
+    lengths: list[int] = []
+    position, end = 0, len(data)
+    while position < end and len(lengths) != count:
+        current_length, goes_on = 1, True
+        while goes_on:
+            if position + current_length > end:
+                raise EOFError(
+                    "Unexpected end of buffer during progressive length decoding."
+                )
+            part = int.from_bytes(data[position : position + current_length], "big")
+            position += current_length
+            goes_on = (part & 1) == 1
+            current_length = part >> 1
+        lengths.append(current_length)
+    if count is not None and len(lengths) < count:
+        raise EOFError("Unexpected end of buffer during progressive length decoding.")
+    return lengths
+
+
+_PROGRESSIVE_LENGTH_TABLE: list[bytes] = []
+
+
+def _progressive_length_table() -> list[bytes]:
+    if not _PROGRESSIVE_LENGTH_TABLE:
+        with warnings.catch_warnings():  # Small lengths can trigger the buffer doubling
+            warnings.simplefilter("ignore", RuntimeWarning)
+            _PROGRESSIVE_LENGTH_TABLE.extend(to_progressive_length(x) for x in range(256))
+    return _PROGRESSIVE_LENGTH_TABLE
+
+
+_UNPACK_BLOCK: int = 64  # Values per pure-python block, 64 * bit_count bits is always byte aligned
+_NP_UNPACK_CHUNK: int = 1 << 20  # Values per numpy pass, bounds the temporary index arrays
+
+
+def _unpack_bits_python(
+    data: bytes | bytearray | memoryview, bit_offset: int, n: int, bit_count: int
+) -> list[int]:
+    """
+    Pure-python bulk decoder for `n` big-endian fields of `bit_count` bits starting at `bit_offset`.
+
+    Instead of walking single bits it converts whole blocks of `_UNPACK_BLOCK` fields into one
+    integer with `int.from_bytes` and slices the fields out of that word with shifts and a mask.
+    """
+    values: list[int] = []
+    mask = (1 << bit_count) - 1
+    start_byte, lead = bit_offset >> 3, bit_offset & 7
+
+    for first in range(0, n, _UNPACK_BLOCK):
+        count = min(_UNPACK_BLOCK, n - first)
+        block_start = lead + first * bit_count  # In bits, relative to start_byte
+        block_end = block_start + count * bit_count
+        byte_lo = start_byte + (block_start >> 3)
+        byte_hi = start_byte + ((block_end + 7) >> 3)
+        word = int.from_bytes(data[byte_lo:byte_hi], "big")
+        word >>= ((byte_hi - start_byte) << 3) - block_end  # Drop the trailing padding bits
+        values.extend(
+            [(word >> shift) & mask for shift in range((count - 1) * bit_count, -1, -bit_count)]
+        )
+    return values
+
+
+def _unpack_bits_numpy(
+    data: bytes | bytearray | memoryview, bit_offset: int, n: int, bit_count: int
+) -> "_np.ndarray":
+    """
+    NumPy bulk decoder for `n` big-endian fields of `bit_count` (<= 57) bits starting at `bit_offset`.
+
+    Every field fits into the 8 byte window starting at its first byte, so an overlapping strided
+    big-endian uint64 view gives us one word per field that only needs a shift and a mask.
+    """
+    result = _np.empty(n, dtype=_np.uint64)
+    mask = _np.uint64((1 << bit_count) - 1)
+    start_byte = bit_offset >> 3
+    end_byte = (bit_offset + n * bit_count + 7) >> 3
+    padded = _np.zeros(end_byte - start_byte + 8, dtype=_np.uint8)
+    padded[: end_byte - start_byte] = _np.frombuffer(
+        data, dtype=_np.uint8, count=end_byte - start_byte, offset=start_byte
+    )
+    windows = _np.ndarray(
+        shape=(end_byte - start_byte,), dtype=">u8", buffer=padded, strides=(1,)
+    )
+
+    for first in range(0, n, _NP_UNPACK_CHUNK):
+        count = min(_NP_UNPACK_CHUNK, n - first)
+        positions = _np.arange(first, first + count, dtype=_np.uint64) * _np.uint64(
+            bit_count
+        ) + _np.uint64(bit_offset & 7)
+        words = windows[positions >> _np.uint64(3)].astype(_np.uint64)
+        words >>= _np.uint64(64 - bit_count) - (positions & _np.uint64(7))
+        result[first : first + count] = words & mask
+    return result
+
+
+def _unpack_bits(
+    data: bytes | bytearray | memoryview, bit_offset: int, n: int, bit_count: int
+) -> "_np.ndarray | array.array | list[int]":
+    """
+    Decodes `n` big-endian fields of `bit_count` bits from `data`, starting at bit `bit_offset`.
+
+    Returns a uint64 ndarray if NumPy is available and the fields fit the fast path, an
+    array.array('Q') for fields of up to 64 bits otherwise and a plain list for anything wider.
+    """
+    if bit_count == 0 or n == 0:
+        if _np is not None:
+            return _np.zeros(n, dtype=_np.uint64)
+        return array.array("Q", bytes(8 * n))
+    if _np is not None and bit_count <= 57:
+        return _unpack_bits_numpy(data, bit_offset, n, bit_count)
+    values = _unpack_bits_python(data, bit_offset, n, bit_count)
+    if bit_count <= 64:
+        return array.array("Q", values)
+    return values
+
+
+_UNSIGNED_TYPECODES: dict[int, str] = {}  # itemsize -> array typecode
+_SIGNED_TYPECODES: dict[int, str] = {}
+for _unsigned_code, _signed_code in zip("BHILQ", "bhilq"):
+    _UNSIGNED_TYPECODES.setdefault(array.array(_unsigned_code).itemsize, _unsigned_code)
+    _SIGNED_TYPECODES.setdefault(array.array(_signed_code).itemsize, _signed_code)
+
+
+def _group_typecode(bit_length: int, signed: bool = False) -> str | None:
+    """Returns the smallest array typecode that can hold `bit_length` bit values, or None above 64 bits."""
+    itemsize = 1
+    while itemsize * 8 < bit_length + signed:
+        itemsize *= 2
+    return (_SIGNED_TYPECODES if signed else _UNSIGNED_TYPECODES).get(itemsize)
+
+
+def _make_group(
+    numbers: "_a.Iterable[int] | _np.ndarray", bit_length: int | None = None
+) -> array.array | list[int]:
+    """
+    Stores a run of numbers in the most compact container, one machine integer per number.
+
+    Returns an `array.array` with the smallest typecode that fits `bit_length` (signed if there are
+    negatives), or a plain list for numbers wider than 64 bits. If `bit_length` is not given it is
+    computed from the numbers.
+    """
+    if _np is not None and isinstance(numbers, _np.ndarray):
+        if numbers.dtype.kind in "iu":
+            signed = False
+            if numbers.dtype.kind == "i" or bit_length is None:
+                low, high = (int(numbers.min()), int(numbers.max())) if numbers.size else (0, 0)
+                signed, bit_length = low < 0, max(-low, high).bit_length()
+            typecode = _group_typecode(bit_length, signed)
+            if typecode is not None:
+                group = array.array(typecode)
+                group.frombytes(
+                    numbers.astype(f"={'i' if signed else 'u'}{group.itemsize}", copy=False).tobytes()
+                )
+                return group
+        numbers = numbers.tolist()
+    elif not isinstance(numbers, (list, tuple, array.array)):
+        numbers = list(numbers)
+    if bit_length is None:
+        bit_length = max((abs(number) for number in numbers), default=0).bit_length()
+
+    for signed in (False, True):
+        typecode = _group_typecode(bit_length, signed)
+        if typecode is None:
+            break
+        try:
+            return array.array(typecode, numbers)
+        except OverflowError:
+            pass  # Negative numbers, or wider than bit_length if it was overwritten
+    return list(numbers)
+
+
+def _extend_group(
+    group: array.array | list[int], numbers: _a.Iterable[int]
+) -> array.array | list[int]:
+    """
+    Appends numbers to a group created by `_make_group`, widening its typecode if they do not fit.
+    Returns the group, which is a new object if it had to be widened.
+    """
+    if isinstance(group, list):
+        group.extend(numbers)
+        return group
+    try:
+        if not (isinstance(numbers, array.array) and numbers.typecode == group.typecode):
+            numbers = array.array(group.typecode, numbers)  # Converted first, a failed extend is partial
+    except OverflowError:
+        return _make_group(itertools.chain(group, numbers))
+    group.extend(numbers)
+    return group
+
+
+def _concat_groups(groups: list[array.array | list[int]]) -> array.array | list[int]:
+    """
+    Concatenates groups into one array with a typecode that fits all of them, or a list if
+    any group is a list or the signedness cannot be combined.
+    """
+    if not all(isinstance(group, array.array) for group in groups):
+        return list(itertools.chain.from_iterable(groups))
+    signed = any(group.typecode in "bhilq" for group in groups)
+    typecode = _group_typecode(
+        max(
+            (group.itemsize * 8 - (group.typecode in "bhilq") for group in groups),
+            default=8,
+        ),
+        signed,
+    )
+    if typecode is None:  # Unsigned 64-bit numbers together with negatives
+        return list(itertools.chain.from_iterable(groups))
+    result = array.array(typecode)
+    for group in groups:
+        result.extend(group if group.typecode == typecode else array.array(typecode, group))
+    return result
+
+
+_TRANSFORM_IDS: dict[str, int] = {"none": 0, "zigzag": 1, "delta": 2, "for": 3}
+_TRANSFORM_NONE, _TRANSFORM_ZIGZAG, _TRANSFORM_DELTA, _TRANSFORM_FOR = 0, 1, 2, 3
+_TRANSFORMS_WITH_BASE = (_TRANSFORM_DELTA, _TRANSFORM_FOR)
+
+
+def _zigzag(number: int) -> int:
+    """Maps signed to unsigned integers, 0, -1, 1, -2, ... become 0, 1, 2, 3, ..."""
+    return number << 1 if number >= 0 else ((-number) << 1) - 1
+
+
+def _unzigzag(number: int) -> int:
+    return (number >> 1) ^ -(number & 1)
+
+
+def _as_int64(numbers: "_a.Sequence[int] | _np.ndarray") -> "_np.ndarray | None":
+    """
+    Returns the numbers as an int64 ndarray if NumPy is available and all of them are within
+    [-2**62, 2**62), so differences and zigzag codes cannot overflow. Otherwise, returns None.
+    """
+    if _np is None or not isinstance(numbers, (array.array, _np.ndarray)):
+        return None
+    values = _np.asarray(numbers)
+    if values.dtype.kind not in "iu":
+        return None
+    if values.size and (
+        int(values.min()) < -(1 << 62) or int(values.max()) >= (1 << 62)
+    ):
+        return None
+    return values.astype(_np.int64, copy=False)
+
+
+def _encode_transform(
+    numbers: "_a.Sequence[int] | _np.ndarray", transform: int
+) -> "tuple[_a.Sequence[int] | _np.ndarray, int, int]":
+    """
+    Applies a group transform before bit packing.
+
+    Returns:
+        A tuple (encoded numbers, base, bit length of the widest encoded number). The base is the first
+        number for delta coding and the minimum for frame-of-reference coding, otherwise it is 0.
+    """
+    if transform == _TRANSFORM_NONE:
+        return numbers, 0, max(numbers, default=0).bit_length()
+
+    values = _as_int64(numbers)
+    if values is not None and values.size:
+        if transform == _TRANSFORM_FOR:
+            base = int(values.min())
+            encoded = (values - base).view(_np.uint64)
+        else:
+            base = int(values[0]) if transform == _TRANSFORM_DELTA else 0
+            if transform == _TRANSFORM_DELTA:
+                values = _np.diff(values, prepend=values[:1])
+            encoded = ((values << 1) ^ (values >> 63)).view(_np.uint64)
+        return encoded, base, int(encoded.max()).bit_length()
+
+    if transform == _TRANSFORM_FOR:
+        base = min(numbers, default=0)
+        encoded = [number - base for number in numbers]
+    elif transform == _TRANSFORM_DELTA:
+        base = numbers[0] if len(numbers) else 0
+        encoded = [
+            _zigzag(number - previous)
+            for previous, number in zip(itertools.chain((base,), numbers), numbers)
+        ]
+    elif transform == _TRANSFORM_ZIGZAG:
+        base = 0
+        encoded = [_zigzag(number) for number in numbers]
+    else:
+        raise ValueError(f"Unknown transform id {transform}.")
+    return encoded, base, max(encoded, default=0).bit_length()
+
+
+def _decode_transform(
+    encoded: "_a.Sequence[int] | _np.ndarray", transform: int, base: int, bit_length: int
+) -> "_a.Sequence[int] | _np.ndarray":
+    """
+    Reverses `_encode_transform` on numbers as returned by `_unpack_bits`. For delta coding `base`
+    is the number in front of the first encoded one, which allows decoding a group in chunks.
+    """
+    if transform == _TRANSFORM_NONE:
+        return encoded
+    if (
+        _np is not None
+        and isinstance(encoded, _np.ndarray)
+        and abs(base) + len(encoded) * (1 << bit_length) < (1 << 63)
+    ):
+        if transform == _TRANSFORM_FOR:
+            return encoded.astype(_np.int64) + base
+        decoded = (encoded >> _np.uint64(1)).astype(_np.int64) ^ -(
+            encoded & _np.uint64(1)
+        ).astype(_np.int64)
+        if transform == _TRANSFORM_ZIGZAG:
+            return decoded
+        return _np.cumsum(decoded) + base
+
+    if not isinstance(encoded, list):
+        encoded = encoded.tolist()
+    if transform == _TRANSFORM_FOR:
+        return [number + base for number in encoded]
+    decoded = [_unzigzag(number) for number in encoded]
+    if transform == _TRANSFORM_ZIGZAG:
+        return decoded
+    return list(itertools.accumulate(decoded, initial=base))[1:]
+
+
+def _choose_transform(
+    numbers: "_a.Sequence[int] | _np.ndarray",
+) -> "tuple[int, _a.Sequence[int] | _np.ndarray, int, int]":
+    """
+    Encodes the numbers with every transform and returns (transform, encoded, base, bit_length)
+    of the one that takes the least space. The untransformed numbers are only an option without negatives.
+    """
+    best = None
+    for transform in _TRANSFORM_IDS.values():
+        if transform == _TRANSFORM_NONE and min(numbers, default=0) < 0:
+            continue
+        encoded, base, bit_length = _encode_transform(numbers, transform)
+        size = bit_length * len(numbers)
+        if transform in _TRANSFORMS_WITH_BASE:
+            size += 8 * (1 + bytes_length(_zigzag(base)))
+        if best is None or size < best[0]:
+            best = (size, transform, encoded, base, bit_length)
+    return best[1:]
+
+
+def _merged_transform(
+    numbers: "_a.Sequence[int] | _np.ndarray", transforms: list[int]
+) -> tuple[int, int]:
+    """
+    Returns (transform, bit_length) for a group merged from groups with the given transforms.
+    Groups that all share a transform keep it, otherwise the one that takes the least space is picked,
+    as a single transform of one of them can't store the numbers of the others.
+    """
+    if all(transform == transforms[0] for transform in transforms):
+        return transforms[0], _encode_transform(numbers, transforms[0])[2]
+    transform, _, _, bit_length = _choose_transform(numbers)
+    return transform, bit_length
+
+
+def _transform_id(transform: str | int) -> int:
+    if isinstance(transform, int) and transform in _TRANSFORM_IDS.values():
+        return transform
+    try:
+        return _TRANSFORM_IDS[transform]
+    except (KeyError, TypeError):
+        raise ValueError(
+            f"Unknown transform '{transform}', choose from {', '.join(_TRANSFORM_IDS)}."
+        ) from None
+
+
+def _partition_runs(
+    widths: list[int], counts: list[int], max_groups: int, header_bits: int
+) -> list[tuple[int, int, int]]:
+    """
+    Splits consecutive runs into at most `max_groups` groups with the smallest total encoded size.
+
+    A group covering the runs [start, end) costs `header_bits` plus `width * numbers` bits, where
+    width is the widest run inside of it. This is solved exactly with a dynamic program over
+    (groups used, runs covered) that, for every candidate width, keeps the running minimum of the
+    admissible group starts, so it takes O(len(widths) * max_groups * distinct widths) steps.
+
+    Returns:
+        A list of (start_run, end_run, width) tuples covering all runs in order.
+    """
+    run_count = len(widths)
+    if run_count == 0:
+        return []
+    prefix = [0]
+    for count in counts:
+        prefix.append(prefix[-1] + count)
+    candidates = sorted(set(widths))
+    max_groups = max(1, min(max_groups, run_count))
+
+    if _np is not None:
+        infinity = run_count * header_bits + candidates[-1] * prefix[-1] + 1
+        big = infinity + candidates[-1] * prefix[-1] + 1
+        if big * (run_count + 1) < 2**62:
+            layers = _partition_layers_numpy(
+                widths, prefix, candidates, max_groups, header_bits, infinity, big
+            )
+            return _reconstruct_partition(layers, widths, prefix, header_bits, infinity)
+    infinity = float("inf")
+    layers = _partition_layers_python(
+        widths, prefix, candidates, max_groups, header_bits
+    )
+    return _reconstruct_partition(layers, widths, prefix, header_bits, infinity)
+
+
+def _partition_layers_python(
+    widths: list[int],
+    prefix: list[int],
+    candidates: list[int],
+    max_groups: int,
+    header_bits: int,
+) -> list[list[float]]:
+    """Pure-python DP layers for `_partition_runs`, layers[j][i] is the cost of runs [0, i) in j groups."""
+    infinity = float("inf")
+    run_count = len(widths)
+    previous: list[float] = [0] + [infinity] * run_count
+    layers = [previous]
+    for _ in range(max_groups):
+        best = [infinity] * len(candidates)  # min(previous[l] - w * prefix[l]) per candidate w
+        current: list[float] = [infinity] * (run_count + 1)
+        for i in range(1, run_count + 1):
+            width, base, position = widths[i - 1], previous[i - 1], prefix[i - 1]
+            cost = infinity
+            for k, w in enumerate(candidates):
+                if w < width:  # Run i - 1 does not fit, no group using w can reach back past it
+                    best[k] = infinity
+                    continue
+                value = base - w * position
+                if value < best[k]:
+                    best[k] = value
+                if best[k] != infinity:
+                    cost = min(cost, best[k] + w * prefix[i])
+            current[i] = cost + header_bits
+        layers.append(current)
+        previous = current
+    return layers
+
+
+def _partition_layers_numpy(
+    widths: list[int],
+    prefix: list[int],
+    candidates: list[int],
+    max_groups: int,
+    header_bits: int,
+    infinity: int,
+    big: int,
+) -> list["_np.ndarray"]:
+    """
+    NumPy DP layers for `_partition_runs`. The running minimum that restarts after every run that is
+    too wide for a candidate width is computed as one `minimum.accumulate` by lowering every
+    restarted segment by `big`, which is larger than the spread of all values.
+    """
+    run_count = len(widths)
+    positions = _np.array(prefix, dtype=_np.int64)
+    run_widths = _np.array(widths, dtype=_np.int64)
+    previous = _np.full(run_count + 1, infinity, dtype=_np.int64)
+    previous[0] = 0
+    layers = [previous]
+    for _ in range(max_groups):
+        current = _np.full(run_count + 1, infinity, dtype=_np.int64)
+        for w in candidates:
+            too_wide = run_widths > w
+            offsets = _np.cumsum(too_wide) * big
+            values = _np.where(too_wide, infinity, previous[:-1] - w * positions[:-1])
+            best = _np.minimum.accumulate(values - offsets) + offsets
+            cost = best + w * positions[1:] + header_bits
+            cost[too_wide] = infinity
+            _np.minimum(current[1:], cost, out=current[1:])
+        _np.minimum(current, infinity, out=current)
+        layers.append(current)
+        previous = current
+    return layers
+
+
+def _reconstruct_partition(
+    layers: "list[list[float]] | list[_np.ndarray]",
+    widths: list[int],
+    prefix: list[int],
+    header_bits: int,
+    infinity: float,
+) -> list[tuple[int, int, int]]:
+    """Walks the DP layers of `_partition_runs` backwards and returns the chosen groups."""
+    run_count = len(widths)
+    totals = [int(layer[run_count]) if layer[run_count] < infinity else None for layer in layers]
+    group_count = min(
+        (j for j in range(1, len(layers)) if totals[j] is not None),
+        key=lambda j: totals[j],
+    )
+    segments: list[tuple[int, int, int]] = []
+    end = run_count
+    for j in range(group_count, 0, -1):
+        target = int(layers[j][end])
+        previous = layers[j - 1]
+        width = 0
+        for start in range(end - 1, -1, -1):
+            width = max(width, widths[start])
+            if previous[start] < infinity and (
+                int(previous[start]) + width * (prefix[end] - prefix[start]) + header_bits
+                == target
+            ):
+                break
+        segments.append((start, end, width))
+        end = start
+        if end == 0:
+            break
+    segments.reverse()
+    return segments
+
+
 class BitBuffer:
     """
     A class that handles efficient reading and manipulation of a bit-level buffer
     from a stream of bytes. It maintains internal state to track byte and bit positions
     and allows extracting arbitrary numbers of bits or sequences of bit values.
+
+    The buffer can either wrap an existing bytes-like object (bytes, bytearray, memoryview, mmap, ...)
+    without copying it, or own a growable bytearray that `read()` fills in place. Consumed bytes are
+    only dropped once they make up at least half of the buffer, so appending and compacting are
+    amortised O(1) per byte and a stream never needs more than about twice its unread part in memory.
     """
 
-    def __init__(self) -> None:
-        self._array: bytes | bytearray = b""
+    def __init__(
+        self, source: "bytes | bytearray | memoryview | mmap.mmap | None" = None
+    ) -> None:
+        self._array: bytearray | memoryview = bytearray()
+        self._end: int = 0  # Number of valid bytes in _array, the rest is spare capacity
+        self._owned: bool = True  # False while wrapping a source, which is never written to
+        if source is not None:
+            self._array = memoryview(source).cast("B")
+            self._end = len(self._array)
+            self._owned = False
         self._disregard_pointer: int = 0
         self._byte_index: int = (
             0  # Track the current byte index to avoid repeated calculations
@@ -486,7 +1280,7 @@ class BitBuffer:
         Parameters:
         -----------
         f : file-like object
-            The file-like object to read data from. Must have a `read()` method.
+            The file-like object to read data from. Must have a `readinto()` or `read()` method.
         count : int
             The number of bytes to read from the object and append to the buffer.
 
@@ -494,8 +1288,50 @@ class BitBuffer:
         ------
         This method appends data to the existing buffer without resetting any pointers. It is
         intended to accumulate data as needed for future bit-level extractions.
+        The data is read straight into spare capacity at the end of the buffer with `readinto()`,
+        which grows geometrically. If the buffer wraps a source passed to the constructor, the
+        unread part of it is copied into an owned buffer first.
+        """
+        self._reserve(count)
+        readinto = getattr(f, "readinto", None)
+        if readinto is None:
+            data = f.read(count)
+            self._array[self._end : self._end + len(data)] = data
+            self._end += len(data)
+            return
+        with memoryview(self._array) as view:
+            target = view[self._end : self._end + count]
+            filled = 0
+            while filled < count:
+                got = readinto(target[filled:])
+                if not got:  # EOF, like read() we just take what is there
+                    break
+                filled += got
+            target.release()
+        self._end += filled
+
+    def _reserve(self, count: int) -> None:
+        """Makes room for `count` more bytes behind the valid data, compacting or growing the buffer."""
+        if not self._owned:
+            self._array = bytearray(self._array[self._byte_index : self._end])
+            self._disregard_pointer -= self._byte_index * 8
+            self._end -= self._byte_index
+            self._byte_index = 0
+            self._owned = True
+        if self._end + count <= len(self._array):
+            return
+        if self._byte_index and self._byte_index >= self._end // 2:
+            self._clean_buffer()  # Half of the data is consumed, reuse the space first
+        if self._end + count > len(self._array):
+            self._array.extend(
+                bytes(max(self._end + count, len(self._array) * 2) - len(self._array))
+            )
+
+    def available_bits(self) -> int:
+        """
+        Returns the number of bits that are in the buffer and have not been read or disregarded yet.
         """
-        self._array += f.read(count)
+        return self._end * 8 - self._disregard_pointer
 
     def _ensure_length(self, bit_count: int) -> None:
         """
@@ -518,7 +1354,7 @@ class BitBuffer:
         of the disregard pointer and the requested bit count. If the buffer lacks sufficient bits,
         an exception is raised to prevent invalid reads.
         """
-        total_bits = len(self._array) * 8
+        total_bits = self._end * 8
         if self._disregard_pointer + bit_count > total_bits:
             raise ValueError("Not enough data in buffer to fulfill request")
 
@@ -575,7 +1411,7 @@ class BitBuffer:
         self._disregard_pointer += bit_count
 
         # Periodically clean the buffer (optional, if needed)
-        if self._byte_index >= 1024 * 1024:
+        if self._byte_index >= 1024 * 1024 and self._byte_index >= self._end // 2:
             self._clean_buffer()
 
         return value
@@ -603,45 +1439,54 @@ class BitBuffer:
 
         Notes:
         ------
-        This method is similar to `get()`, but it processes multiple values at once. It efficiently
-        extracts `n` values by looping over the buffer and adjusting the internal pointers to
-        ensure proper bit alignment.
+        This is a convenience wrapper around `get_array()`, use that directly if you can work with
+        an ndarray or array.array to skip the conversion into Python integers.
         """
-        values = []
-        total_bits = n * bit_count
-        self._ensure_length(total_bits)
+        values = self.get_array(n, bit_count)
+        return values if isinstance(values, list) else values.tolist()
 
-        for _ in range(n):
-            current_value = 0
-
-            bits_needed = bit_count
-            while bits_needed > 0:
-                available_bits = 8 - self._bit_position
-                bits_to_take = min(bits_needed, available_bits)
+    def get_array(
+        self, n: int, bit_count: int
+    ) -> "_np.ndarray | array.array | list[int]":
+        """
+        Extracts `n` values, each of `bit_count` bits, in one bulk operation.
 
-                # Extract the bits
-                current_byte = self._array[self._byte_index]
-                extracted_bits = (current_byte >> (available_bits - bits_to_take)) & (
-                    (1 << bits_to_take) - 1
-                )
+        Parameters:
+        -----------
+        n : int
+            The number of values to extract.
+        bit_count : int
+            The number of bits per value to extract from the buffer.
 
-                # Build the value
-                current_value = (current_value << bits_to_take) | extracted_bits
+        Returns:
+        --------
+        ndarray | array.array | list[int]:
+            A uint64 ndarray if NumPy is installed and `bit_count` is at most 57, an array.array('Q')
+            for up to 64 bits and a list of integers for wider values.
 
-                # Update pointers
-                self._bit_position += bits_to_take
-                if self._bit_position == 8:
-                    self._bit_position = 0
-                    self._byte_index += 1
+        Raises:
+        -------
+        ValueError:
+            If the buffer does not contain enough bits to extract all requested values.
 
-                bits_needed -= bits_to_take
+        Notes:
+        ------
+        The NumPy path decodes every value from an overlapping 64-bit window, the pure-python
+        fallback converts blocks of 64 values into a single integer and splits it with shifts,
+        so neither of them touches single bits.
+        """
+        total_bits = n * bit_count
+        self._ensure_length(total_bits)
 
-            values.append(current_value)
+        values = _unpack_bits(self._array, self._disregard_pointer, n, bit_count)
 
         self._disregard_pointer += total_bits
+        self._bit_position += total_bits
+        self._byte_index += self._bit_position // 8
+        self._bit_position %= 8
 
-        # Periodically clean the buffer (every 1 MB or any other appropriate threshold), could make it slower
-        if self._byte_index >= 1024 * 1024:
+        # Periodically clean the buffer (every 1 MB that make up at least half of it), could make it slower
+        if self._byte_index >= 1024 * 1024 and self._byte_index >= self._end // 2:
             self._clean_buffer()
 
         return values
@@ -674,7 +1519,7 @@ class BitBuffer:
             self._bit_position %= 8
 
         # Periodically clean the buffer
-        if self._byte_index >= 1024 * 1024:
+        if self._byte_index >= 1024 * 1024 and self._byte_index >= self._end // 2:
             self._clean_buffer()
 
     def _clean_buffer(self) -> None:
@@ -686,20 +1531,254 @@ class BitBuffer:
         ------
         The cleaning process involves shifting the buffer to discard already read bytes.
         This is typically done when the byte index exceeds a certain threshold, such as 1 MB,
-        to maintain efficiency without excessive memory use.
+        and the read bytes make up at least half of the buffer, so every byte is moved O(1) times.
+        The unread bytes are moved to the front in place, the capacity is kept for the next reads.
+        A wrapped source is never copied, only the view on it is narrowed.
         """
         if self._byte_index > 0:
-            self._array = self._array[self._byte_index :]
+            if self._owned:
+                remaining = self._end - self._byte_index
+                with memoryview(self._array) as view:  # Overlapping moves are a memmove
+                    view[:remaining] = view[self._byte_index : self._end]
+            else:
+                self._array = self._array[self._byte_index :]
+            self._end -= self._byte_index
             self._disregard_pointer -= self._byte_index * 8
             self._byte_index = 0
 
 
+class BitWriter:
+    """
+    The writing counterpart to BitBuffer. Packs fixed-width integers big-endian, back to back,
+    into a preallocated bytearray and flushes it to a file-like object in large blocks.
+
+    Runs of values are packed in bulk (with NumPy when it is available), so writing a group of a
+    million numbers results in a handful of `write()` calls instead of one per value. If no file-like
+    object is passed, the packed data is collected in memory and can be fetched with `getvalue()`.
+    """
+
+    def __init__(
+        self, f: _ty.BinaryIO | None = None, buffer_size: int = 1024 * 1024
+    ) -> None:
+        self._f: _ty.BinaryIO | None = f
+        self._output: bytearray = bytearray()  # Only used if there is no file to flush to
+        self._buffer: bytearray = bytearray(buffer_size)
+        self._buffer_size: int = buffer_size
+        self._pos: int = 0  # Number of used bytes in _buffer
+        self._pending: int = 0  # Bits that do not form a full byte yet
+        self._pending_bits: int = 0  # Always < 8
+
+    def _put(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Copies whole bytes into the internal buffer, flushing it first if `data` does not fit.
+        Data that is larger than the buffer itself bypasses it.
+        """
+        length = len(data)
+        if self._pos + length > self._buffer_size:
+            self.flush()
+            if length >= self._buffer_size:
+                self._emit(data)
+                return
+        self._buffer[self._pos : self._pos + length] = data
+        self._pos += length
+
+    def _emit(self, data: bytes | bytearray | memoryview) -> None:
+        if self._f is None:
+            self._output += data
+        else:
+            self._f.write(data)
+
+    def write(self, value: int, bit_count: int) -> None:
+        """
+        Appends a single value using `bit_count` bits.
+
+        Parameters:
+        -----------
+        value : int
+            The value to write, bits above `bit_count` are discarded.
+        bit_count : int
+            The number of bits to use for the value.
+        """
+        self._pending = (self._pending << bit_count) | (value & ((1 << bit_count) - 1))
+        self._pending_bits += bit_count
+        full_bytes, self._pending_bits = divmod(self._pending_bits, 8)
+        if full_bytes:
+            self._put((self._pending >> self._pending_bits).to_bytes(full_bytes, "big"))
+            self._pending &= (1 << self._pending_bits) - 1
+
+    def write_multiple(
+        self, values: "_a.Iterable[int] | _np.ndarray", bit_count: int
+    ) -> None:
+        """
+        Appends a run of values, each using `bit_count` bits.
+
+        Parameters:
+        -----------
+        values : Iterable[int] | ndarray
+            The values to write, bits above `bit_count` are discarded.
+        bit_count : int
+            The number of bits to use for every value.
+
+        Notes:
+        ------
+        With NumPy the output bytes are assembled from the values with vectorized shifts in chunks,
+        without it blocks of 64 values are combined into one integer before being converted to bytes. Values wider than 64 bits always take the pure-python path.
+        """
+        if bit_count == 0:
+            return
+        if _np is not None and bit_count <= 64:
+            try:
+                values = _np.asarray(values, dtype=_np.uint64)
+            except (OverflowError, TypeError, ValueError):
+                pass  # Negative or too large for uint64
+            else:
+                self._write_multiple_numpy(values, bit_count)
+                return
+        self._write_multiple_python(values, bit_count)
+
+    def _write_multiple_python(self, values: _a.Iterable[int], bit_count: int) -> None:
+        mask = (1 << bit_count) - 1
+        values = values if isinstance(values, _a.Sequence) else list(values)
+        for first in range(0, len(values), _UNPACK_BLOCK):
+            word = self._pending
+            for value in values[first : first + _UNPACK_BLOCK]:
+                word = (word << bit_count) | (value & mask)
+            total_bits = self._pending_bits + min(_UNPACK_BLOCK, len(values) - first) * bit_count
+            full_bytes, self._pending_bits = divmod(total_bits, 8)
+            self._put((word >> self._pending_bits).to_bytes(full_bytes, "big"))
+            self._pending = word & ((1 << self._pending_bits) - 1)
+
+    def _write_multiple_numpy(self, values: "_np.ndarray", bit_count: int) -> None:
+        """
+        The inverse of `_unpack_bits_numpy`. `group` values always add up to whole bytes, so the
+        values are viewed as rows of one group and every output byte of a row is ORed together from
+        the (at most 8) values it overlaps with vectorized shifts. Pending bits shift the whole run.
+        """
+        group = 8 // math.gcd(bit_count, 8)
+        row_bytes = group * bit_count // 8
+        usable = len(values) - len(values) % group
+        chunk = max(group, (_NP_UNPACK_CHUNK // group) * group)
+        values = values & _np.uint64((1 << bit_count) - 1)
+        lead = self._pending_bits
+
+        for first in range(0, usable, chunk):
+            rows = values[first : min(first + chunk, usable)].reshape(-1, group)
+            packed = _np.zeros((len(rows), row_bytes), dtype=_np.uint8)
+            for byte in range(row_bytes):
+                end = 8 * byte + 8  # Exclusive end of this byte within the row, in bits
+                for column in range(8 * byte // bit_count, (end - 1) // bit_count + 1):
+                    shift = (column + 1) * bit_count - end
+                    if shift >= 0:
+                        part = rows[:, column] >> _np.uint64(shift)
+                    else:
+                        part = rows[:, column] << _np.uint64(-shift)
+                    packed[:, byte] |= part.astype(_np.uint8)
+            packed = packed.ravel()
+            if lead:
+                carry = _np.empty_like(packed)
+                carry[0] = self._pending
+                carry[1:] = packed[:-1]
+                self._pending = int(packed[-1]) & ((1 << lead) - 1)
+                packed = (carry << _np.uint8(8 - lead)) | (packed >> _np.uint8(lead))
+            self._put(packed.tobytes())
+        if usable < len(values):
+            self._write_multiple_python(values[usable:].tolist(), bit_count)
+
+    def write_bytes(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Appends raw bytes. If the writer is not byte aligned, they are shifted in bitwise.
+
+        Parameters:
+        -----------
+        data : bytes-like
+            The bytes to append.
+        """
+        if self._pending_bits == 0:
+            self._put(data)
+        else:
+            self.write(int.from_bytes(data, "big"), len(data) * 8)
+
+    def align(self) -> None:
+        """
+        Pads the pending bits with zeros up to the next byte boundary, the same way the
+        reading side skips them with `BitBuffer.disregard()`.
+        """
+        if self._pending_bits:
+            self._put((self._pending << (8 - self._pending_bits)).to_bytes(1, "big"))
+            self._pending = self._pending_bits = 0
+
+    def flush(self) -> None:
+        """
+        Writes all full bytes from the internal buffer to the file (or the in-memory output).
+        Pending bits that do not form a full byte yet stay in the writer, call `align()` first
+        if you need them as well.
+        """
+        if self._pos:
+            self._emit(memoryview(self._buffer)[: self._pos])
+            self._pos = 0
+
+    def getvalue(self) -> bytes:
+        """
+        Returns everything written so far if the writer was created without a file-like object.
+        """
+        self.flush()
+        return bytes(self._output)
+
+    def __enter__(self) -> _te.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.align()
+        self.flush()
+
+
+def _read_at(fd: int, size: int, position: int) -> bytes:
+    """Reads `size` bytes at `position` without moving the file pointer where `os.pread` exists."""
+    if hasattr(os, "pread"):
+        chunks = []
+        while size > 0:
+            chunk = os.pread(fd, size, position)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+            position += len(chunk)
+        return b"".join(chunks)
+    with open(fd, "rb", closefd=False) as f:  # The fd must not be shared between threads here
+        f.seek(position)
+        return f.read(size)
+
+
+def _decode_group_at(
+    fd: int, position: int, bit_length: int, group_length: int, transform: int, base: int
+) -> array.array | list[int]:
+    """Reads and decodes one CNumStorage group into the container `_make_group` would create for it."""
+    data = _read_at(fd, (bit_length * group_length + 7) // 8, position)
+    numbers = _decode_transform(
+        _unpack_bits(data, 0, group_length, bit_length), transform, base, bit_length
+    )
+    return _make_group(numbers, bit_length if transform == _TRANSFORM_NONE else None)
+
+
+def _decode_group_from_file(
+    path: str, position: int, bit_length: int, group_length: int, transform: int, base: int
+) -> array.array | list[int]:
+    """`_decode_group_at` for workers that cannot share the file descriptor, like other processes."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return _decode_group_at(fd, position, bit_length, group_length, transform, base)
+    finally:
+        os.close(fd)
+
+
 class CNumStorage:
     """
     CompressedNumberStorage for efficiently storing and handling integer arrays.
     Numbers are grouped based on their bit length to optimize storage space.
 
-    By default negatives are not storable and will result in strange positive values.
+    By default negatives are not storable and will result in strange positive values. Groups can however
+    use a transform ("zigzag", "delta" or "for", see `set_transform()`), which stores them just fine and
+    makes sorted numbers like ids or timestamps a lot smaller.
 
     Technically any other class than ints can be stored but the methods to_bytes(), equality operators,
     bit_length() that scale with the equality operators (we are using max() to know the biggest bit size in a list)
@@ -710,9 +1789,13 @@ class CNumStorage:
     -----------
     _groups : list[tuple[int, int]]
         A list of tuples where each tuple contains the bit length and index of the corresponding number group.
-    _numbers : list[list[int] | None]
-        A list where each element is a list of numbers grouped by bit length.
+    _numbers : list[array.array | list[int] | None]
+        A list where each element holds the numbers of one group in a contiguous `array.array`,
+        using the smallest typecode that fits the group (a list for numbers wider than 64 bits).
         Some entries may be None if groups have been merged.
+    _transforms : list[int]
+        The transform id of every entry in `_numbers`. The numbers themselves are always kept
+        untransformed, they are only transformed when saving.
     debug : bool
         A flag to enable or disable debugging messages during processing.
     """
@@ -720,8 +1803,9 @@ class CNumStorage:
     def __init__(self, debug: bool = False) -> None:
         self._groups: list[tuple[int, int]] = []  # (bit_length, idx_to_numbers)
         self._numbers: list[
-            list[int] | None
+            array.array | list[int] | None
         ] = []  # Saved numbers, so we can merge, ...
+        self._transforms: list[int] = []  # Transform of every entry in _numbers
         self.debug: bool = debug
 
     def _debug_print(self, message: str) -> None:
@@ -754,20 +1838,30 @@ class CNumStorage:
         ------
         This method groups numbers based on their bit length. If the bit length of a new number
         matches the last group's bit length, it is added to that group; otherwise, a new group is created.
+        Runs of numbers with the same bit length are collected first and stored in one go.
         """
-        for number in numbers:
-            bit_length = number.bit_length()
-
+        for bit_length, run in itertools.groupby(numbers, key=lambda n: n.bit_length()):
+            run = list(run)
             # Check if the last group has the same bit length
-            if self._groups and self._groups[-1][0] == bit_length:
+            if (
+                self._groups
+                and self._groups[-1][0] == bit_length
+                and self._transforms[self._groups[-1][1]] == _TRANSFORM_NONE
+            ):
                 # Add to the last group if bit length matches
-                self._numbers[self._groups[-1][1]].append(number)
+                numbers_idx = self._groups[-1][1]
+                self._numbers[numbers_idx] = _extend_group(self._numbers[numbers_idx], run)
             else:
                 # Create a new group if bit length is different
                 self._groups.append((bit_length, len(self._numbers)))
-                self._numbers.append([number])
+                self._numbers.append(_make_group(run, bit_length))
+                self._transforms.append(_TRANSFORM_NONE)
 
-    def add_numbers_unorganized(self, numbers: list[int]) -> None:
+    def add_numbers_unorganized(
+        self,
+        numbers: list[int],
+        transform: _ty.Literal["none", "zigzag", "delta", "for", "auto"] = "none",
+    ) -> None:
         """
         Adds a list of numbers as its own group, regardless of their bit length.
 
@@ -775,16 +1869,63 @@ class CNumStorage:
         -----------
         numbers : list of int
             A list of integers to be added as a single group.
+        transform : Literal["none", "zigzag", "delta", "for", "auto"], optional
+            The transform the group is stored with, see `set_transform()` (default is "none").
 
         Notes:
         ------
         This method creates a new group for the given list of numbers. It is useful when
         numbers do not need to be grouped by bit length, or when separation between sets of numbers is desired.
         """
-        self._groups.append((max(numbers).bit_length(), len(self._numbers)))
+        bit_length = max(numbers).bit_length()
+        self._groups.append((bit_length, len(self._numbers)))
         self._numbers.append(
-            numbers.copy()
-        )  # Do we need to copy? Yes, as the user could change contents
+            _make_group(numbers, bit_length)
+        )  # This copies, which we need as the user could change contents
+        self._transforms.append(_TRANSFORM_NONE)
+        if transform != "none":
+            self.set_transform(len(self._groups) - 1, transform)
+
+    def set_transform(
+        self,
+        group: int,
+        transform: _ty.Literal["none", "zigzag", "delta", "for", "auto"],
+    ) -> None:
+        """
+        Sets the transform a group is encoded with when it is saved.
+
+        Parameters:
+        -----------
+        group : int
+            Index of the group in `get_groups()`.
+        transform : Literal["none", "zigzag", "delta", "for", "auto"]
+            "none" stores the numbers as they are, "zigzag" maps signed numbers to unsigned ones,
+            "delta" stores the zigzag coded differences between neighbours and "for" (frame-of-reference)
+            stores every number minus the group minimum. "auto" picks the one that takes the least space.
+
+        Notes:
+        ------
+        The transform id and, for delta and frame-of-reference, the base number are recorded in the
+        group header, so `load()`, `iter_numbers()` and `open_mmap()` undo it transparently. The group's
+        bit length is updated to the width of the transformed numbers, on monotonic data like sorted ids
+        or timestamps delta coding often shrinks it by a lot.
+        """
+        bit_length, numbers_idx = self._groups[group]
+        numbers = self._numbers[numbers_idx]
+        if transform == "auto":
+            transform_id, _, _, bit_length = _choose_transform(numbers)
+        else:
+            transform_id = _transform_id(transform)
+            bit_length = _encode_transform(numbers, transform_id)[2]
+        self._transforms[numbers_idx] = transform_id
+        self._groups[group] = (bit_length, numbers_idx)
+
+    def optimize_transforms(self) -> None:
+        """
+        Picks the transform that takes the least space for every group, see `set_transform()`.
+        """
+        for group in range(len(self._groups)):
+            self.set_transform(group, "auto")
 
     def save(self, to: str) -> None:
         """
@@ -801,57 +1942,44 @@ class CNumStorage:
         written to the file, followed by the compressed bit-level representation of the numbers.
         """
         with open(to, "wb") as f:
-            number_of_groups = len(self._groups)
-            f.write(
-                bytes_length(number_of_groups).to_bytes(1, "big")
-            )  # So we get an error if this is longer than 1 byte
-            f.write(encode_integer(number_of_groups))
-
-            groups_to_write = []
-            current_pos = 0  # f.tell()
-            for bit_length, group_idx in self._groups:
-                group = self._numbers[group_idx]
-                groups_to_write.append((bit_length, group))
-                f.write(max(1, bytes_length(current_pos)).to_bytes(1, "big"))
-                f.write(encode_integer(current_pos))
-                f.write(
-                    bit_length.to_bytes(1, "big")
-                )  # So we get an error if this is longer than 1 byte
-                group_length = len(group)
-                f.write(
-                    max(1, bytes_length(group_length)).to_bytes(1, "big")
-                )  # So we get an error if this is longer than 1 byte
-                f.write(encode_integer(group_length))
-                current_pos += ((bit_length * group_length) + 7) // 8
-
-            for bit_length, group in groups_to_write:
-                self._debug_print(f"Writing {bit_length} group")
-                buffer = 0
-                bits_in_buffer = 0
+            self.write_to(f)
 
-                for member in group:
-                    buffer = (buffer << bit_length) | member
-                    bits_in_buffer += bit_length
-
-                    # Check if we have a full byte(s) in the buffer
-                    if (bits_in_buffer / 8).is_integer():
-                        f.write(buffer.to_bytes(bits_in_buffer // 8, "big"))
-                        # f.write(encode_integer(buffer))
-                        bits_in_buffer = 0
-                        buffer = 0
+    def write_to(self, f: _ty.BinaryIO) -> None:
+        """
+        Writes the number groups to a binary file-like object at its current position,
+        in the same format as `save()`. This allows embedding them into other files.
 
-                while bits_in_buffer >= 8:
-                    bits_in_buffer -= 8
-                    byte_to_write = (buffer >> bits_in_buffer) & 0xFF
-                    f.write(bytes([byte_to_write]))
+        Parameters:
+        -----------
+        f : BinaryIO
+            The file-like object to write to.
+        """
+        groups = []  # (bit_length, encoded numbers, transform, base)
+        for bit_length, group_idx in self._groups:
+            transform = self._transforms[group_idx]
+            if transform == _TRANSFORM_NONE:
+                groups.append((bit_length, self._numbers[group_idx], transform, 0))
+            else:
+                encoded, base, encoded_bit_length = _encode_transform(
+                    self._numbers[group_idx], transform
+                )  # Merges can widen a transformed group past its recorded bit length
+                groups.append((max(bit_length, encoded_bit_length), encoded, transform, base))
+
+        with BitWriter(f) as writer:
+            self._write_header(
+                writer,
+                [
+                    (bit_length, len(encoded), transform, base)
+                    for bit_length, encoded, transform, base in groups
+                ],
+            )
 
-                # Write remaining bits if they don't form a full byte
-                if bits_in_buffer > 0:
-                    # Shift the remaining bits to the left to align to the next byte boundary
-                    buffer <<= 8 - bits_in_buffer
-                    f.write(bytes([buffer & 0xFF]))
+            for bit_length, encoded, _, _ in groups:
+                self._debug_print(f"Writing {bit_length} group")
+                writer.write_multiple(encoded, bit_length)
+                writer.align()  # Every group starts on a byte boundary
 
-    def load(self, from_: str) -> None:
+    def load(self, from_: str, workers: int = 1, use_processes: bool = False) -> None:
         """
         Loads the number groups from a binary file.
 
@@ -859,52 +1987,304 @@ class CNumStorage:
         -----------
         from_ : str
             The path to the file from which the data will be loaded.
+        workers : int, optional
+            How many groups are decoded at the same time (default is 1).
+        use_processes : bool, optional
+            Decode the groups in a process pool instead of threads (default is False). Only worth it
+            without NumPy, and like every process pool it needs an `if __name__ == "__main__":` guard
+            in the calling script under the spawn start method.
 
         Notes:
         ------
         This method reads the compressed number groups from a file and reconstructs the number
         groups by decompressing the bit-level data.
+        As every group starts at a known byte offset, with `workers` > 1 each group's byte range is
+        read on its own (with `os.pread` where available) and decoded concurrently in threads. With NumPy
+        the decoding releases the GIL, without it the threads only overlap the reads unless
+        `use_processes` is set.
         """
         self._groups.clear()
 
+        if workers > 1:
+            self._load_parallel(from_, workers, use_processes)
+            return
+
         with open(from_, "rb") as f:
-            num_groups_length = int.from_bytes(f.read(1), byteorder="big")
-            num_groups = int.from_bytes(f.read(num_groups_length), byteorder="big")
+            self.read_from(f)
 
-            group_info = []
+    def read_from(self, f: _ty.BinaryIO) -> None:
+        """
+        Reads number groups written by `write_to()`, starting at the current position of `f`.
+        They are added behind the groups that are already stored.
 
-            for _ in range(num_groups):
-                # Read the current group's offset
-                offset_length = int.from_bytes(f.read(1), byteorder="big")
-                offset = int.from_bytes(f.read(offset_length), byteorder="big")
+        Parameters:
+        -----------
+        f : BinaryIO
+            A seekable binary file-like object.
+        """
+        group_info, first_offset = self._read_header(f)
+        buffer = BitBuffer()
+
+        for offset, bit_length, group_length, transform, base in group_info:
+            self._debug_print(f"Reading {bit_length} group")
+            # Move the file pointer to the correct offset
+            f.seek(first_offset + offset)
+            buffer.read(f, ((bit_length * group_length) + 7) // 8)
+
+            # Read and decode the data for this group
+            numbers = _decode_transform(
+                buffer.get_array(group_length, bit_length), transform, base, bit_length
+            )
+            self._groups.append((bit_length, len(self._numbers)))
+            self._numbers.append(
+                _make_group(numbers, bit_length if transform == _TRANSFORM_NONE else None)
+            )
+            self._transforms.append(transform)
+            buffer.disregard()
 
-                # Read the bit length for this group
-                bit_length = int.from_bytes(f.read(1), byteorder="big")
+    def _load_parallel(self, from_: str, workers: int, use_processes: bool = False) -> None:
+        """The concurrent part of `load()`."""
+        with open(from_, "rb") as f:
+            group_info, first_offset = self._read_header(f)
+            jobs = [
+                (first_offset + offset, bit_length, group_length, transform, base)
+                for offset, bit_length, group_length, transform, base in group_info
+            ]
+            if not use_processes or len(jobs) < 2:
+                if hasattr(os, "pread"):  # Positional reads can share one descriptor
+                    decode = lambda job: _decode_group_at(f.fileno(), *job)
+                else:
+                    decode = lambda job: _decode_group_from_file(from_, *job)
+                with _concurrent_futures.ThreadPoolExecutor(workers) as executor:
+                    groups = list(executor.map(decode, jobs))
+            else:
+                with _concurrent_futures.ProcessPoolExecutor(workers) as executor:
+                    groups = list(
+                        executor.map(
+                            _decode_group_from_file, itertools.repeat(from_), *zip(*jobs)
+                        )
+                    )
 
-                # Read the length of this group (number of elements)
-                group_length_length = int.from_bytes(f.read(1), byteorder="big")
-                group_length = int.from_bytes(
-                    f.read(group_length_length), byteorder="big"
-                )
+        for (_, bit_length, _, transform, _), numbers in zip(jobs, groups):
+            self._debug_print(f"Read {bit_length} group")
+            self._groups.append((bit_length, len(self._numbers)))
+            self._numbers.append(numbers)
+            self._transforms.append(transform)
+
+    @staticmethod
+    def _read_header(
+        f: _ty.BinaryIO,
+    ) -> tuple[list[tuple[int, int, int, int, int]], int]:
+        """
+        Reads the group header table of a saved CNumStorage file.
+
+        Parameters:
+        -----------
+        f : BinaryIO
+            A binary file-like object positioned at the start of the file.
+
+        Returns:
+        --------
+        tuple[list[tuple[int, int, int, int, int]], int]:
+            A list of (offset, bit_length, group_length, transform, base) tuples, one per group, and
+            the absolute position of the data section that all offsets are relative to.
+
+        Notes:
+        ------
+        The transform id lives in the upper 4 bits of the byte holding the length of the offset,
+        which are always 0 in files without transforms. Delta and frame-of-reference groups are
+        followed by their zigzag coded base number, prefixed with its length.
+        """
+        num_groups_length = int.from_bytes(f.read(1), byteorder="big")
+        num_groups = int.from_bytes(f.read(num_groups_length), byteorder="big")
+
+        group_info = []
+
+        for _ in range(num_groups):
+            # Read the current group's offset and transform
+            transform, offset_length = divmod(int.from_bytes(f.read(1), byteorder="big"), 16)
+            offset = int.from_bytes(f.read(offset_length), byteorder="big")
+
+            # Read the bit length for this group
+            bit_length = int.from_bytes(f.read(1), byteorder="big")
 
-                group_info.append((offset, bit_length, group_length))
+            # Read the length of this group (number of elements)
+            group_length_length = int.from_bytes(f.read(1), byteorder="big")
+            group_length = int.from_bytes(f.read(group_length_length), byteorder="big")
 
-            first_offset = f.tell()
+            base = 0
+            if transform in _TRANSFORMS_WITH_BASE:
+                base_length = int.from_bytes(f.read(1), byteorder="big")
+                base = _unzigzag(int.from_bytes(f.read(base_length), byteorder="big"))
+
+            group_info.append((offset, bit_length, group_length, transform, base))
+
+        return group_info, f.tell()
+
+    @classmethod
+    def iter_numbers(
+        cls, path: str, chunk: int = 65536
+    ) -> _a.Generator[list[int], None, None]:
+        """
+        Decodes a saved CNumStorage file chunk by chunk instead of loading it all at once.
+
+        Parameters:
+        -----------
+        path : str
+            The path to a file written by `save()` or `write_stream()`.
+        chunk : int, optional
+            The maximum number of numbers per yielded list (default is 65536).
+
+        Yields:
+        -------
+        list[int]:
+            The next up to `chunk` numbers, in storage order. Chunks never span two groups.
+
+        Notes:
+        ------
+        A single BitBuffer is reused for the whole file and only the bytes needed for the next
+        chunk are read into it, so peak memory depends on `chunk` and not on the file size.
+        """
+        with open(path, "rb") as f:
+            group_info, first_offset = cls._read_header(f)
             buffer = BitBuffer()
 
-            for offset, bit_length, group_length in group_info:
-                self._debug_print(f"Reading {bit_length} group")
-                # Move the file pointer to the correct offset
+            for offset, bit_length, group_length, transform, base in group_info:
                 f.seek(first_offset + offset)
-                buffer.read(f, ((bit_length * group_length) + 7) // 8)
+                remaining = group_length
+                while remaining > 0:
+                    count = min(chunk, remaining)
+                    missing_bits = count * bit_length - buffer.available_bits()
+                    if missing_bits > 0:
+                        buffer.read(f, (missing_bits + 7) // 8)
+                    numbers = _decode_transform(
+                        buffer.get_array(count, bit_length), transform, base, bit_length
+                    )
+                    numbers = numbers if isinstance(numbers, list) else numbers.tolist()
+                    if transform == _TRANSFORM_DELTA:
+                        base = numbers[-1]  # The next chunk continues from here
+                    yield numbers
+                    remaining -= count
+                buffer.disregard()
+
+    @classmethod
+    def write_stream(
+        cls,
+        path: str,
+        numbers: _a.Iterable[int],
+        chunk: int = 65536,
+        transform: _ty.Literal["none", "zigzag", "delta", "for", "auto"] = "none",
+    ) -> None:
+        """
+        Compresses an iterable of numbers into a CNumStorage file without holding it in memory.
 
-                # Read and decode the data for this group
-                self._groups.append((bit_length, len(self._numbers)))
-                self._numbers.append(
-                    buffer.get_multiple(group_length, bit_length)
-                )  # This get multiple takes up
-                buffer.disregard()  # 95% of the processing time. (4.5 seconds for 5.5 million 22-bit numbers from 4.6
-                #                                                                                      seconds in total)
+        Parameters:
+        -----------
+        path : str
+            The path to the file where the data will be saved.
+        numbers : iterable of int
+            The numbers to store, this can be a generator that is far bigger than the available RAM.
+        chunk : int, optional
+            How many numbers are grouped at a time (default is 65536).
+        transform : Literal["none", "zigzag", "delta", "for", "auto"], optional
+            The transform every group is stored with, see `set_transform()`. "auto" picks one
+            per group (default is "none").
+
+        Notes:
+        ------
+        The numbers are consumed `chunk` at a time and every chunk becomes a group. The packed data
+        is streamed into a temporary file while only the small (bit_length, group_length) table is
+        kept, as the header with the final group offsets has to be written in front of the data.
+        Once the input is exhausted the header is written and the data is appended behind it.
+        The result can be read with `load()`, `iter_numbers()` or `open_mmap()`.
+        """
+        groups: list[tuple[int, int, int, int]] = []  # (bit_length, group_length, transform, base)
+        transform_id = None if transform == "auto" else _transform_id(transform)
+        iterator = iter(numbers)
+        with tempfile.TemporaryFile(
+            dir=os.path.dirname(os.path.abspath(path))
+        ) as data_file:
+            with BitWriter(data_file) as writer:
+                while True:
+                    group = _make_group(itertools.islice(iterator, chunk))
+                    if not group:
+                        break
+                    if transform_id is None:
+                        group_transform, encoded, base, bit_length = _choose_transform(group)
+                    else:
+                        group_transform = transform_id
+                        encoded, base, bit_length = _encode_transform(group, transform_id)
+                    writer.write_multiple(encoded, bit_length)
+                    writer.align()
+                    groups.append((bit_length, len(group), group_transform, base))
+
+            data_file.seek(0)
+            with open(path, "wb") as f:
+                with BitWriter(f) as writer:
+                    cls._write_header(writer, groups)
+                shutil.copyfileobj(data_file, f, 1024 * 1024)
+
+    @staticmethod
+    def _write_header(
+        writer: BitWriter, groups: list[tuple[int, int, int, int]]
+    ) -> None:
+        """
+        Writes the group header table for a list of (bit_length, group_length, transform, base) tuples.
+
+        Parameters:
+        -----------
+        writer : BitWriter
+            The writer to write the header to, it has to be at the start of the file.
+        groups : list[tuple[int, int, int, int]]
+            The bit length, number count, transform id and base of every group, in storage order.
+        """
+        number_of_groups = len(groups)
+        writer.write_bytes(
+            bytes_length(number_of_groups).to_bytes(1, "big")
+        )  # So we get an error if this is longer than 1 byte
+        writer.write_bytes(encode_integer(number_of_groups))
+
+        current_pos = 0  # f.tell()
+        for bit_length, group_length, transform, base in groups:
+            writer.write_bytes(
+                ((transform << 4) | max(1, bytes_length(current_pos))).to_bytes(1, "big")
+            )  # The upper 4 bits hold the transform
+            writer.write_bytes(encode_integer(current_pos))
+            writer.write_bytes(
+                bit_length.to_bytes(1, "big")
+            )  # So we get an error if this is longer than 1 byte
+            writer.write_bytes(
+                max(1, bytes_length(group_length)).to_bytes(1, "big")
+            )  # So we get an error if this is longer than 1 byte
+            writer.write_bytes(encode_integer(group_length))
+            if transform in _TRANSFORMS_WITH_BASE:
+                zigzag_base = _zigzag(base)
+                writer.write_bytes(max(1, bytes_length(zigzag_base)).to_bytes(1, "big"))
+                writer.write_bytes(encode_integer(zigzag_base))
+            current_pos += ((bit_length * group_length) + 7) // 8
+
+    @classmethod
+    def open_mmap(cls, path: str) -> "MappedCNumStorage":
+        """
+        Opens a saved CNumStorage file for random access without loading it.
+
+        Parameters:
+        -----------
+        path : str
+            The path to a file written by `save()`.
+
+        Returns:
+        --------
+        MappedCNumStorage:
+            A read-only, sequence-like view that serves `view[i]` and slices straight from the mapped file.
+
+        Notes:
+        ------
+        Only the group header table is parsed, the data section is mapped with `mmap` and every
+        access computes the bit offset from the group's (offset, bit_length, group_length), so memory
+        usage stays near zero no matter how many numbers the file holds. Close the view when done.
+        """
+        return MappedCNumStorage(path)
 
     def merge_groups(
         self, merge_group: int, into_group: int, overwrite_bit_len: int | None = None
@@ -971,17 +2351,24 @@ class CNumStorage:
             (group_1_idx, group_0_idx, idx1, idx0, group_1_bit_len, False),
         )[merge_into]
         if from_right_merge:
-            self._numbers[merge_number_idx].extend(self._numbers[other_number_idx])
+            self._numbers[merge_number_idx] = _extend_group(
+                self._numbers[merge_number_idx], self._numbers[other_number_idx]
+            )
         else:
-            self._numbers[other_number_idx].extend(
-                self._numbers[merge_number_idx]
-            )  # Extend is better than joining
-            self._numbers[merge_number_idx] = self._numbers[other_number_idx]
+            self._numbers[merge_number_idx] = _extend_group(
+                self._numbers[other_number_idx], self._numbers[merge_number_idx]
+            )  # Extending the arrays is a memcpy as long as the typecodes match
         self._numbers[other_number_idx] = (
             None  # TODO: Why none when we could delete it?
         )
+        # The merged numbers have to be encoded with one transform, which can need more bits
+        transform, encoded_bit_len = _merged_transform(
+            self._numbers[merge_number_idx],
+            [self._transforms[merge_number_idx], self._transforms[other_number_idx]],
+        )
+        self._transforms[merge_number_idx] = transform
         self._groups[merge_group_idx] = (
-            overwrite_bit_len or group_bit_len,
+            max(overwrite_bit_len or group_bit_len, encoded_bit_len),
             merge_number_idx,
         )
         del self._groups[other_group_idx]
@@ -995,27 +2382,26 @@ class CNumStorage:
         This method ensures that the numbers are grouped optimally by their bit lengths, minimizing
         the storage space required. It is automatically done when adding numbers, but can be manually
         invoked if numbers are added unorganized.
+        The new groups are formed from the plain numbers, so the old group transforms can't be kept
+        as they are. If any group used a transform, every new group gets the transform that suits it
+        best (see `optimize_transforms()`), otherwise all of them stay untransformed.
         """
+        transformed = any(
+            self._transforms[numbers_idx] != _TRANSFORM_NONE for _, numbers_idx in self._groups
+        )
         numbers = self.get_numbers_list()
         self._groups = []
         self._numbers = []
-        current_bit_length = None
-        current_group = []
-        for number in numbers:
-            bit_length = number.bit_length()
-            if bit_length != current_bit_length:
-                if current_group:  # Save the previous group
-                    self._groups.append((current_bit_length, len(self._numbers)))
-                    self._numbers.append(current_group)
-                current_bit_length = bit_length
-                current_group = []  # Lists are referenced
-            current_group.append(number)
-        # Add the last group
-        if current_group:
-            self._groups[current_bit_length] = current_group
+        self._transforms = []
+        self.add_numbers(numbers)
+        if transformed:
+            self.optimize_transforms()
 
     def adjust_groups(
-        self, max_group_count: int = 5, multiple_of: _ty.Literal[2, 4, 8] | None = None
+        self,
+        max_group_count: int = 5,
+        multiple_of: _ty.Literal[2, 4, 8] | None = None,
+        strategy: _ty.Literal["greedy", "optimal"] = "greedy",
     ) -> None:
         """
         Merges groups to reduce the total number of groups, optimizing for storage efficiency.
@@ -1026,14 +2412,29 @@ class CNumStorage:
             The maximum number of groups allowed after merging (default is 5).
         multiple_of : Literal[2, 4, 8], optional
             If specified, the bit lengths of the groups will be adjusted to be a multiple of this value.
+        strategy : Literal["greedy", "optimal"], optional
+            "greedy" repeatedly merges the two neighbours with the smallest space loss, "optimal"
+            picks the group boundaries and widths with the smallest total encoded size (default is "greedy").
 
         Notes:
         ------
-        This method merges groups intelligently by analyzing space loss when merging. It attempts
-        to minimize the number of groups while optimizing space efficiency. If the `multiple_of`
-        parameter is provided, the resulting bit lengths are adjusted to the nearest multiple of
-        the specified value.
+        The greedy strategy merges groups one at a time by analyzing space loss. It attempts
+        to minimize the number of groups while optimizing space efficiency, but only runs if there are
+        more than `max_group_count` groups and is quadratic in the number of groups.
+        The optimal strategy solves the partitioning exactly with dynamic programming, minimizing
+        header bytes plus payload under the `max_group_count` limit in
+        O(groups * max_group_count * distinct bit lengths). It can therefore also merge groups when
+        the limit is already met, if that saves header bytes.
+        If the `multiple_of` parameter is provided, the resulting bit lengths are adjusted to the
+        nearest multiple of the specified value.
         """
+        if strategy == "optimal":
+            self._adjust_groups_optimal(max_group_count, multiple_of)
+            return
+        elif strategy != "greedy":
+            raise ValueError(
+                f"Unknown strategy '{strategy}', choose from 'greedy' and 'optimal'."
+            )
         current_group_count = len(self._groups)
         if current_group_count <= max_group_count:
             return  # Already in spec
@@ -1079,6 +2480,7 @@ class CNumStorage:
             self._merge_groups(
                 merge_idx, merge_idx + 1, 0, overwrite_bit_len=new_bit_len
             )
+            new_bit_len = self._groups[merge_idx][0]  # Wider if the transforms differed
 
             # Update the size and space after the merge
             new_length = length_1 + length_2
@@ -1113,8 +2515,52 @@ class CNumStorage:
             )  # To merge is in order so we know how many we already merged
             self._merge_groups(merge_idx, merge_idx + 1, 0)
 
+    def _adjust_groups_optimal(
+        self, max_group_count: int, multiple_of: int | None = None
+    ) -> None:
+        """
+        Regroups all numbers using `_partition_runs`, see `adjust_groups(strategy="optimal")`.
+        """
+        if not self._groups:
+            return
+        widths, counts = [], []
+        for bit_length, numbers_idx in self._groups:
+            if multiple_of:
+                bit_length = ((bit_length + multiple_of - 1) // multiple_of) * multiple_of
+            widths.append(bit_length)
+            counts.append(len(self._numbers[numbers_idx]))
+
+        total_numbers = sum(counts)
+        header_bits = 8 * (
+            3
+            + bytes_length((total_numbers * max(widths) + 7) // 8)
+            + bytes_length(total_numbers)
+        ) + 4  # Offset, bit length and group length fields plus half a byte of padding on average
+
+        groups, numbers, transforms = [], [], []
+        for start, end, width in _partition_runs(
+            widths, counts, max_group_count, header_bits
+        ):
+            merged = _concat_groups(
+                [self._numbers[numbers_idx] for _, numbers_idx in self._groups[start:end]]
+            )
+            transform, encoded_width = _merged_transform(
+                merged,
+                [self._transforms[numbers_idx] for _, numbers_idx in self._groups[start:end]],
+            )
+            if encoded_width > width:
+                width = encoded_width
+                if multiple_of:
+                    width = ((width + multiple_of - 1) // multiple_of) * multiple_of
+            groups.append((width, len(numbers)))
+            numbers.append(merged)
+            transforms.append(transform)
+        self._groups, self._numbers, self._transforms = groups, numbers, transforms
+
     def _calculate_total_size(
-        self, groups: list[tuple[int, int]], numbers: list[list[int] | None]
+        self,
+        groups: list[tuple[int, int]],
+        numbers: list[array.array | list[int] | None],
     ) -> int:
         total_size = 0
         for bit_len, numbers_idx in groups:
@@ -1153,13 +2599,13 @@ class CNumStorage:
         """
         return sum(len(self._numbers[x]) for (_, x) in self._groups)
 
-    def get_numbers(self) -> list[list[int] | None]:
+    def get_numbers(self) -> list[array.array | list[int] | None]:
         """
         Returns the internal list of number groups.
 
         Returns:
         --------
-        list[list[int] | None]:
+        list[array.array | list[int] | None]:
             The internal list of number groups. Each element corresponds to a group of numbers
             and can be accessed by its group index.
 
@@ -1181,10 +2627,13 @@ class CNumStorage:
 
         Notes:
         ------
-        This method flattens the number groups into a single list, removing `None` values from
-        merged groups, and returns the complete list of stored numbers.
+        This method flattens the number groups into a single list in group order, skipping `None`
+        values from merged groups, and returns the complete list of stored numbers.
         """
-        return sum([x for x in self._numbers if x is not None], [])
+        numbers: list[int] = []
+        for _, numbers_idx in self._groups:
+            numbers.extend(self._numbers[numbers_idx])
+        return numbers
 
     def get_groups(self) -> list[tuple[int, int]]:
         """
@@ -1224,12 +2673,18 @@ class CNumStorage:
         number lists. If any differences are found, it returns False. Debug information is printed if
         the `debug` flag is enabled and differences are encountered.
         """
-        numbers, other_numbers = self.get_numbers_list(), other.get_numbers_list()
+        numbers = _concat_groups([self._numbers[idx] for _, idx in self._groups])
+        other_numbers = _concat_groups([other._numbers[idx] for _, idx in other._groups])
         if len(numbers) != len(other_numbers):
             self._debug_print(
                 "Other CNumStorage Instance stores a different amount of numbers."
             )
             return False
+        if type(numbers) is not type(other_numbers):  # A list never equals an array
+            numbers, other_numbers = list(numbers), list(other_numbers)
+        if numbers == other_numbers:
+            return True
+        numbers, other_numbers = list(numbers), list(other_numbers)
         for i in range(len(numbers)):
             if numbers[i] != other_numbers[i]:
                 self._debug_print(_cutoff_iterable(numbers, i, 0, 0, True))
@@ -1238,74 +2693,1268 @@ class CNumStorage:
         return True
 
 
+class MappedCNumStorage:
+    """
+    A read-only, memory-mapped view of a file written by `CNumStorage.save()`, see `CNumStorage.open_mmap()`.
+
+    Supports `len()`, indexing with integers (including negative ones), slicing and iteration.
+    Single lookups are O(1) apart from a binary search over the groups, slices are decoded in bulk.
+    Delta coded groups keep the running value every `_CHECKPOINT_EVERY` numbers, which is built on
+    the first access to the group, so a lookup in them decodes at most that many numbers.
+    """
+
+    _CHECKPOINT_EVERY: int = 4096
+
+    def __init__(self, path: str) -> None:
+        self._file: _ty.BinaryIO = open(path, "rb")
+        try:
+            group_info, data_start = CNumStorage._read_header(self._file)
+            self._data: mmap.mmap | bytes = b""
+            if os.fstat(self._file.fileno()).st_size > data_start:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        self._starts: list[int] = []  # Index of the first number in every group
+        self._groups: list[
+            tuple[int, int, int, int, int]
+        ] = []  # (bit offset, bit_length, group_length, transform, base)
+        self._checkpoints: dict[int, list[int]] = {}  # Delta groups only, see _checkpoints_for
+        total = 0
+        for offset, bit_length, group_length, transform, base in group_info:
+            if group_length == 0:
+                continue
+            self._starts.append(total)
+            self._groups.append(
+                ((data_start + offset) * 8, bit_length, group_length, transform, base)
+            )
+            total += group_length
+        self._length: int = total
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _get(self, index: int) -> int:
+        group = bisect.bisect_right(self._starts, index) - 1
+        bit_offset, bit_length, _, transform, base = self._groups[group]
+        if transform == _TRANSFORM_DELTA:
+            return self._get_range(index, index + 1)[0]
+        bit_offset += (index - self._starts[group]) * bit_length
+        first_byte = bit_offset >> 3
+        last_byte = (bit_offset + bit_length + 7) >> 3
+        word = int.from_bytes(self._data[first_byte:last_byte], "big")
+        value = (word >> ((last_byte << 3) - bit_offset - bit_length)) & ((1 << bit_length) - 1)
+        if transform == _TRANSFORM_FOR:
+            return value + base
+        elif transform == _TRANSFORM_ZIGZAG:
+            return _unzigzag(value)
+        return value
+
+    def _checkpoints_for(self, group: int) -> list[int]:
+        """Returns the number in front of every `_CHECKPOINT_EVERY`-th number of a delta coded group."""
+        checkpoints = self._checkpoints.get(group)
+        if checkpoints is None:
+            bit_offset, bit_length, group_length, transform, previous = self._groups[group]
+            checkpoints = []
+            for first in range(0, group_length, self._CHECKPOINT_EVERY):
+                checkpoints.append(previous)
+                count = min(self._CHECKPOINT_EVERY, group_length - first)
+                encoded = _unpack_bits(self._data, bit_offset + first * bit_length, count, bit_length)
+                previous = int(_decode_transform(encoded, transform, previous, bit_length)[-1])
+            self._checkpoints[group] = checkpoints
+        return checkpoints
+
+    def _get_range(self, start: int, stop: int) -> list[int]:
+        result: list[int] = []
+        group = bisect.bisect_right(self._starts, start) - 1
+        while start < stop:
+            bit_offset, bit_length, group_length, transform, base = self._groups[group]
+            group_start = self._starts[group]
+            count = min(stop, group_start + group_length) - start
+            first, skip = start - group_start, 0
+            if transform == _TRANSFORM_DELTA:  # Decode from the last checkpoint on
+                checkpoint = first // self._CHECKPOINT_EVERY
+                base = self._checkpoints_for(group)[checkpoint]
+                skip = first - checkpoint * self._CHECKPOINT_EVERY
+                first -= skip
+            values = _decode_transform(
+                _unpack_bits(self._data, bit_offset + first * bit_length, count + skip, bit_length),
+                transform,
+                base,
+                bit_length,
+            )
+            result.extend((values if isinstance(values, list) else values.tolist())[skip:])
+            start += count
+            group += 1
+        return result
+
+    @_ty.overload
+    def __getitem__(self, key: int) -> int: ...
+
+    @_ty.overload
+    def __getitem__(self, key: slice) -> list[int]: ...
+
+    def __getitem__(self, key: int | slice) -> int | list[int]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step == 1:
+                return self._get_range(start, max(start, stop))
+            indices = range(start, stop, step)
+            if not indices:
+                return []
+            low = min(indices[0], indices[-1])
+            values = self._get_range(low, max(indices[0], indices[-1]) + 1)
+            return values[indices[0] - low :: step]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("MappedCNumStorage index out of range")
+        return self._get(key)
+
+    def __iter__(self) -> _a.Iterator[int]:
+        chunk = 65536
+        for start in range(0, self._length, chunk):
+            yield from self._get_range(start, min(start + chunk, self._length))
+
+    def close(self) -> None:
+        """Unmaps the data section and closes the underlying file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+        self._file.close()
+
+    def __enter__(self) -> _te.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class PackedIntArray:
+    """
+    A mutable sequence of unsigned integers that all use exactly `bit_width` bits (1 to 64).
+
+    The values are stored densely in a bytearray, big-endian and back to back, which is the same
+    layout `CNumStorage` and `BitWriter` use for a group, so a million 12 bit counters take 1.5 MB
+    instead of the ~36 MB of a list. Single items are read and written in O(1), slices, `extend()`
+    and the NumPy import/export are packed and unpacked in bulk.
+
+    Parameters:
+    -----------
+    bit_width : int
+        The number of bits of every value.
+    values : Iterable[int] | ndarray, optional
+        The initial values.
+    """
+
+    def __init__(
+        self, bit_width: int, values: "_a.Iterable[int] | _np.ndarray | None" = None
+    ) -> None:
+        if not 1 <= bit_width <= 64:
+            raise ValueError("The bit width of a PackedIntArray has to be between 1 and 64.")
+        self._bit_width: int = bit_width
+        self._mask: int = (1 << bit_width) - 1
+        self._data: bytearray = bytearray()
+        self._length: int = 0
+        if values is not None:
+            self.extend(values)
+
+    @property
+    def bit_width(self) -> int:
+        """The number of bits of every value."""
+        return self._bit_width
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used for the packed values."""
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _coerce(self, values: "_a.Iterable[int] | _np.ndarray") -> "_np.ndarray | array.array":
+        """Converts `values` into a uint64 ndarray or an array.array('Q'), checking their range."""
+        if _np is not None and isinstance(values, _np.ndarray):
+            if values.dtype.kind not in "iu":
+                raise TypeError(f"PackedIntArray can only store integers, not {values.dtype}.")
+            if values.size and (int(values.min()) < 0 or int(values.max()) > self._mask):
+                raise OverflowError(f"Value does not fit into {self._bit_width} unsigned bits.")
+            return values.astype(_np.uint64, copy=False).ravel()
+        try:
+            values = array.array("Q", values)
+        except OverflowError:
+            raise OverflowError(f"Value does not fit into {self._bit_width} unsigned bits.") from None
+        if values and max(values) > self._mask:
+            raise OverflowError(f"Value does not fit into {self._bit_width} unsigned bits.")
+        return values
+
+    def _write_range(self, index: int, values: "_np.ndarray | array.array") -> None:
+        """
+        Packs `values` over the items starting at `index`, keeping the bits around them.
+        The bytearray has to be large enough already.
+        """
+        start = index * self._bit_width
+        end = start + len(values) * self._bit_width
+        first_byte, last_byte = start >> 3, (end + 7) >> 3
+        writer = BitWriter(buffer_size=min(1 << 20, last_byte - first_byte + 1))
+        lead, tail = start & 7, -end & 7
+        if lead:
+            writer.write(self._data[first_byte] >> (8 - lead), lead)
+        writer.write_multiple(values, self._bit_width)
+        if tail:
+            writer.write(self._data[last_byte - 1] & ((1 << tail) - 1), tail)
+        self._data[first_byte:last_byte] = writer.getvalue()
+
+    def _truncate(self, length: int) -> None:
+        """Drops all items from `length` on, keeping the bits behind the last item zeroed."""
+        end = length * self._bit_width
+        del self._data[(end + 7) >> 3 :]
+        if end & 7:
+            self._data[-1] &= (0xFF << (8 - (end & 7))) & 0xFF
+        self._length = length
+
+    def _read_range(self, start: int, stop: int) -> "_np.ndarray | array.array":
+        return _unpack_bits(self._data, start * self._bit_width, stop - start, self._bit_width)
+
+    def append(self, value: int) -> None:
+        """
+        Appends a single value.
+
+        Parameters:
+        -----------
+        value : int
+            The value, it has to fit into `bit_width` unsigned bits.
+        """
+        if not 0 <= value <= self._mask:
+            raise OverflowError(f"Value does not fit into {self._bit_width} unsigned bits.")
+        start = self._length * self._bit_width
+        self._data.extend(bytes(((start + self._bit_width + 7) >> 3) - len(self._data)))
+        _write_bits(self._data, start, value, self._bit_width)
+        self._length += 1
+
+    def extend(self, values: "_a.Iterable[int] | _np.ndarray") -> None:
+        """
+        Appends many values, packed in bulk.
+
+        Parameters:
+        -----------
+        values : Iterable[int] | ndarray
+            The values, all of them have to fit into `bit_width` unsigned bits.
+        """
+        values = self._coerce(values)
+        if not len(values):
+            return
+        index = self._length
+        self._data.extend(
+            bytes((((index + len(values)) * self._bit_width + 7) >> 3) - len(self._data))
+        )
+        self._write_range(index, values)
+        self._length += len(values)
+
+    def frombytes(self, data: bytes | bytearray | memoryview, count: int | None = None) -> None:
+        """
+        Appends values packed like `tobytes()` returns them.
+
+        Parameters:
+        -----------
+        data : bytes-like
+            The packed values.
+        count : int, optional
+            The number of values in `data`, by default as many as fit.
+        """
+        data = memoryview(data).cast("B")
+        if count is None:
+            count = len(data) * 8 // self._bit_width
+        elif count * self._bit_width > len(data) * 8:
+            raise ValueError("The data is too short for the requested number of values.")
+        if (self._length * self._bit_width) & 7 == 0:  # Byte aligned, we can copy it as is
+            self._data += data[: (count * self._bit_width + 7) >> 3]
+            self._truncate(self._length + count)
+        else:
+            self.extend(_unpack_bits(data, 0, count, self._bit_width))
+
+    def tobytes(self) -> bytes:
+        """
+        Returns the packed values, big-endian and back to back, with the last byte padded with zeros.
+        """
+        return bytes(self._data)
+
+    @classmethod
+    def from_numpy(cls, values: "_np.ndarray", bit_width: int | None = None) -> _te.Self:
+        """
+        Creates a PackedIntArray from an integer ndarray.
+
+        Parameters:
+        -----------
+        values : ndarray
+            The values, they will be flattened.
+        bit_width : int, optional
+            The number of bits per value, by default the smallest one that fits the largest value.
+
+        Returns:
+        --------
+        PackedIntArray:
+            The packed values.
+        """
+        if bit_width is None:
+            bit_width = max(1, int(values.max()).bit_length() if values.size else 1)
+        return cls(bit_width, _np.asarray(values))
+
+    def to_numpy(self, dtype: "_np.dtype | str | None" = None) -> "_np.ndarray":
+        """
+        Unpacks all values into an ndarray.
+
+        Parameters:
+        -----------
+        dtype : dtype | str, optional
+            The dtype of the result, by default the smallest unsigned one that fits `bit_width`.
+
+        Returns:
+        --------
+        ndarray:
+            The values.
+        """
+        if _np is None:
+            raise RuntimeError("to_numpy() requires numpy.")
+        if dtype is None:
+            dtype = _np.dtype(f"u{array.array(_group_typecode(self._bit_width)).itemsize}")
+        return _np.asarray(self._read_range(0, self._length)).astype(dtype, copy=False)
+
+    def tolist(self) -> list[int]:
+        """Returns all values as a list."""
+        return self._read_range(0, self._length).tolist()
+
+    def __iter__(self) -> _a.Iterator[int]:
+        chunk = 65536
+        for start in range(0, self._length, chunk):
+            yield from self._read_range(start, min(start + chunk, self._length)).tolist()
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PackedIntArray index out of range")
+        return index
+
+    @_ty.overload
+    def __getitem__(self, key: int) -> int: ...
+
+    @_ty.overload
+    def __getitem__(self, key: slice) -> "PackedIntArray": ...
+
+    def __getitem__(self, key: int | slice) -> "int | PackedIntArray":
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            result = PackedIntArray(self._bit_width)
+            if step == 1 and stop > start and (start * self._bit_width) & 7 == 0:
+                result.frombytes(
+                    memoryview(self._data)[(start * self._bit_width) >> 3 :], stop - start
+                )
+            elif step == 1:
+                result.extend(self._read_range(start, max(start, stop)))
+            else:
+                indices = range(start, stop, step)
+                if indices:
+                    low = min(indices[0], indices[-1])
+                    values = self._read_range(low, max(indices[0], indices[-1]) + 1)
+                    result.extend(values[indices[0] - low :: step])
+            return result
+        bit_offset = self._index(key) * self._bit_width
+        first_byte, last_byte = bit_offset >> 3, (bit_offset + self._bit_width + 7) >> 3
+        word = int.from_bytes(self._data[first_byte:last_byte], "big")
+        return (word >> ((last_byte << 3) - bit_offset - self._bit_width)) & self._mask
+
+    def __setitem__(
+        self, key: int | slice, value: "int | _a.Iterable[int] | _np.ndarray"
+    ) -> None:
+        if not isinstance(key, slice):
+            if not 0 <= value <= self._mask:
+                raise OverflowError(f"Value does not fit into {self._bit_width} unsigned bits.")
+            _write_bits(self._data, self._index(key) * self._bit_width, value, self._bit_width)
+            return
+        values = self._coerce(value)
+        start, stop, step = key.indices(self._length)
+        if step == 1:
+            stop = max(start, stop)
+            if len(values) == stop - start:  # Same size, pack over the old values in place
+                if len(values):
+                    self._write_range(start, values)
+                return
+            tail = self._read_range(stop, self._length)
+            self._truncate(start)
+            self.extend(values)
+            self.extend(tail)
+            return
+        indices = range(start, stop, step)
+        if len(values) != len(indices):
+            raise ValueError(
+                f"attempt to assign sequence of size {len(values)} to extended slice of size {len(indices)}"
+            )
+        for index, item in zip(indices, values.tolist()):
+            _write_bits(self._data, index * self._bit_width, item, self._bit_width)
+
+    def __delitem__(self, key: int | slice) -> None:
+        if not isinstance(key, slice):
+            index = self._index(key)
+            key = slice(index, index + 1)
+        start, stop, step = key.indices(self._length)
+        if step == 1:
+            self[start:stop] = []
+            return
+        removed = set(range(start, stop, step))
+        kept = [value for i, value in enumerate(self.tolist()) if i not in removed]
+        self._truncate(0)
+        self.extend(kept)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedIntArray):
+            return NotImplemented
+        return (
+            self._bit_width == other._bit_width
+            and self._length == other._length
+            and self._data == other._data
+        )
+
+    def __repr__(self) -> str:
+        return f"PackedIntArray({self._bit_width}, {self.tolist()})"
+
+
+class BinaryType:
+    """
+    A type with a fixed size that can be used in a `BinaryFiler` schema, like `uint8` or `fixed_array(8, uint8)`.
+
+    Attributes:
+    -----------
+    name : str
+        The name used in reprs.
+    format : str
+        The struct format of the type, without byte order.
+    count : int
+        How many struct items the type unpacks to, 1 for scalars and the length for fixed arrays.
+    size : int
+        The size of one value in bytes.
+    """
+
+    def __init__(self, name: str, format_: str, count: int = 1) -> None:
+        self.name: str = name
+        self.format: str = format_
+        self.count: int = count
+        self.size: int = struct.calcsize(">" + format_)
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+uint8 = BinaryType("uint8", "B")
+uint16 = BinaryType("uint16", "H")
+uint32 = BinaryType("uint32", "I")
+uint64 = BinaryType("uint64", "Q")
+int8 = BinaryType("int8", "b")
+int16 = BinaryType("int16", "h")
+int32 = BinaryType("int32", "i")
+int64 = BinaryType("int64", "q")
+float16 = BinaryType("float16", "e")
+float32 = BinaryType("float32", "f")
+float64 = BinaryType("float64", "d")
+
+
+def fixed_array(length: int, element_type: BinaryType) -> BinaryType:
+    """
+    Returns a type for exactly `length` values of a scalar `element_type`, stored as a tuple.
+
+    Parameters:
+    -----------
+    length : int
+        The number of values.
+    element_type : BinaryType
+        A scalar type like `uint8`.
+
+    Returns:
+    --------
+    BinaryType:
+        The array type, which is a known size and can be used in a `KnownType`.
+    """
+    if element_type.count != 1:
+        raise TypeError("Fixed arrays can only hold scalar types.")
+    return BinaryType(
+        f"fixed_array({length}, {element_type.name})", f"{length}{element_type.format}", length
+    )
+
+
+class ACCESS:
+    """
+    The access priority of a field in a `BinaryFiler` schema. The lower it is the more important
+    the field, important fields are stored first so partial decodes can stop early.
+    """
+
+    def __init__(self, priority: int = 0) -> None:
+        if priority < 0:
+            raise ValueError("Access priorities can't be negative.")
+        self.priority: int = priority
+
+    def __repr__(self) -> str:
+        return f"ACCESS({self.priority})"
+
+
+_VariableSpec = _ty.Union[BinaryType, type, list, "UnknownType"]
+
+
+class KnownType:
+    """
+    A field with a size known up front. Neighbouring known fields are packed with one precompiled
+    `struct.Struct`, so they cost a single pack/unpack call per record.
+    """
+
+    def __init__(self, type_: BinaryType, access: ACCESS | int = 0) -> None:
+        if not isinstance(type_, BinaryType):
+            raise TypeError(
+                f"KnownType needs a fixed size type like uint8, not {type_!r}, use UnknownType instead."
+            )
+        self.type: BinaryType = type_
+        self.access: ACCESS = access if isinstance(access, ACCESS) else ACCESS(access)
+
+    def __repr__(self) -> str:
+        return f"KnownType({self.type!r}, access={self.access!r})"
+
+
+class UnknownType:
+    """
+    A field with a variable size. Supported types are int (zigzag varint), str (utf-8), bytes,
+    float, any fixed size type and lists of all of them, written as a one element list like
+    `[UnknownType(int)]` or `[uint8]`. Lengths and counts are varint prefixed.
+    """
+
+    def __init__(self, type_: _VariableSpec, access: ACCESS | int = 0) -> None:
+        self.type: _VariableSpec = type_
+        self.access: ACCESS = access if isinstance(access, ACCESS) else ACCESS(access)
+        self._encoder, self._decoder = _compile_variable(type_)
+
+    def __repr__(self) -> str:
+        return f"UnknownType({self.type!r}, access={self.access!r})"
+
+
+def _read_varint_at(data: memoryview | bytes, position: int) -> tuple[int, int]:
+    """Decodes the varint at `position` and returns it together with the position behind it."""
+    result = shift = 0
+    while True:
+        try:
+            byte = data[position]
+        except IndexError:
+            raise EOFError("Unexpected EOF while reading varint.") from None
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not (byte & 0x80):
+            return result, position
+        shift += 7
+
+
+def _compile_variable(
+    spec: _VariableSpec,
+) -> tuple[
+    _a.Callable[[_ty.Any, list], None],
+    _a.Callable[[memoryview, int], tuple[_ty.Any, int]],
+]:
+    """
+    Turns a variable field spec into an (encoder, decoder) pair. Encoders append their bytes to a
+    list of parts, decoders take the data and a position and return (value, position behind it).
+    """
+    if isinstance(spec, UnknownType):
+        return spec._encoder, spec._decoder
+    if isinstance(spec, BinaryType):
+        packer = struct.Struct(">" + spec.format)
+        size = packer.size
+        if spec.count == 1:
+            return (
+                lambda value, parts: parts.append(packer.pack(value)),
+                lambda data, pos: (packer.unpack_from(data, pos)[0], pos + size),
+            )
+        return (
+            lambda value, parts: parts.append(packer.pack(*value)),
+            lambda data, pos: (packer.unpack_from(data, pos), pos + size),
+        )
+    if spec is int:
+
+        def encode_int(value: int, parts: list) -> None:
+            parts.append(to_varint_length(_zigzag(value)))
+
+        def decode_int(data: memoryview, pos: int) -> tuple[int, int]:
+            value, pos = _read_varint_at(data, pos)
+            return _unzigzag(value), pos
+
+        return encode_int, decode_int
+    if spec is float:
+        return _compile_variable(float64)
+    if spec in (str, bytes):
+        as_str = spec is str
+
+        def encode_bytes(value: str | bytes, parts: list) -> None:
+            value = value.encode("utf-8") if as_str else value
+            parts.append(to_varint_length(len(value)))
+            parts.append(value)
+
+        def decode_bytes(data: memoryview, pos: int) -> tuple[str | bytes, int]:
+            length, pos = _read_varint_at(data, pos)
+            value = bytes(data[pos : pos + length])
+            return (value.decode("utf-8") if as_str else value), pos + length
+
+        return encode_bytes, decode_bytes
+    if isinstance(spec, list) and len(spec) == 1:
+        element = spec[0]
+        if isinstance(element, BinaryType) and element.count == 1:  # One struct call for all
+
+            def encode_fixed_list(values: _a.Sequence, parts: list) -> None:
+                parts.append(to_varint_length(len(values)))
+                parts.append(struct.pack(f">{len(values)}{element.format}", *values))
+
+            def decode_fixed_list(data: memoryview, pos: int) -> tuple[list, int]:
+                count, pos = _read_varint_at(data, pos)
+                values = struct.unpack_from(f">{count}{element.format}", data, pos)
+                return list(values), pos + count * element.size
+
+            return encode_fixed_list, decode_fixed_list
+        encode_element, decode_element = _compile_variable(element)
+
+        def encode_list(values: _a.Sequence, parts: list) -> None:
+            parts.append(to_varint_length(len(values)))
+            for value in values:
+                encode_element(value, parts)
+
+        def decode_list(data: memoryview, pos: int) -> tuple[list, int]:
+            count, pos = _read_varint_at(data, pos)
+            values = []
+            for _ in range(count):
+                value, pos = decode_element(data, pos)
+                values.append(value)
+            return values, pos
+
+        return encode_list, decode_list
+    raise TypeError(
+        f"Unsupported field type {spec!r}, use int, str, bytes, float, a fixed size type or a one element list."
+    )
+
+
+class BinaryFiler:
+    """
+    A compiled, schema driven binary record codec. Records are dicts with one entry per field.
+
+    The schema is compiled once: fields are ordered by their access priority (lower first, ties keep
+    the declaration order), neighbouring `KnownType` fields are merged into one precompiled
+    `struct.Struct` and every `UnknownType` field gets a varint based encoder/decoder pair.
+    All numbers are stored big-endian.
+
+    Example:
+    --------
+    >>> filer = BinaryFiler.configure({
+    ...     "frame": KnownType(uint8, access=ACCESS(5)),
+    ...     "weight": UnknownType([UnknownType(int)], access=ACCESS(10)),
+    ...     "users": KnownType(fixed_array(8, uint8), access=ACCESS(0)),
+    ... })
+    >>> data = filer.encode({"frame": 1, "weight": [-5, 300], "users": (1, 2, 3, 4, 5, 6, 7, 8)})
+    >>> filer.decode(data, fields=["users"])  # Stops before frame and weight are decoded
+    {'users': (1, 2, 3, 4, 5, 6, 7, 8)}
+    """
+
+    def __init__(self, schema: dict[str, KnownType | UnknownType]) -> None:
+        fields = sorted(schema.items(), key=lambda item: item[1].access.priority)
+        self._fields: list[str] = [name for name, _ in fields]
+        self._steps: list[tuple] = []  # ("fixed", Struct, [(name, count)]) or ("variable", name, encoder, decoder)
+        self._step_of: dict[str, int] = {}
+        for name, field in fields:
+            if not isinstance(field, (KnownType, UnknownType)):
+                raise TypeError(f"Field '{name}' has to be a KnownType or an UnknownType.")
+            if isinstance(field, KnownType):
+                if not self._steps or self._steps[-1][0] != "fixed":
+                    self._steps.append(("fixed", ">", []))
+                _, format_, members = self._steps[-1]
+                self._steps[-1] = ("fixed", format_ + field.type.format, members)
+                members.append((name, field.type.count))
+            else:
+                self._steps.append(("variable", name, field._encoder, field._decoder))
+            self._step_of[name] = len(self._steps) - 1
+        self._steps = [
+            ("fixed", struct.Struct(step[1]), step[2]) if step[0] == "fixed" else step
+            for step in self._steps
+        ]
+        self._fixed_size: int | None = (
+            self._steps[0][1].size
+            if len(self._steps) == 1 and self._steps[0][0] == "fixed"
+            else None
+        )
+
+    @classmethod
+    def configure(cls, schema: dict[str, KnownType | UnknownType]) -> _te.Self:
+        """
+        Compiles a schema, see the class docstring.
+
+        Parameters:
+        -----------
+        schema : dict[str, KnownType | UnknownType]
+            The field names and their types.
+
+        Returns:
+        --------
+        BinaryFiler:
+            The compiled codec.
+        """
+        return cls(schema)
+
+    @property
+    def fields(self) -> list[str]:
+        """The field names in the order they are stored in."""
+        return self._fields.copy()
+
+    @property
+    def fixed_size(self) -> int | None:
+        """The size of every record if the schema only has known fields, otherwise None."""
+        return self._fixed_size
+
+    def encode(self, record: dict[str, _ty.Any]) -> bytes:
+        """
+        Encodes a single record.
+
+        Parameters:
+        -----------
+        record : dict[str, Any]
+            The values of all fields.
+
+        Returns:
+        --------
+        bytes:
+            The encoded record.
+        """
+        parts: list[bytes] = []
+        for step in self._steps:
+            if step[0] == "fixed":
+                values = []
+                for name, count in step[2]:
+                    if count == 1:
+                        values.append(record[name])
+                    else:
+                        values.extend(record[name])
+                parts.append(step[1].pack(*values))
+            else:
+                step[2](record[step[1]], parts)
+        return b"".join(parts)
+
+    def _decode_at(
+        self, data: memoryview, position: int, last_step: int
+    ) -> tuple[dict[str, _ty.Any], int]:
+        record: dict[str, _ty.Any] = {}
+        for step in self._steps[: last_step + 1]:
+            if step[0] == "fixed":
+                values = step[1].unpack_from(data, position)
+                position += step[1].size
+                index = 0
+                for name, count in step[2]:
+                    record[name] = values[index] if count == 1 else values[index : index + count]
+                    index += count
+            else:
+                record[step[1]], position = step[3](data, position)
+        return record, position
+
+    def _last_step(self, fields: _a.Iterable[str] | None) -> tuple[int, list[str] | None]:
+        if fields is None:
+            return len(self._steps) - 1, None
+        fields = list(fields)
+        return max((self._step_of[name] for name in fields), default=-1), fields
+
+    def decode(
+        self,
+        data: "bytes | bytearray | memoryview",
+        fields: _a.Iterable[str] | None = None,
+    ) -> dict[str, _ty.Any]:
+        """
+        Decodes a single record.
+
+        Parameters:
+        -----------
+        data : bytes-like
+            The encoded record.
+        fields : Iterable[str], optional
+            Only decode these fields. Decoding stops after the last stored one of them, so fields
+            with a low access priority are cheap to read.
+
+        Returns:
+        --------
+        dict[str, Any]:
+            The decoded fields.
+        """
+        last_step, wanted = self._last_step(fields)
+        record, _ = self._decode_at(memoryview(data).cast("B"), 0, last_step)
+        return record if wanted is None else {name: record[name] for name in wanted}
+
+    def encode_many(self, records: _a.Iterable[dict[str, _ty.Any]]) -> bytes:
+        """
+        Encodes many records into one byte string.
+
+        Parameters:
+        -----------
+        records : Iterable[dict[str, Any]]
+            The records to encode.
+
+        Returns:
+        --------
+        bytes:
+            The encoded records. If every record has the same size they are stored back to back,
+            otherwise every record gets a varint length prefix so partial decodes can skip ahead.
+        """
+        if self._fixed_size is not None:
+            packer, members = self._steps[0][1], self._steps[0][2]
+            records = records if isinstance(records, _a.Sequence) else list(records)
+            result = bytearray(len(records) * packer.size)
+            if all(count == 1 for _, count in members):
+                names = [name for name, _ in members]
+                for i, record in enumerate(records):
+                    packer.pack_into(result, i * packer.size, *[record[name] for name in names])
+            else:
+                for i, record in enumerate(records):
+                    result[i * packer.size : (i + 1) * packer.size] = self.encode(record)
+            return bytes(result)
+        parts: list[bytes] = []
+        for record in records:
+            encoded = self.encode(record)
+            parts.append(to_varint_length(len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    def decode_many(
+        self,
+        data: "bytes | bytearray | memoryview",
+        fields: _a.Iterable[str] | None = None,
+    ) -> list[dict[str, _ty.Any]]:
+        """
+        Decodes records written by `encode_many`.
+
+        Parameters:
+        -----------
+        data : bytes-like
+            The encoded records.
+        fields : Iterable[str], optional
+            Only decode these fields, see `decode()`.
+
+        Returns:
+        --------
+        list[dict[str, Any]]:
+            The decoded records.
+        """
+        last_step, wanted = self._last_step(fields)
+        view = memoryview(data).cast("B")
+        if self._fixed_size is not None:
+            packer, members = self._steps[0][1], self._steps[0][2]
+            if len(view) % packer.size:
+                raise ValueError("The data does not consist of whole records.")
+            if all(count == 1 for _, count in members):
+                names = [name for name, _ in members]
+                records = [dict(zip(names, values)) for values in packer.iter_unpack(view)]
+            else:
+                records = [
+                    self._decode_at(view, position, last_step)[0]
+                    for position in range(0, len(view), packer.size)
+                ]
+        else:
+            records = [
+                self._decode_at(record, 0, last_step)[0]
+                for record in iter_variable_bytes_like(view)
+            ]
+        if wanted is None:
+            return records
+        return [{name: record[name] for name in wanted} for record in records]
+
+    def benchmark(
+        self, records: list[dict[str, _ty.Any]], repeat: int = 3
+    ) -> dict[str, dict[str, float | int] | None]:
+        """
+        Compares encoding and decoding `records` against `pickle` and `json`.
+
+        Parameters:
+        -----------
+        records : list[dict[str, Any]]
+            Sample records.
+        repeat : int, optional
+            How often every measurement is repeated, the best time counts (default is 3).
+
+        Returns:
+        --------
+        dict[str, dict[str, float | int] | None]:
+            For "binaryfiler", "pickle" and "json" the best "encode" and "decode" time in seconds
+            and the encoded "size" in bytes. An entry is None if the format cannot store the records,
+            like json with bytes values.
+        """
+        codecs = {
+            "binaryfiler": (self.encode_many, self.decode_many),
+            "pickle": (
+                lambda objs: pickle.dumps(objs, protocol=pickle.HIGHEST_PROTOCOL),
+                pickle.loads,
+            ),
+            "json": (lambda objs: json.dumps(objs).encode("utf-8"), json.loads),
+        }
+        results: dict[str, dict[str, float | int] | None] = {}
+        for name, (encode, decode) in codecs.items():
+            try:
+                encoded = encode(records)
+            except (TypeError, ValueError):
+                results[name] = None
+                continue
+            timings = {}
+            for label, function, argument in (
+                ("encode", encode, records),
+                ("decode", decode, encoded),
+            ):
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    function(argument)
+                    best = min(best, time.perf_counter() - start)
+                timings[label] = best
+            results[name] = {**timings, "size": len(encoded)}
+        return results
+
+
+class ColumnStore:
+    """
+    A read-only, columnar snapshot of a table of integer columns, see `ColumnStore.write()`.
+
+    The rows are split into row groups and every column of a row group is stored as its own
+    `CNumStorage` block, with the transform that takes the least space (delta coding for
+    timestamps, frame-of-reference for ids, ...). A footer records the position, minimum and
+    maximum of every block, so `read()` only decodes the columns it is asked for and skips every
+    row group that cannot match a `where` range without touching its data (predicate pushdown).
+
+    File layout:
+    ------------
+    magic | blocks | footer | footer position (8 bytes, big-endian) | magic
+
+    The footer holds the column names and, per row group, its row count and the offset, size,
+    minimum and maximum of every column block, all as varints (min/max zigzag coded).
+
+    Parameters:
+    -----------
+    path : str
+        The file to open.
+    """
+
+    _MAGIC: bytes = b"APCS"
+
+    def __init__(self, path: str) -> None:
+        self._file: _ty.BinaryIO = open(path, "rb")
+        try:
+            self._read_footer()
+        except BaseException:
+            self._file.close()
+            raise
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        columns: "dict[str, _a.Sequence[int] | _np.ndarray]",
+        row_group_size: int = 65536,
+    ) -> None:
+        """
+        Writes a table to a file.
+
+        Parameters:
+        -----------
+        path : str
+            The file to write.
+        columns : dict[str, Sequence[int] | ndarray]
+            The column names and their values, all columns need the same length.
+        row_group_size : int, optional
+            The number of rows per row group (default is 65536). Smaller groups allow skipping
+            more precisely, larger ones compress slightly better.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns of a ColumnStore need the same length.")
+        num_rows = lengths.pop() if lengths else 0
+        row_groups: list[tuple[int, list[tuple[int, int, int, int]]]] = []
+
+        with open(path, "wb") as f:
+            f.write(cls._MAGIC)
+            for start in range(0, num_rows, row_group_size):
+                stop = min(start + row_group_size, num_rows)
+                blocks = []  # (offset, size, minimum, maximum)
+                for values in columns.values():
+                    group = _make_group(values[start:stop])
+                    storage = CNumStorage()
+                    storage.add_numbers_unorganized(group, transform="auto")
+                    offset = f.tell()
+                    storage.write_to(f)
+                    blocks.append((offset, f.tell() - offset, min(group), max(group)))
+                row_groups.append((stop - start, blocks))
+
+            footer = [to_varint_length(len(columns))]
+            for name in columns:
+                footer.append(get_variable_bytes_like(name.encode("utf-8")))
+            footer.append(to_varint_length(len(row_groups)))
+            for rows, blocks in row_groups:
+                footer.append(to_varint_length(rows))
+                for offset, size, minimum, maximum in blocks:
+                    footer.append(
+                        encode_varints((offset, size, _zigzag(minimum), _zigzag(maximum)))
+                    )
+            footer_position = f.tell()
+            f.write(b"".join(footer))
+            f.write(footer_position.to_bytes(8, "big") + cls._MAGIC)
+
+    def _read_footer(self) -> None:
+        size = os.fstat(self._file.fileno()).st_size
+        magic_length = len(self._MAGIC)
+        if size < 2 * magic_length + 8:
+            raise ValueError("Not a ColumnStore file, it is too short.")
+        self._file.seek(size - 8 - magic_length)
+        trailer = self._file.read(8 + magic_length)
+        self._file.seek(0)
+        if self._file.read(magic_length) != self._MAGIC or trailer[8:] != self._MAGIC:
+            raise ValueError("Not a ColumnStore file, the magic bytes are missing.")
+        footer_position = int.from_bytes(trailer[:8], "big")
+        self._file.seek(footer_position)
+        footer = memoryview(self._file.read(size - 8 - magic_length - footer_position))
+
+        column_count, position = _read_varint_at(footer, 0)
+        self._columns: list[str] = []
+        for _ in range(column_count):
+            length, position = _read_varint_at(footer, position)
+            self._columns.append(bytes(footer[position : position + length]).decode("utf-8"))
+            position += length
+        row_group_count, position = _read_varint_at(footer, position)
+        self._row_groups: list[tuple[int, list[tuple[int, int, int, int]]]] = []
+        for _ in range(row_group_count):
+            rows, position = _read_varint_at(footer, position)
+            blocks = []
+            for _ in range(column_count):
+                offset, position = _read_varint_at(footer, position)
+                block_size, position = _read_varint_at(footer, position)
+                minimum, position = _read_varint_at(footer, position)
+                maximum, position = _read_varint_at(footer, position)
+                blocks.append((offset, block_size, _unzigzag(minimum), _unzigzag(maximum)))
+            self._row_groups.append((rows, blocks))
+
+    @property
+    def columns(self) -> list[str]:
+        """The column names, in the order they were written."""
+        return self._columns.copy()
+
+    def __len__(self) -> int:
+        return sum(rows for rows, _ in self._row_groups)
+
+    def get_statistics(self) -> list[dict[str, tuple[int, int]]]:
+        """
+        Returns the (minimum, maximum) of every column for every row group, as recorded in the footer.
+        """
+        return [
+            {
+                name: (minimum, maximum)
+                for name, (_, _, minimum, maximum) in zip(self._columns, blocks)
+            }
+            for _, blocks in self._row_groups
+        ]
+
+    def _column_index(self, name: str) -> int:
+        try:
+            return self._columns.index(name)
+        except ValueError:
+            raise KeyError(f"There is no column named '{name}'.") from None
+
+    def _read_block(self, block: tuple[int, int, int, int]) -> list[int]:
+        self._file.seek(block[0])
+        storage = CNumStorage()
+        storage.read_from(self._file)
+        return storage.get_numbers_list()
+
+    def iter_row_groups(
+        self,
+        columns: _a.Iterable[str] | None = None,
+        where: dict[str, tuple[int | None, int | None]] | None = None,
+    ) -> _a.Iterator[dict[str, list[int]]]:
+        """
+        Yields the matching rows of every row group that can contain any, see `read()`.
+        Only one row group is decoded at a time.
+        """
+        names = self._columns if columns is None else list(columns)
+        indices = [self._column_index(name) for name in names]
+        ranges = [
+            (self._column_index(name), low, high) for name, (low, high) in (where or {}).items()
+        ]
+        for _, blocks in self._row_groups:
+            if any(
+                (low is not None and blocks[index][3] < low)
+                or (high is not None and blocks[index][2] > high)
+                for index, low, high in ranges
+            ):
+                continue  # The footer statistics rule out every row
+            decoded: dict[int, list[int]] = {}
+            keep: list[int] | None = None
+            for index, low, high in ranges:
+                _, _, minimum, maximum = blocks[index]
+                if (low is None or minimum >= low) and (high is None or maximum <= high):
+                    continue  # Every row matches
+                values = decoded.setdefault(index, self._read_block(blocks[index]))
+                rows = keep if keep is not None else range(len(values))
+                keep = [
+                    row
+                    for row in rows
+                    if (low is None or values[row] >= low)
+                    and (high is None or values[row] <= high)
+                ]
+            if keep is not None and not keep:
+                continue
+            result = {}
+            for name, index in zip(names, indices):
+                values = decoded.get(index)
+                if values is None:
+                    values = decoded[index] = self._read_block(blocks[index])
+                result[name] = values if keep is None else [values[row] for row in keep]
+            yield result
+
+    def read(
+        self,
+        columns: _a.Iterable[str] | None = None,
+        where: dict[str, tuple[int | None, int | None]] | None = None,
+    ) -> dict[str, list[int]]:
+        """
+        Reads columns, optionally only the rows within inclusive value ranges.
+
+        Parameters:
+        -----------
+        columns : Iterable[str], optional
+            The columns to decode, by default all of them. Other columns are never read.
+        where : dict[str, tuple[int | None, int | None]], optional
+            Inclusive (low, high) ranges per column, None meaning unbounded. Only rows that are
+            within every range are returned. Row groups whose minimum and maximum rule out all rows
+            are skipped without decoding anything, groups that lie fully inside the ranges are not
+            filtered row by row.
+
+        Returns:
+        --------
+        dict[str, list[int]]:
+            The values of every requested column.
+        """
+        names = self._columns if columns is None else list(columns)
+        result: dict[str, list[int]] = {name: [] for name in names}
+        for row_group in self.iter_row_groups(names, where):
+            for name, values in row_group.items():
+                result[name].extend(values)
+        return result
+
+    def close(self) -> None:
+        """Closes the underlying file."""
+        self._file.close()
+
+    def __enter__(self) -> _te.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+_BYTE_BITS: tuple[str, ...] = tuple(format(byte, "08b") for byte in range(256))
+
+
+def _write_bits(
+    buffer: bytearray | memoryview,
+    start_position: int,
+    value: int,
+    bit_count: int,
+    byte_order: _ty.Literal["big", "little"] = "big",
+) -> None:
+    """
+    Overwrites `bit_count` bits starting at `start_position` with `value` in one masked write.
+
+    All touched bytes are read as a single integer, the bits are replaced with a mask and the
+    bytes are written back. With "big" the bits of every byte are counted from the most significant
+    one and `value` is stored most significant bit first, with "little" from the least significant
+    one, storing the least significant bit of `value` first.
+    """
+    first_byte = start_position >> 3
+    last_byte = (start_position + bit_count + 7) >> 3
+    window = int.from_bytes(buffer[first_byte:last_byte], byte_order)
+    if byte_order == "big":
+        shift = (last_byte - first_byte) * 8 - (start_position & 7) - bit_count
+    else:
+        shift = start_position & 7
+    mask = ((1 << bit_count) - 1) << shift
+    window = (window & ~mask) | ((value << shift) & mask)
+    buffer[first_byte:last_byte] = window.to_bytes(last_byte - first_byte, byte_order)
+
+
 def set_bits(
-    bytes_like: bytes | bytearray,
+    bytes_like: bytes | bytearray | memoryview,
     start_position: int,
     bits_: str,
     byte_order: _ty.Literal["big", "little"] = "big",
     return_bytearray: bool = False,
     auto_expand: bool = False,
-) -> bytes | bytearray:
+) -> bytes | bytearray | memoryview:
     """Set specific bits in a byte sequence.
 
+    A bytearray or writable memoryview is modified in place, all bits are written with a single
+    masked write instead of one by one.
+
     Args:
-        bytes_like (bytes | bytearray): Original bytes or bytearray to modify.
+        bytes_like (bytes | bytearray | memoryview): Original bytes, bytearray or memoryview to modify.
         start_position (int): Start position for the bits.
         bits_ (str): A string of bits ('0' or '1') to set at the start position.
-        byte_order (Literal["big", "little"], optional): Byte order. Defaults to "big".
-        return_bytearray (bool, optional): If True, return a bytearray. Otherwise, return bytes.
+        byte_order (Literal["big", "little"], optional): Byte order. Defaults to "big". With "big" the bits
+            of each byte are counted from the most significant one, with "little" from the least significant one.
+        return_bytearray (bool, optional): If True, return the modified bytearray (or memoryview). Otherwise, return bytes.
         auto_expand (bool, optional): If True, automatically expand bytearray if necessary.
 
     Returns:
-        bytes | bytearray: The modified byte sequence.
+        bytes | bytearray | memoryview: The modified byte sequence.
+
+    Raises:
+        IndexError: If the bits do not fit and `auto_expand` is False or a memoryview was passed.
     """
-    byte_arr = (
-        bytearray(bytes_like) if not isinstance(bytes_like, bytearray) else bytes_like
-    )
-    for i, bit in zip(
-        range(start_position, start_position + len(bits_)),
-        [int(char) for char in bits_],
-    ):
-        byte_index = i // 8
-        bit_index = (
-            i % 8 if byte_order == "little" else ((len(bytes_like) * 8) - i % 8) - 1
-        )
-        bit_index -= ((len(bytes_like) - 1) - byte_index) * 8
-        if byte_index >= len(byte_arr) and auto_expand:
-            if byte_order == "big":
-                byte_arr.append(0)
-            else:
-                byte_arr = bytearray(1) + byte_arr
-        if bit:
-            byte_arr[byte_index] |= 1 << (bit_index - (byte_index * 8))
-        else:
-            byte_arr[byte_index] &= ~(1 << bit_index - (byte_index * 8))
-    return bytes(byte_arr) if not return_bytearray else byte_arr
+    if isinstance(bytes_like, bytearray):
+        byte_arr = bytes_like
+    elif isinstance(bytes_like, memoryview) and not bytes_like.readonly:
+        byte_arr = bytes_like.cast("B")
+    else:
+        byte_arr = bytearray(bytes_like)
+
+    bit_count = len(bits_)
+    if bit_count:
+        end_byte = (start_position + bit_count + 7) >> 3
+        if end_byte > len(byte_arr):
+            if not auto_expand or isinstance(byte_arr, memoryview):
+                raise IndexError("bytearray index out of range")
+            byte_arr.extend(bytes(end_byte - len(byte_arr)))
+        value = int(bits_ if byte_order == "big" else bits_[::-1], 2)
+        _write_bits(byte_arr, start_position, value, bit_count, byte_order)
+
+    if return_bytearray:
+        return bytes_like if isinstance(byte_arr, memoryview) else byte_arr
+    return bytes(byte_arr)
 
 
 def bits(
-    bytes_like: bytes | bytearray, return_str: bool = False
+    bytes_like: bytes | bytearray | memoryview, return_str: bool = False
 ) -> list[_ty.Any] | str:
     """Convert bytes or bytearray to a list or string of binary representations.
 
     Args:
-        bytes_like (bytes | bytearray): The byte sequence to convert.
+        bytes_like (bytes | bytearray | memoryview): The byte sequence to convert.
         return_str (bool, optional): If True, return as a single concatenated string.
 
     Returns:
-        list | str: List of binary strings, or a single concatenated binary string.
+        list | str: List of binary strings (one per byte), or a single concatenated binary string.
     """
-    bytes_like = bytes_like if isinstance(bytes_like, bytes) else bytes(bytes_like)
-    binary = "00000000" + bin(int.from_bytes(bytes_like, byteorder="big"))[2:]
+    data = memoryview(bytes_like).cast("B")
     if return_str:
-        return "".join(
-            list(reversed([binary[i - 8 : i] for i in range(len(binary), 0, -8)[:-1]]))
-        )
-    return list(reversed([binary[i - 8 : i] for i in range(len(binary), 0, -8)[:-1]]))
+        if not data:
+            return ""
+        if _np is not None:
+            digits = _np.unpackbits(_np.frombuffer(data, dtype=_np.uint8))
+            digits += ord("0")
+            return digits.tobytes().decode("ascii")
+        return bin(int.from_bytes(data, byteorder="big"))[2:].zfill(len(data) * 8)
+    return list(map(_BYTE_BITS.__getitem__, data))
 
 
 def nice_bits(
-    bytes_like: bytes | bytearray,
+    bytes_like: bytes | bytearray | memoryview,
     spaced: bool = False,
     wrap_count: int = 0,
     to_chars: bool = False,
@@ -1314,44 +3963,92 @@ def nice_bits(
     """Format bits with options for spacing, wrapping, and conversion to characters.
 
     Args:
-        bytes_like (bytes | bytearray): Byte sequence to format.
+        bytes_like (bytes | bytearray | memoryview): Byte sequence to format.
         spaced (bool, optional): If True, add spaces between bits for readability.
-        wrap_count (int, optional): Number of bits per line before wrapping.
+        wrap_count (int, optional): Number of bytes per line before wrapping.
         to_chars (bool, optional): If True, convert bits to characters when possible.
         edge_space (bool, optional): If True, add extra space at line edges.
 
     Returns:
         str: Formatted bit string.
     """
-    bytes_like = bytes_like if isinstance(bytes_like, bytes) else bytes(bytes_like)
-    this = [""] + bits(bytes_like)
-    i = 0
-    wrap_count = wrap_count if wrap_count > 0 else len(this) - 1
-    for i in range(0, len(this), wrap_count):
-        if edge_space and i + 1 < len(this):
-            this[i + 1] = " " + this[i + 1]
-        if i + wrap_count < len(this):
-            chars = "  " + "".join(
-                [chr(int(x, 2)) for x in this[i + 1 : i + wrap_count + 1] if x]
-            )
-            this[i + wrap_count] += (chars if to_chars else "") + (
-                "\n" if i + wrap_count != len(this) - 1 else ""
-            )
-            if spaced:
-                for chunk_id in range(i + 1, i + wrap_count):
-                    this[chunk_id] += " "
-        else:
-            if spaced:
-                for chunk_id in range(i + 1, len(this) - 1):
-                    this[chunk_id] += " "
-    if to_chars:
-        this[-1] += (
-            ("         " if spaced else "        ") * ((i + wrap_count) - len(this) + 1)
-            + "  "
-            + "".join([chr(int(x, 2)) for x in this[i + 1 : len(this)] if x])
-        )
-    binary_str = "".join(this)
-    return binary_str  # ("00000000" + binary)[7 + (len(binary) // 8):]
+    data = bytes(memoryview(bytes_like).cast("B"))
+    byte_bits = bits(data)
+    total = len(byte_bits)
+    if total == 0:
+        return ""
+    wrap_count = wrap_count if wrap_count > 0 else total
+    separator = " " if spaced else ""
+    padding = separator + "        "  # Takes the place of a missing byte
+    lines = []
+    for i in range(0, total, wrap_count):
+        chunk = byte_bits[i : i + wrap_count]
+        line = (" " if edge_space else "") + separator.join(chunk)
+        if to_chars:
+            chars = "  " + data[i : i + wrap_count].decode("latin-1")
+            line += chars if len(chunk) == wrap_count else padding * (wrap_count - len(chunk)) + chars
+        lines.append(line)
+    binary_str = "\n".join(lines)
+    if to_chars and total % wrap_count == 0:
+        binary_str += padding * wrap_count + "  "  # An empty character column closes full lines
+    return binary_str
+
+
+_IEC_UNITS: tuple[str, ...] = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB", "YiB")
+_SI_UNITS: tuple[str, ...] = ("B", "kB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB", "RB", "QB")
+_BIT_UNITS: tuple[str, ...] = ("bps", "Kbps", "Mbps", "Gbps", "Tbps")
+
+
+def _to_human_readable(size: int | float, base: int, units: tuple[str, ...]) -> str:
+    for unit in units:
+        if size < base or unit == units[-1]:  # Ensure we don't exceed the last unit
+            return f"{size:.2f} {unit}"
+        size /= base
+    raise RuntimeError()
+
+
+def _to_human_readable_many(
+    sizes: "_a.Iterable[int | float] | _np.ndarray", base: int, units: tuple[str, ...]
+) -> list[str]:
+    """
+    Formats many sizes exactly like `_to_human_readable` would one by one.
+
+    With NumPy all sizes are divided by `base` in one vectorized pass per unit, only the ones that
+    are not below it yet, which gives the same float results as dividing them one at a time. The
+    strings are then produced with one precomputed %-template per unit. Integers beyond 2 ** 53
+    would be rounded twice when converted to floats first, so they take the pure-python path.
+    """
+    templates = [f"%.2f {unit}" for unit in units]
+    last = len(units) - 1
+    if _np is not None:
+        if not isinstance(sizes, (_a.Sequence, _np.ndarray)):
+            sizes = list(sizes)
+        values = _np.asarray(sizes)
+        if values.dtype.kind in "iuf" and not (
+            values.dtype.kind in "iu" and values.size and int(_np.abs(values).max()) > 1 << 53
+        ):
+            values = values.astype(_np.float64).ravel()  # Always a copy we can divide in place
+            unit_indices = _np.zeros(len(values), dtype=_np.intp)
+            for _ in range(last):
+                larger = ~(values < base)  # Also true for NaN, like in the scalar version
+                if not larger.any():
+                    break
+                values[larger] /= base
+                unit_indices[larger] += 1
+            return [
+                templates[index] % value
+                for index, value in zip(unit_indices.tolist(), values.tolist())
+            ]
+        sizes = values.ravel().tolist()
+
+    result = []
+    for size in sizes:
+        index = 0
+        while index < last and not size < base:
+            size /= base
+            index += 1
+        result.append(templates[index] % size)
+    return result
 
 
 def bytes_to_human_readable_binary_iec(size: int | float) -> str:
@@ -1363,12 +4060,7 @@ def bytes_to_human_readable_binary_iec(size: int | float) -> str:
     Returns:
         str: The size formatted as a human-readable string (e.g., "1.00 MiB").
     """
-    units = ["B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB", "YiB"]
-    for unit in units:
-        if size < 1024 or unit == units[-1]:
-            return f"{size:.2f} {unit}"
-        size /= 1024
-    raise RuntimeError()
+    return _to_human_readable(size, 1024, _IEC_UNITS)
 
 
 def bytes_to_human_readable_decimal_si(size: int | float) -> str:
@@ -1380,12 +4072,7 @@ def bytes_to_human_readable_decimal_si(size: int | float) -> str:
     Returns:
         str: The size formatted as a human-readable string (e.g., "1.00 MB").
     """
-    units = ["B", "kB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB", "RB", "QB"]
-    for unit in units:
-        if size < 1000 or unit == units[-1]:
-            return f"{size:.2f} {unit}"
-        size /= 1000
-    raise RuntimeError()
+    return _to_human_readable(size, 1000, _SI_UNITS)
 
 
 def bits_to_human_readable(size: int | float) -> str:
@@ -1397,9 +4084,44 @@ def bits_to_human_readable(size: int | float) -> str:
     Returns:
         str: The size formatted as a human-readable string (e.g., "1.00 Mbps").
     """
-    units = ["bps", "Kbps", "Mbps", "Gbps", "Tbps"]
-    for unit in units:
-        if size < 1000 or unit == units[-1]:  # Ensure we don't exceed the last unit
-            return f"{size:.2f} {unit}"
-        size /= 1000
-    raise RuntimeError()
+    return _to_human_readable(size, 1000, _BIT_UNITS)
+
+
+def bytes_to_human_readable_binary_iec_many(
+    sizes: "_a.Iterable[int | float] | _np.ndarray",
+) -> list[str]:
+    """Convert many byte sizes to human-readable binary strings using IEC units.
+
+    Args:
+        sizes (Iterable[int | float] | ndarray): The sizes in bytes.
+
+    Returns:
+        list[str]: The same strings `bytes_to_human_readable_binary_iec` returns, in order.
+    """
+    return _to_human_readable_many(sizes, 1024, _IEC_UNITS)
+
+
+def bytes_to_human_readable_decimal_si_many(
+    sizes: "_a.Iterable[int | float] | _np.ndarray",
+) -> list[str]:
+    """Convert many byte sizes to human-readable strings using decimal SI units.
+
+    Args:
+        sizes (Iterable[int | float] | ndarray): The sizes in bytes.
+
+    Returns:
+        list[str]: The same strings `bytes_to_human_readable_decimal_si` returns, in order.
+    """
+    return _to_human_readable_many(sizes, 1000, _SI_UNITS)
+
+
+def bits_to_human_readable_many(sizes: "_a.Iterable[int | float] | _np.ndarray") -> list[str]:
+    """Convert many bit sizes to human-readable strings using SI units.
+
+    Args:
+        sizes (Iterable[int | float] | ndarray): The sizes in bits.
+
+    Returns:
+        list[str]: The same strings `bits_to_human_readable` returns, in order.
+    """
+    return _to_human_readable_many(sizes, 1000, _BIT_UNITS)
@@ -2,10 +2,14 @@
 
 from contextlib import contextmanager as _contextmanager
 from cachetools import LRUCache as _LRUCache
-from threading import RLock as _RLock
+from threading import RLock as _RLock, Condition as _Condition, local as _local, current_thread as _current_thread
+import weakref as _weakref
 import sqlite3
 import struct
 import json
+import mmap
+import time
+import zlib
 import os
 
 from ..io.fileio import os_open as _os_open
@@ -26,12 +30,49 @@ __hard_deps__: list[str] = ["cachetools>=5.5.0"]
 _enforce_hard_deps(__hard_deps__, __name__)
 
 
+def _read_at(fd: int, size: int, position: int) -> bytes:
+    """Reads `size` bytes at `position` without moving the file pointer where `os.pread` exists."""
+    if hasattr(os, "pread"):
+        chunks = []
+        while size > 0:
+            chunk = os.pread(fd, size, position)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+            position += len(chunk)
+        return b"".join(chunks)
+    os.lseek(fd, position, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _write_at(fd: int, data: bytes, position: int) -> None:
+    """Writes all of `data` at `position` without moving the file pointer where `os.pwrite` exists."""
+    view = memoryview(data)
+    if not hasattr(os, "pwrite"):
+        os.lseek(fd, position, os.SEEK_SET)
+    while view:
+        if hasattr(os, "pwrite"):
+            written = os.pwrite(fd, view, position)
+        else:
+            written = os.write(fd, view)
+        view = view[written:]
+        position += written
+
+
 class StorageMedium:
     """
     A base class to define the interface for different storage mediums.
     Subclasses should implement methods to store and retrieve data efficiently.
     Implements multiuser compatibility by using a versioning counter with LRU caching.
 
+    Next to the 1-byte version at the start of the file, writers keep a 64-bit generation counter
+    and one change stamp per key bucket in the sidecar file `<filepath>.gen`. Every store advances
+    the generation and stamps the buckets of the stored keys with it, so other instances only evict
+    the cached keys whose bucket changed since they last looked instead of their whole cache.
+    The sidecar also holds an epoch that advances whenever a writer moved existing data (e.g. a
+    compaction), which tells other instances to drop positional state like indices.
+
     Attributes:
         _read_cache (LRUCache): An instance of an LRU cache to store recently accessed data.
         _lock (_Lock): A lock to handle concurrency for versioning in a multiuser setup.
@@ -54,9 +95,13 @@ class StorageMedium:
         self._read_cache: _LRUCache = _LRUCache(maxsize=max_cache_size)
         self._filepath: str = filepath
         self._current_version: int | None = None
+        self._generation: int = 0
+        self._epoch: int = 0
+        self._rewritten: bool = False  # Set by writes that moved existing data, see _stamp
         self._lock: _RLock = _RLock()
 
         self._current_version = self.create_storage(self._filepath)
+        self._generation, self._epoch, _ = self._read_generation(-1)
 
     @classmethod
     def from_webresource(
@@ -97,6 +142,127 @@ class StorageMedium:
                     version = first_byte[0]  # Read existing version
         return version
 
+    _STAMP_BUCKETS: int = 256
+    _STAMPS: struct.Struct = struct.Struct(f"!QQ{_STAMP_BUCKETS}Q")
+
+    def _generation_path(self) -> str:
+        return self._filepath + ".gen"
+
+    def _bucket(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self._STAMP_BUCKETS
+
+    def _read_generation(self, known: int) -> tuple[int, int, tuple[int, ...] | None]:
+        """
+        Reads the generation and epoch from the sidecar and, if the generation differs from `known`,
+        the bucket stamps.
+
+        :param known: The generation the caller already knows about.
+        :return: The generation, the epoch and the stamps (None if they weren't read or are missing).
+        """
+        try:
+            fd = os.open(self._generation_path(), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            return 0, 0, None
+        try:
+            header = _read_at(fd, 16, 0)
+            if len(header) < 16:
+                return 0, 0, None
+            generation, epoch = int.from_bytes(header[:8], "big"), int.from_bytes(header[8:], "big")
+            if generation == known:
+                return generation, epoch, None
+            data = header + _read_at(fd, self._STAMPS.size - 16, 16)
+            if len(data) < self._STAMPS.size:
+                return generation, epoch, None
+            return generation, epoch, self._STAMPS.unpack(data)[2:]
+        finally:
+            os.close(fd)
+
+    def _sync(self, f: _os_open) -> int:
+        """
+        Reads the version byte (f has to be positioned at the start) and the generation
+        and invalidates whatever other writers changed since the last sync.
+
+        :param f: The open and locked storage file.
+        :return: The version byte.
+        """
+        version = f.read(1)[0]
+        known = self._generation
+        generation, epoch, stamps = self._read_generation(known)
+
+        if generation == known:
+            if version != self._current_version:
+                self._invalidate()  # Changed by a writer that doesn't keep the stamps
+        elif generation < known or stamps is None:
+            self._invalidate()  # The sidecar was reset
+        else:
+            self._invalidate(lambda key: stamps[self._bucket(key)] > known)
+        self._generation = generation
+        self._current_version = version
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self._relocated()
+        return version
+
+    def _relocated(self) -> None:
+        """Called when another writer moved existing data, without changing any values."""
+
+    def _stamp(self, keys: _a.Iterable[str]) -> None:
+        """
+        Advances the generation and stamps the buckets of the changed keys with it. If the write
+        moved existing data (`_rewritten` is set) the epoch is advanced as well.
+        Has to be called while holding the file lock, after _sync.
+
+        :param keys: The keys that changed.
+        """
+        generation = self._generation + 1
+        epoch = self._epoch + self._rewritten
+        fd = os.open(
+            self._generation_path(), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        )
+        try:
+            data = _read_at(fd, self._STAMPS.size, 0)
+            if len(data) < self._STAMPS.size:  # New sidecar, everything counts as changed
+                stamps = [generation] * self._STAMP_BUCKETS
+            else:
+                stamps = list(self._STAMPS.unpack(data)[2:])
+                for key in keys:
+                    stamps[self._bucket(key)] = generation
+            _write_at(fd, self._STAMPS.pack(generation, epoch, *stamps), 0)
+        finally:
+            os.close(fd)
+        self._generation = generation
+        self._epoch = epoch
+        self._rewritten = False
+
+    def _invalidate(self, stale: _a.Callable[[str], bool] | None = None) -> None:
+        """
+        Drops everything derived from the file after another writer changed it.
+
+        :param stale: Tells which cached keys could have changed, None if all of them could have.
+        """
+        if stale is None:
+            self._read_cache.clear()
+            return
+        for key in [key for key in self._read_cache if stale(key)]:
+            del self._read_cache[key]
+
+    @_contextmanager
+    def _open_storage(self, mode: str) -> _ty.Generator[_os_open, None, None]:
+        """
+        Opens and locks the storage file. Retries if the file was atomically replaced
+        while waiting for the lock, as the lock would then belong to the old file.
+        """
+        while True:
+            f = _os_open(self._filepath, mode)
+            try:
+                if os.path.samestat(os.fstat(f.fileno()), os.stat(self._filepath)):
+                    break
+            except FileNotFoundError:
+                pass
+            f.close()
+        with f:
+            yield f
+
     def _store_data(self, f: _os_open, items: dict[str, str]) -> None:
         raise NotImplementedError
 
@@ -107,14 +273,11 @@ class StorageMedium:
         :param items: A dictionary with items to be stored.
         """
         with self._lock:
-            with _os_open(self._filepath, "r+b") as f:
-                version = f.read(1)[0]
-
-                if version != self._current_version:
-                    self._read_cache.clear()
-                    self._current_version = version
+            with self._open_storage("r+b") as f:
+                self._sync(f)
                 self._current_version = (self._current_version + 1) & 255
                 self._store_data(f, items)
+                self._stamp(items)
                 f.seek(0, f.SEEK_SET)
                 f.write(self._current_version.to_bytes(1, "big"))
 
@@ -129,13 +292,8 @@ class StorageMedium:
         :return: The retrieved data or None if the key doesn't exist.
         """
         with self._lock:
-            with _os_open(self._filepath, "rb") as f:
-                version = f.read(1)[0]
-
-                if version != self._current_version:
-                    self._read_cache.clear()
-                    self._current_version = version
-                    return self._retrieve_data(f, keys)
+            with self._open_storage("rb") as f:
+                self._sync(f)
                 return self._retrieve_data(f, keys)
 
     def filepath(self) -> str:
@@ -169,80 +327,160 @@ class StorageMedium:
 class JSONStorage(StorageMedium):
     """
     A storage medium using JSON files to store and retrieve key-data pairs.
+
+    The parsed document stays in memory and is only reparsed once another writer changed the version byte.
+    Stores are applied to the document right away and written out together, after `flush_every` stores,
+    once `flush_interval` seconds passed since the last write or on flush(). The default of flush_every=1
+    writes every store through. Every write replaces the file atomically with a temporary file, except on
+    Windows, where a file can't be replaced while it is open and locked, so it is rewritten in place there.
+    Pending items only exist in memory, so with batching enabled they have to be flushed with flush(),
+    close() or by using the storage as a context manager, which flushes on exit.
     """
 
+    _replace_atomically: bool = os.name != "nt"  # Windows can't replace a file that is still open
+
     def __init__(
-        self, filepath: str, max_cache_size: int = 128, beautify: bool = False
+        self,
+        filepath: str,
+        max_cache_size: int = 128,
+        beautify: bool = False,
+        flush_every: int | None = 1,
+        flush_interval: float | None = None,
     ) -> None:
+        """
+        :param filepath: The storage filepath.
+        :param max_cache_size: The maximum size of the LRU read cache.
+        :param beautify: If the JSON file should be indented.
+        :param flush_every: The amount of stores after which pending items get written, None to disable.
+        :param flush_interval: The seconds after the last write after which a store flushes, None to disable.
+        """
         self.beautify: bool = beautify
+        self.flush_every: int | None = flush_every
+        self.flush_interval: float | None = flush_interval
+        self._document: dict[str, str] | None = None
+        self._pending: dict[str, str] = {}
+        self._pending_stores: int = 0
+        self._last_flush: float = time.monotonic()
         super().__init__(filepath, max_cache_size)
 
-    def _store_data(self, f: _os_open, items: dict[str, str]) -> None:
-        """
-        Store the data under a specified key in a JSON file.
+    def _invalidate(self, stale: _a.Callable[[str], bool] | None = None) -> None:
+        super()._invalidate(stale)
+        self._document = None
 
-        :param f: The open file object (os_open) to store data.
-        :param items: A dictionary with items to be stored.
-        """
-        # We can assume that f is positioned after the version byte
+    def _load_document(self, f: _os_open) -> dict[str, str]:
+        """Parses the file (positioned after the version byte) and reapplies the pending items."""
         try:
             # Load the existing JSON data (or start with an empty dictionary if the file is empty)
-            storage = json.loads(f.read().decode())
+            document = json.loads(f.read().decode())
         except (ValueError, json.JSONDecodeError):
-            storage = {}
+            document = {}
+        document |= self._pending
+        self._document = document
+        return document
 
-        # Update the JSON structure with the new key-value pair
-        storage |= items
+    def _store_data(self, f: _os_open, items: dict[str, str]) -> None:
+        """
+        Merge items into the resident document and replace the JSON file with it, atomically where possible.
 
-        # Move back to the start of the file (after the version byte)
-        f.seek(1, f.SEEK_SET)
+        :param f: The open file object (os_open), positioned after the version byte.
+        :param items: A dictionary with items to be stored.
+        """
+        document = self._document
+        if document is None:
+            document = self._load_document(f)
+        document |= items
 
-        # Write the updated JSON data (without overwriting the version byte)
-        f.truncate()
         if self.beautify:
-            f.write(beautify_json(storage).encode())
+            data = beautify_json(document).encode()
         else:
-            f.write(json.dumps(storage).encode())
+            data = json.dumps(document).encode()
+        data = self._current_version.to_bytes(1, "big") + data
+
+        if not self._replace_atomically:
+            f.seek(0, f.SEEK_SET)
+            f.truncate()
+            f.write(data)
+            return
+        tmp_path = f"{self._filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, self._filepath)
 
-        for k, v in items.items():
-            self._read_cache[k] = v
+    def store(self, items: dict[str, str]) -> None:
+        """
+        Store the data under a specified key, writing it once the flush policy says so.
+
+        :param items: A dictionary with items to be stored.
+        """
+        with self._lock:
+            self._pending |= items
+            self._pending_stores += 1
+            if self._document is not None:
+                self._document |= items
+            if (
+                self.flush_every is not None and self._pending_stores >= self.flush_every
+            ) or (
+                self.flush_interval is not None
+                and time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all pending items to the file in one go.
+        """
+        with self._lock:
+            self._pending_stores = 0
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            with self._open_storage("r+b") as f:
+                self._sync(f)
+                self._current_version = (self._current_version + 1) & 255
+                self._store_data(f, {})
+                self._stamp(self._pending)
+            self._pending.clear()
+
+    def close(self) -> None:
+        """Flushes all pending items and drops the in-memory document."""
+        with self._lock:
+            self.flush()
+            self._document = None
+            self._read_cache.clear()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        try:
+            self.flush()
+        finally:
+            self.release()
+        return False
 
     def _retrieve_data(self, f: _os_open, keys: list[str]) -> list[str | None]:
         """
-        Retrieve the data stored under the specified key from a JSON file.
+        Retrieve the data stored under the specified key from the resident JSON document.
 
         :param f: The open file object (os_open) to read data from.
         :param keys: The keys associated with the data.
         :return: The retrieved data or None if the key doesn't exist.
         """
-        dates = []
-        json_storage = None
-        for key in keys:
-            cached = self._read_cache.get(key)
-
-            if cached is None:
-                if json_storage is None:
-                    # We can assume that f is positioned after the version byte
-                    try:
-                        # Load the entire JSON data from the file
-                        data = f.read().decode()
-                        json_storage = json.loads(data)
-                    except (ValueError, json.JSONDecodeError):
-                        dates.append(None)  # If the file is empty or corrupted
-
-                    # Cache every key-value pair in the file
-                    if len(self._read_cache) == 0:
-                        for k, v in json_storage.items():
-                            self._read_cache[k] = v
-                dates.append(json_storage.get(key))
-            else:
-                dates.append(cached)
-        return dates
+        document = self._document
+        if document is None:
+            document = self._load_document(f)
+        return [document.get(key) for key in keys]
 
 
 class SQLite3Storage(StorageMedium):
     """
     A storage medium using an SQLite3 database to store and retrieve key-data pairs.
+
+    By default every operation opens and closes its own connection. With `pool="thread"` every thread
+    keeps one connection open until it exits or the pool is closed, with `pool="shared"` up to `pool_size`
+    connections are shared between all threads. Pooled connections keep their cached prepared statements,
+    get the configured PRAGMAs applied once when they are opened and only writes are serialized by the
+    storage lock, so readers don't block each other (in WAL mode not even while a write is in progress).
+    Pooled connections are released with close().
     """
 
     def __init__(
@@ -251,18 +489,45 @@ class SQLite3Storage(StorageMedium):
         tables: tuple[str, ...] = ("storage",),
         drop_unused_tables: bool = False,
         use_wal_journal_mode: bool = False,
+        pool: _ty.Literal["thread", "shared"] | None = None,
+        pool_size: int = 4,
+        pragmas: dict[str, str | int] | None = None,
     ) -> None:
         """
         Initializes the SQLite3Storage with a database file.
 
         :param filepath: The path to the SQLite3 database file.
+        :param pool: None to connect per operation, "thread" for one connection per thread
+            or "shared" for a bounded pool shared between threads.
+        :param pool_size: The maximum amount of connections in a shared pool.
+        :param pragmas: PRAGMAs (e.g. synchronous, mmap_size, cache_size) applied to every new connection.
         """
+        if pool not in (None, "thread", "shared"):
+            raise ValueError(f"Unknown pool mode {pool!r}")
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self._pragmas: dict[str, str | int] = {}
+        if use_wal_journal_mode:
+            self._pragmas["journal_mode"] = "WAL"
+        for name, value in (pragmas or {}).items():
+            if not name.isidentifier() or not (
+                isinstance(value, int) or str(value).isidentifier()
+            ):
+                raise ValueError(f"Invalid PRAGMA {name}={value!r}")
+            self._pragmas[name] = value
+        self._pool_mode: str | None = pool
+        self._pool_size: int = pool_size
+        self._idle: list[sqlite3.Connection] = []  # Connections of the shared pool that aren't checked out
+        self._local: _local = _local()
+        self._connections: dict[int, sqlite3.Connection] = {}  # id -> open pooled connection
+        self._busy: set[int] = set()  # Ids of the checked out connections
+        self._pool_generation: int = 0  # Advanced by close()
+        self._pool_lock: _RLock = _RLock()  # Reentrant, as thread finalizers can run at any time
+        self._pool_free: _Condition = _Condition(self._pool_lock)  # Notified when a connection or slot frees up
         self._tables = tables
         self._table = tables[0]  # You have to set _table before the init call
         super().__init__(filepath)
         with self._connection(filepath) as conn:
-            if use_wal_journal_mode:
-                conn.execute("PRAGMA journal_mode=WAL;")
             cursor = conn.cursor()
             if drop_unused_tables:
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -274,19 +539,108 @@ class SQLite3Storage(StorageMedium):
 
             conn.commit()
 
+    def _connect(self, filepath: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(filepath, check_same_thread=False)
+        for name, value in self._pragmas.items():
+            conn.execute(f"PRAGMA {name}={value};")
+        return conn
+
+    def _checkout(self) -> tuple[sqlite3.Connection, int]:
+        """
+        Takes a connection out of the pool, opening a new one while the pool isn't full.
+
+        :return: The connection and the pool generation it belongs to.
+        """
+        if self._pool_mode == "thread":
+            conn = getattr(self._local, "connection", None)
+            with self._pool_lock:
+                if conn is not None and self._connections.get(id(conn)) is conn:
+                    self._busy.add(id(conn))
+                    return conn, self._pool_generation
+            conn = self._local.connection = self._connect(self._filepath)
+            with self._pool_lock:
+                self._connections[id(conn)] = conn
+                self._busy.add(id(conn))
+                generation = self._pool_generation
+            # Threads come and go, their connection is closed once the thread is gone
+            _weakref.finalize(_current_thread(), SQLite3Storage._discard, _weakref.ref(self), conn)
+            return conn, generation
+
+        with self._pool_free:
+            while not self._idle and len(self._connections) >= self._pool_size:
+                self._pool_free.wait()
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = self._connect(self._filepath)
+                self._connections[id(conn)] = conn
+            self._busy.add(id(conn))
+            return conn, self._pool_generation
+
+    def _checkin(self, conn: sqlite3.Connection, generation: int) -> None:
+        """Returns a connection to the pool, or closes it if the pool was closed in the meantime."""
+        with self._pool_free:
+            self._busy.discard(id(conn))
+            current = generation == self._pool_generation
+            if current and self._pool_mode == "shared":
+                self._idle.append(conn)
+                self._pool_free.notify()
+        if not current:
+            conn.close()
+
+    @staticmethod
+    def _discard(storage_ref: "_weakref.ref[SQLite3Storage]", conn: sqlite3.Connection) -> None:
+        """Finalizer for the connection of a thread that is gone."""
+        storage = storage_ref()
+        if storage is not None:
+            with storage._pool_lock:
+                storage._connections.pop(id(conn), None)
+        conn.close()
+
     @_contextmanager
     def _connection(
-        self, filepath: str
+        self, filepath: str, write: bool = True
     ) -> _ty.Generator[sqlite3.Connection, None, None]:
-        with self._lock:
-            conn = None
-            try:
-                conn = sqlite3.connect(filepath, check_same_thread=False)
+        if self._pool_mode is None or filepath != self._filepath:
+            with self._lock:
+                conn = None
+                try:
+                    conn = self._connect(filepath)
+                    yield conn
+                    conn.commit()  # Commit changes automatically at the end of the block
+                finally:
+                    if conn is not None:
+                        conn.close()
+            return
+        conn, generation = self._checkout()
+        try:
+            if write:
+                with self._lock:
+                    try:
+                        yield conn
+                        conn.commit()
+                    except BaseException:
+                        conn.rollback()
+                        raise
+            else:
                 yield conn
-                conn.commit()  # Commit changes automatically at the end of the block
-            finally:
-                if conn is not None:
-                    conn.close()
+        finally:
+            self._checkin(conn, generation)
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections. The storage stays usable and reconnects on the next operation.
+        """
+        with self._pool_free:
+            self._pool_generation += 1
+            connections, self._connections = self._connections, {}
+            # Checked out connections are closed when they are returned
+            idle = [conn for key, conn in connections.items() if key not in self._busy]
+            self._idle = []
+            self._local = _local()
+            self._pool_free.notify_all()  # All slots are free again
+        for conn in idle:
+            conn.close()
 
     def switch_table(self, table: str) -> None:
         """
@@ -395,15 +749,78 @@ class SQLite3Storage(StorageMedium):
         :param keys: The keys associated with the data.
         :return: The retrieved data or None if the key doesn't exist.
         """
-        with self._connection(self._filepath) as conn:
+        with self._connection(self._filepath, write=False) as conn:
             return self._retrieve_data(conn, keys)
 
 
 class BinaryStorage(StorageMedium):
     """
     A storage medium using binary format to store and retrieve key-data pairs.
+
+    The file is an append-only log of records. Every store appends the new records at the end,
+    superseding older records of the same keys, and an in-memory index (key -> (offset, length)
+    of the value) turns every lookup into a single read. The index is built by scanning the
+    file when it is opened, or loaded from the sidecar file `<filepath>.idx` if that was written
+    since the last compaction, in which case only the records appended after it are scanned.
+    Records appended by other instances are picked up the same way. Once the superseded records
+    make up more than `compaction_threshold` of the file (and at least `min_compaction_size` bytes)
+    the live records are compacted in place, which advances the epoch so that other instances
+    rebuild their index.
     """
 
+    _SIDECAR_MAGIC: bytes = b"APB2"
+    _SIDECAR_HEADER: struct.Struct = struct.Struct("!4sQQQI")
+    _SIDECAR_ENTRY: struct.Struct = struct.Struct("!QI")
+    _LENGTH: struct.Struct = struct.Struct("!I")
+    _COMPACTION_CHUNK: int = 1 << 20
+
+    def __init__(
+        self,
+        filepath: str,
+        max_cache_size: int = 128,
+        compaction_threshold: float = 0.5,
+        min_compaction_size: int = 1 << 16,
+        use_sidecar_index: bool = True,
+    ) -> None:
+        """
+        Opens (or creates) the binary storage and builds its key index.
+
+        :param filepath: The storage filepath.
+        :param max_cache_size: The maximum size of the LRU read cache.
+        :param compaction_threshold: The fraction of superseded bytes in the file that triggers a compaction.
+        :param min_compaction_size: The amount of superseded bytes needed before any compaction happens.
+        :param use_sidecar_index: If the index should be loaded from and saved to `<filepath>.idx`.
+        """
+        if not 0.0 < compaction_threshold <= 1.0:
+            raise ValueError("compaction_threshold must be in (0, 1]")
+        self.compaction_threshold: float = compaction_threshold
+        self.min_compaction_size: int = min_compaction_size
+        self.use_sidecar_index: bool = use_sidecar_index
+        self._index: dict[str, tuple[int, int]] | None = None
+        self._end: int = 1  # End of the last complete record
+        self._garbage: int = 0  # Bytes taken up by superseded records
+        super().__init__(filepath, max_cache_size)
+        with self._lock:
+            with self._open_storage("rb") as f:
+                self._ensure_index(f)
+
+    def _sidecar_path(self) -> str:
+        return self._filepath + ".idx"
+
+    def _invalidate(self, stale: _a.Callable[[str], bool] | None = None) -> None:
+        super()._invalidate(stale)
+        if stale is None:  # Unknown change, the index is reloaded
+            self._index = None
+
+    def _relocated(self) -> None:
+        self._index = None
+
+    def _stamp(self, keys: _a.Iterable[str]) -> None:
+        compacted = self._rewritten
+        super()._stamp(keys)
+        if compacted and self.use_sidecar_index:
+            self._save_sidecar()
+
     def _pack_data(self, key: str, data: str) -> bytes:
         """
         Pack key and data into a binary format with length prefixes for variable-sized data.
@@ -449,38 +866,208 @@ class BinaryStorage(StorageMedium):
 
         return key, value, pos
 
-    def _store_data(self, f: _os_open, items: dict[str, str]) -> None:
+    def _scan_index(self, f: _os_open, size: int) -> None:
         """
-        Store the data under a specified key in a binary file,
-        reading all key-value pairs into memory, modifying them,
-        and writing everything back in one go.
+        Adds the records between the end of the index and `size` to the index by walking their headers.
+
+        A torn record at the end (from an interrupted append) is ignored and gets overwritten by the next store.
         """
-        # Read the entire file into memory
-        buffer = f.read()
+        index = self._index
+        garbage = self._garbage
+        pos = self._end
+        if size > pos:
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as data:
+                unpack_length = self._LENGTH.unpack_from
+                while pos + 4 <= size:
+                    key_len = unpack_length(data, pos)[0]
+                    value_pos = pos + 8 + key_len
+                    if value_pos > size:
+                        break
+                    value_len = unpack_length(data, value_pos - 4)[0]
+                    if value_pos + value_len > size:
+                        break
+                    key = data[pos + 4 : value_pos - 4].decode("utf-8")
+                    old = index.get(key)
+                    if old is not None:
+                        garbage += 8 + key_len + old[1]
+                    index[key] = (value_pos, value_len)
+                    pos = value_pos + value_len
+        self._index = index
+        self._end = pos
+        self._garbage = garbage
+
+    def _load_sidecar(self, size: int) -> bool:
+        """Loads the index from the sidecar file if it was written since the last compaction."""
+        try:
+            with open(self._sidecar_path(), "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        header = self._SIDECAR_HEADER
+        if len(data) < header.size:
+            return False
+        magic, epoch, end, garbage, count = header.unpack_from(data, 0)
+        if magic != self._SIDECAR_MAGIC or epoch != self._epoch or end > size:
+            return False
+        index: dict[str, tuple[int, int]] = {}
+        unpack_length = self._LENGTH.unpack_from
+        unpack_entry = self._SIDECAR_ENTRY.unpack_from
+        entry_size = self._SIDECAR_ENTRY.size
+        pos = header.size
+        try:
+            for _ in range(count):
+                key_len = unpack_length(data, pos)[0]
+                pos += 4
+                key = data[pos : pos + key_len].decode("utf-8")
+                pos += key_len
+                index[key] = unpack_entry(data, pos)
+                pos += entry_size
+        except (struct.error, UnicodeDecodeError):
+            return False
+        self._index = index
+        self._end = end
+        self._garbage = garbage
+        return True
+
+    def _ensure_index(self, f: _os_open) -> dict[str, tuple[int, int]]:
+        """
+        Returns the index, scanning the records appended since it was last updated. It is only
+        rebuilt from the sidecar or the whole log if there is none or the log shrank.
+        """
+        size = os.fstat(f.fileno()).st_size
+        if self._index is not None:
+            if size >= self._end:
+                if size > self._end:
+                    self._scan_index(f, size)
+                return self._index
+            self._read_cache.clear()  # Truncated without a generation change
+        if not (self.use_sidecar_index and self._load_sidecar(size)):
+            self._index, self._end, self._garbage = {}, 1, 0
+        self._scan_index(f, size)
+        return self._index
+
+    def save_index(self) -> None:
+        """
+        Writes the current index to the sidecar file so the next open doesn't have to scan the log.
+        """
+        with self._lock:
+            with self._open_storage("rb") as f:
+                self._sync(f)
+                self._ensure_index(f)
+                self._save_sidecar()
+
+    def _save_sidecar(self) -> None:
+        parts = [
+            self._SIDECAR_HEADER.pack(
+                self._SIDECAR_MAGIC, self._epoch, self._end, self._garbage, len(self._index)
+            )
+        ]
+        pack_length = self._LENGTH.pack
+        pack_entry = self._SIDECAR_ENTRY.pack
+        for key, (offset, length) in self._index.items():
+            key_bytes = key.encode("utf-8")
+            parts.append(pack_length(len(key_bytes)))
+            parts.append(key_bytes)
+            parts.append(pack_entry(offset, length))
+        tmp_path = self._sidecar_path() + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(tmp_path, self._sidecar_path())
+
+    def close(self) -> None:
+        """Saves the sidecar index (if enabled) and drops the in-memory state."""
+        with self._lock:
+            if self.use_sidecar_index:
+                self.save_index()
+            self._index = None
+            self._read_cache.clear()
 
-        # Unpack the entire binary data into a dictionary
-        pos = 0
-        all_data = {}  # Dictionary to store all key-value pairs
-        while pos + 4 <= len(
-            buffer
-        ):  # Ensure we have enough bytes to unpack the key length
-            # Use _unpack_data to extract key, value, and the updated position
-            key, value, pos = self._unpack_data(buffer, pos)
-            all_data[key] = value
+    def _store_data(self, f: _os_open, items: dict[str, str]) -> None:
+        """
+        Store the data under a specified key in a binary file by appending new records
+        to the end of the log, superseding older records of the same keys.
+        """
+        index = self._ensure_index(f)
+        fd = f.fileno()
+        start = pos = self._end
+        if os.fstat(fd).st_size != start:
+            os.ftruncate(fd, start)  # Drop a torn record
 
-        # Update or add new items to the dictionary
+        records = []
         for key, value in items.items():
-            all_data[key] = value
+            record = self._pack_data(key, value)
+            key_len = self._LENGTH.unpack_from(record, 0)[0]
+            old = index.get(key)
+            if old is not None:
+                self._garbage += 8 + key_len + old[1]
+            index[key] = (pos + 8 + key_len, len(record) - 8 - key_len)
+            pos += len(record)
+            records.append(record)
             self._read_cache[key] = value  # Update the cache
+        _write_at(fd, b"".join(records), start)
+        self._end = pos
 
-        # Now write everything back to the file
-        f.seek(1)  # Move to the start of the file after the version byte
-        f.truncate()  # Truncate the file to clear old data
+        if (
+            self._garbage >= self.min_compaction_size
+            and self._garbage > self.compaction_threshold * (self._end - 1)
+        ):
+            self._compact(f)
 
-        # Pack the entire dictionary into a binary format using _pack_data
-        for key, value in all_data.items():
-            packed_entry = self._pack_data(key, value)
-            f.write(packed_entry)
+    def _compact(self, f: _os_open) -> None:
+        """
+        Moves all live records to the front of the log (keeping their order) and truncates the rest.
+
+        Records only ever move towards the start of the file, so runs of live records are copied forward
+        in bounded chunks without needing a second file or holding everything in memory.
+        """
+        fd = f.fileno()
+        chunk = self._COMPACTION_CHUNK
+        records = sorted(
+            (offset - 8 - len(key.encode("utf-8")), offset, length, key)
+            for key, (offset, length) in self._index.items()
+        )
+        index: dict[str, tuple[int, int]] = {}
+        write_pos = 1
+        run_start = run_end = 1
+
+        def _move(src: int, end: int, dst: int) -> None:
+            if src == dst:
+                return
+            while src < end:
+                data = _read_at(fd, min(chunk, end - src), src)
+                _write_at(fd, data, dst)
+                src += len(data)
+                dst += len(data)
+
+        for start, offset, length, key in records:
+            if start != run_end:
+                _move(run_start, run_end, write_pos)
+                write_pos += run_end - run_start
+                run_start = start
+            run_end = offset + length
+            index[key] = (write_pos + offset - run_start, length)
+        _move(run_start, run_end, write_pos)
+        write_pos += run_end - run_start
+
+        os.ftruncate(fd, write_pos)
+        self._index = index
+        self._end = write_pos
+        self._garbage = 0
+        self._rewritten = True
+
+    def compact(self) -> None:
+        """
+        Rewrites the log so that it only contains the newest record of every key.
+        """
+        with self._lock:
+            with self._open_storage("r+b") as f:
+                self._sync(f)
+                self._current_version = (self._current_version + 1) & 255
+                self._ensure_index(f)
+                self._compact(f)
+                self._stamp(())  # No value changed, only the epoch advances
+                f.seek(0, f.SEEK_SET)
+                f.write(self._current_version.to_bytes(1, "big"))
 
     def _retrieve_data(self, f: _os_open, keys: list[str]) -> list[str | None]:
         """
@@ -491,35 +1078,19 @@ class BinaryStorage(StorageMedium):
         :return: The retrieved data or None if the key doesn't exist.
         """
         results = []
-        bin_storage = None
+        index = None
 
         for key in keys:
             cached = self._read_cache.get(key)
 
             if cached is None:
-                if bin_storage is None:
-                    bin_storage = {}
-                    buffer = f.read()  # Assume f is positioned after the version byte
-                    pos = 0
-                    fill_cache = len(self._read_cache) == 0
-
-                    while pos + 4 <= len(
-                        buffer
-                    ):  # Ensure there are enough bytes to unpack
-                        # Use _unpack_data to extract key, value, and the updated position
-                        existing_key, existing_value, pos = self._unpack_data(
-                            buffer, pos
-                        )
-
-                        # Optionally fill the cache
-                        if fill_cache:
-                            self._read_cache[existing_key] = existing_value
-
-                        bin_storage[existing_key] = existing_value
-
-                results.append(bin_storage.get(key))
-            else:
-                results.append(cached)
+                if index is None:
+                    index = self._ensure_index(f)
+                entry = index.get(key)
+                if entry is not None:
+                    cached = _read_at(f.fileno(), entry[1], entry[0]).decode("utf-8")
+                    self._read_cache[key] = cached
+            results.append(cached)
 
         return results
 
@@ -816,3 +1387,93 @@ class SimpleBinaryStorage(SimpleStorageMedium):
             all_data[key] = value
 
         return [all_data.get(key) for key in keys]
+
+
+class BatchedStorage:
+    """
+    A write-behind wrapper around any storage medium.
+
+    Stores are merged into an in-memory buffer (later stores of a key win) and handed to the wrapped
+    storage in a single store() call, so a burst of stores takes the file lock only once. The buffer is
+    flushed once it holds `max_pending` keys, on the first store after `max_delay` seconds since the
+    last flush, on flush() and when leaving the context manager. Retrieves see pending items.
+    """
+
+    def __init__(
+        self,
+        storage: StorageMedium | SimpleStorageMedium,
+        max_pending: int = 1000,
+        max_delay: float | None = 1.0,
+    ) -> None:
+        """
+        :param storage: The storage medium to write to.
+        :param max_pending: The amount of pending keys that triggers a flush.
+        :param max_delay: The seconds after the last flush after which a store flushes, None to disable.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.storage: StorageMedium | SimpleStorageMedium = storage
+        self.max_pending: int = max_pending
+        self.max_delay: float | None = max_delay
+        self._pending: dict[str, str] = {}
+        self._last_flush: float = time.monotonic()
+        self._lock: _RLock = _RLock()
+
+    def store(self, items: dict[str, str]) -> None:
+        """
+        Buffer the items, flushing them if a threshold is reached.
+
+        :param items: A dictionary with items to be stored.
+        """
+        with self._lock:
+            self._pending |= items
+            if len(self._pending) >= self.max_pending or (
+                self.max_delay is not None
+                and time.monotonic() - self._last_flush >= self.max_delay
+            ):
+                self.flush()
+
+    def retrieve(self, keys: list[str]) -> list[str | None]:
+        """
+        Retrieve the data stored under the specified keys, preferring pending items.
+
+        :param keys: The keys associated with the data.
+        :return: The retrieved data or None if the key doesn't exist.
+        """
+        with self._lock:
+            pending = self._pending
+            missing = [key for key in keys if key not in pending]
+            if not missing:
+                return [pending[key] for key in keys]
+            stored = dict(zip(missing, self.storage.retrieve(missing)))
+            return [pending[key] if key in pending else stored[key] for key in keys]
+
+    def flush(self) -> None:
+        """
+        Write all pending items to the wrapped storage in one store() call.
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            items, self._pending = self._pending, {}
+            try:
+                self.storage.store(items)
+            except BaseException:
+                self._pending = items | self._pending
+                raise
+
+    def pending(self) -> int:
+        """Returns the amount of keys waiting to be written."""
+        return len(self._pending)
+
+    def filepath(self) -> str:
+        """Returns the filepath of the wrapped storage."""
+        return self.storage.filepath()
+
+    def __enter__(self) -> _te.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.flush()
+        return False
@@ -26,6 +26,26 @@ def test_float_encoding_decoding() -> None:
             assert pytest.approx(decoded, rel=1e-5) == value
 
 
+@pytest.mark.parametrize("precision", ["single", "double"])
+def test_float_array_encoding_decoding(precision: str) -> None:
+    values = [0.0, 1.0, -3.14, 123456.789, float("inf")] + [x / 7 for x in range(1000)]
+    encoded = encode_floats(values, precision)
+    assert encoded == b"".join(encode_float(value, precision) for value in values)
+    decoded = decode_floats(encoded, precision)
+    assert list(decoded) == [decode_float(encode_float(value, precision), precision) for value in values]
+    with pytest.raises(ValueError):
+        decode_floats(encoded[:-1], precision)
+
+
+def test_float_quad_precision() -> None:
+    try:
+        encoded = encode_floats([1.5, -2.25], "quad")
+    except ValueError:
+        pytest.skip("No IEEE 754 binary128 floats on this system")
+    assert len(encoded) == 32
+    assert list(decode_floats(encoded, "quad")) == [1.5, -2.25]
+
+
 @pytest.mark.parametrize(
     "val, negatives, will_panic",
     [
@@ -92,6 +112,36 @@ def test_varint_eof() -> None:
         read_varint_length(io.BytesIO(b""))  # No data
 
 
+def test_batch_varints() -> None:
+    numbers = [0, 1, 127, 128, 255, 300, 16384, 2**32 - 1, 2**63 - 1, 2**64 - 1]
+    numbers += [(x * 2654435761) % (1 << (x % 64)) for x in range(1000)]
+    encoded = encode_varints(numbers)
+    assert encoded == b"".join(to_varint_length(num) for num in numbers)
+    assert list(decode_varints(encoded)) == numbers
+    assert list(decode_varints(memoryview(encoded), 5)) == numbers[:5]
+    assert decode_varints(encode_varints([2**70, 1])) == [2**70, 1]
+    with pytest.raises(EOFError):
+        decode_varints(encoded + b"\x80")
+    with pytest.raises(ValueError):
+        encode_varints([1, -1])
+
+
+def test_iter_variable_bytes_like() -> None:
+    records = [bytes(range(x % 256)) * (x // 256 + 1) for x in range(0, 2000, 37)]
+    data = b"".join(get_variable_bytes_like(record) for record in records)
+    assert [bytes(record) for record in iter_variable_bytes_like(data)] == records
+    with pytest.raises(EOFError):
+        list(iter_variable_bytes_like(data[:-1]))
+
+
+def test_batch_progressive_lengths() -> None:
+    lengths = [0, 1, 2, 255, 256, 10_000, 2**40]
+    encoded = encode_progressive_lengths(lengths)
+    assert encoded == b"".join(to_progressive_length(length) for length in lengths)
+    assert decode_progressive_lengths(encoded) == lengths
+    assert decode_progressive_lengths(encoded, 3) == lengths[:3]
+
+
 # @pytest.mark.filterwarnings("ignore:to_progressive_length ran out of buffer space")
 def test_progressive_encoding() -> None:
     # with pytest.warns(RuntimeWarning):
@@ -142,6 +192,65 @@ def test_bitbuffer_get_multiple() -> None:
     assert buffer.get_multiple(4, 2) == [3, 3, 0, 0]
 
 
+@pytest.mark.parametrize("bit_count", [1, 7, 13, 22, 57, 64, 100])
+def test_bitbuffer_get_array(bit_count: int) -> None:
+    values = [(x * 2654435761) % (1 << bit_count) for x in range(1000)]
+    packed = 0b101  # 3 leading bits that are not part of the run
+    for value in values:
+        packed = (packed << bit_count) | value
+    total_bits = 3 + len(values) * bit_count
+    byte_count = (total_bits + 7) // 8
+    packed <<= byte_count * 8 - total_bits
+
+    buffer = BitBuffer()
+    buffer.read(io.BytesIO(packed.to_bytes(byte_count, "big")), byte_count)
+    assert buffer.get(3) == 0b101
+    assert list(buffer.get_array(len(values), bit_count)) == values
+
+
+@pytest.mark.parametrize("bit_count", [1, 7, 13, 22, 64, 100])
+def test_bitwriter_roundtrip(bit_count: int) -> None:
+    values = [(x * 2654435761) % (1 << bit_count) for x in range(1000)]
+    writer = BitWriter(buffer_size=64)
+    writer.write(0b101, 3)
+    writer.write_multiple(values, bit_count)
+    writer.align()
+    writer.write_bytes(b"end")
+    data = writer.getvalue()
+
+    buffer = BitBuffer()
+    buffer.read(io.BytesIO(data), len(data))
+    assert buffer.get(3) == 0b101
+    assert buffer.get_multiple(len(values), bit_count) == values
+    buffer.disregard()
+    assert buffer.get(24) == int.from_bytes(b"end", "big")
+
+
+def test_bitbuffer_wraps_source_without_copy() -> None:
+    data = bytearray(b"\xab\xcd\xef")
+    buffer = BitBuffer(memoryview(data))
+    data[0] = 0x12  # The buffer sees changes, so nothing was copied
+    assert buffer.get(8) == 0x12
+    buffer.read(io.BytesIO(b"\x01"), 1)  # Switches to an owned buffer holding the unread rest
+    assert buffer.get_multiple(3, 8) == [0xCD, 0xEF, 0x01]
+
+
+def test_bitbuffer_streaming_compaction() -> None:
+    values = [(x * 2654435761) % (1 << 12) for x in range(100_000)]
+    writer = BitWriter()
+    writer.write_multiple(values, 12)
+    stream = io.BytesIO(writer.getvalue())
+
+    buffer = BitBuffer()
+    result: list[int] = []
+    while len(result) < len(values):
+        buffer.read(stream, 3000)
+        count = min(buffer.available_bits() // 12, len(values) - len(result))
+        result.extend(buffer.get_multiple(count, 12))
+    assert result == values
+    assert len(buffer._array) < 16 * 3000  # Capacity stays bounded by the unread part
+
+
 def test_bitbuffer_disregard_specific() -> None:
     buffer = BitBuffer()
     buffer.read(io.BytesIO(b"\xaa"), 1)  # 0b10101010
@@ -195,6 +304,142 @@ def test_save_and_load_roundtrip() -> None:
         os.remove(path)
 
 
+def test_parallel_load() -> None:
+    s = CNumStorage()
+    for bit_count in (3, 17, 40, 70):
+        s.add_numbers_unorganized([(x * 2654435761) % (1 << bit_count) for x in range(2000)])
+    s.set_transform(1, "delta")
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = tmp.name
+
+    try:
+        s.save(path)
+        loaded = CNumStorage()
+        loaded.load(path, workers=3)
+        assert loaded == s
+        assert loaded.get_groups() == s.get_groups()
+    finally:
+        os.remove(path)
+
+
+def test_open_mmap_random_access() -> None:
+    numbers = [x * 37 % 5000 for x in range(3000)] + [0, 0] + [2**40 + x for x in range(50)]
+    s = CNumStorage()
+    s.add_numbers_unorganized(numbers[:3000])
+    s.add_numbers(numbers[3000:])
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = tmp.name
+
+    try:
+        s.save(path)
+        with CNumStorage.open_mmap(path) as view:
+            assert len(view) == len(numbers)
+            assert view[0] == numbers[0]
+            assert view[2999] == numbers[2999]
+            assert view[-1] == numbers[-1]
+            assert view[2990:3010] == numbers[2990:3010]
+            assert view[::-7] == numbers[::-7]
+            assert list(view) == numbers
+            with pytest.raises(IndexError):
+                view[len(numbers)]
+    finally:
+        os.remove(path)
+
+
+def test_write_stream_and_iter_numbers() -> None:
+    numbers = [(x * 7919) % (1 << (x % 30)) for x in range(20_000)]
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = tmp.name
+
+    try:
+        CNumStorage.write_stream(path, iter(numbers), chunk=3000)
+        chunks = list(CNumStorage.iter_numbers(path, chunk=1000))
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert [x for chunk in chunks for x in chunk] == numbers
+
+        s = CNumStorage()
+        s.load(path)
+        assert s.get_numbers_list() == numbers
+    finally:
+        os.remove(path)
+
+
+@pytest.mark.parametrize("transform", ["zigzag", "delta", "for", "auto"])
+def test_transforms_roundtrip(transform: str) -> None:
+    timestamps = [1_700_000_000_000 + x * 1000 + (x * 7919) % 13 for x in range(5000)]
+    signed = [(x * 7919) % 2001 - 1000 for x in range(5000)]
+    s = CNumStorage()
+    s.add_numbers_unorganized(timestamps, transform=transform)
+    s.add_numbers_unorganized(signed, transform=transform)
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = tmp.name
+
+    try:
+        s.save(path)
+        loaded = CNumStorage()
+        loaded.load(path)
+        assert loaded.get_numbers_list() == timestamps + signed
+        assert [x for chunk in CNumStorage.iter_numbers(path, chunk=999) for x in chunk] == timestamps + signed
+        with CNumStorage.open_mmap(path) as view:
+            assert view[4321] == timestamps[4321]
+            assert view[-1] == signed[-1]
+            assert view[4990:5010] == (timestamps + signed)[4990:5010]
+    finally:
+        os.remove(path)
+
+
+def test_delta_transform_shrinks_sorted_numbers() -> None:
+    ids = list(range(10**9, 10**9 + 3 * 10_000, 3))
+    raw, transformed = CNumStorage(), CNumStorage()
+    raw.add_numbers_unorganized(ids)
+    transformed.add_numbers_unorganized(ids)
+    transformed.optimize_transforms()
+    assert transformed.get_groups()[0][0] < raw.get_groups()[0][0] // 5
+    assert len(_saved_bytes(transformed)) < len(_saved_bytes(raw)) // 5
+    with pytest.raises(ValueError):
+        transformed.set_transform(0, "rle")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("strategy", ["greedy", "optimal"])
+def test_merge_groups_with_mixed_transforms(strategy: str) -> None:
+    s = CNumStorage()
+    s.add_numbers([1, 2, 3])
+    s.add_numbers_unorganized([1000, 1001, 1002], transform="for")
+    s.add_numbers_unorganized([-2, 5, -7], transform="auto")
+    s.adjust_groups(1, strategy=strategy)
+    assert len(s.get_groups()) == 1
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = tmp.name
+
+    try:
+        s.save(path)
+        expected = [1, 2, 3, 1000, 1001, 1002, -2, 5, -7]
+        assert [x for chunk in CNumStorage.iter_numbers(path) for x in chunk] == expected
+        loaded = CNumStorage()
+        loaded.load(path)
+        assert loaded.get_numbers_list() == expected
+    finally:
+        os.remove(path)
+
+
+def test_create_optimal_groups_keeps_transforms() -> None:
+    ids = list(range(10**9, 10**9 + 3 * 10_000, 3))
+    s = CNumStorage()
+    s.add_numbers_unorganized(ids, transform="delta")
+    s.add_numbers_unorganized([-5, 3, -2], transform="zigzag")
+    size = len(_saved_bytes(s))
+    s.create_optimal_groups()
+    assert len(_saved_bytes(s)) <= size * 2
+    loaded = CNumStorage()
+    loaded.read_from(io.BytesIO(_saved_bytes(s)))
+    assert loaded.get_numbers_list() == ids + [-5, 3, -2]
+
+
 def test_unorganized_add() -> None:
     s = CNumStorage()
     s.add_numbers_unorganized([1, 128, 2])
@@ -202,6 +447,21 @@ def test_unorganized_add() -> None:
     assert nums == [1, 128, 2]
 
 
+def test_typed_group_storage() -> None:
+    s = CNumStorage()
+    s.add_numbers([1, 1, 200, 70000, 2**40, 2**70, -3])
+    containers = [s.get_numbers()[idx] for _, idx in s.get_groups()]
+    assert [getattr(group, "itemsize", None) for group in containers] == [1, 1, 4, 8, None, 1]
+    s.merge_groups(0, 1)  # Widens the merged group instead of overflowing
+    s.merge_groups(0, 1)
+    assert s.get_numbers_list() == [1, 1, 200, 70000, 2**40, 2**70, -3]
+
+    other = CNumStorage()
+    other.add_numbers_unorganized([1, 1, 200, 70000, 2**40])
+    other.add_numbers([2**70, -3])
+    assert s == other
+
+
 def test_merge_groups_behavior() -> None:
     s = CNumStorage()
     s.add_numbers([1, 2])
@@ -226,6 +486,32 @@ def test_adjust_groups() -> None:
     assert len(s.get_groups()) <= 2
 
 
+def _saved_bytes(s: CNumStorage) -> bytes:
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = tmp.name
+    try:
+        s.save(path)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def test_adjust_groups_optimal() -> None:
+    numbers = [x % 8 for x in range(500)] + [2**30, 2**30 + 1] + [x % 4 for x in range(500)]
+    greedy, optimal = CNumStorage(), CNumStorage()
+    for s in (greedy, optimal):
+        for i in range(0, len(numbers), 20):
+            s.add_numbers_unorganized(numbers[i:i + 20])
+    greedy.adjust_groups(max_group_count=3)
+    optimal.adjust_groups(max_group_count=3, strategy="optimal")
+    assert len(optimal.get_groups()) <= 3
+    assert optimal.get_numbers_list() == numbers
+    assert len(_saved_bytes(optimal)) <= len(_saved_bytes(greedy))
+    with pytest.raises(ValueError):
+        optimal.adjust_groups(strategy="fastest")  # type: ignore[arg-type]
+
+
 def test_eq_and_debug() -> None:
     a = CNumStorage()
     b = CNumStorage()
@@ -247,6 +533,18 @@ def test_set_bits() -> None:
 def test_bits() -> None:
     assert bits(b"\x01\x02") == ["00000001", "00000010"]
     assert bits(b"\xff", return_str=True) == "11111111"
+    assert bits(b"\x00\x01") == ["00000000", "00000001"]  # Leading zero bytes are kept
+    assert bits(memoryview(b"\x00\x80"), return_str=True) == "0000000010000000"
+
+
+def test_set_bits_in_place() -> None:
+    data = bytearray(4)
+    view = memoryview(data)
+    assert set_bits(view, 6, "1011", return_bytearray=True) is view
+    assert bits(data, return_str=True) == "00000010" + "11000000" + "0" * 16
+    assert set_bits(b"\x00", 1, "110", "little") == bytes([0b00000110])
+    with pytest.raises(IndexError):
+        set_bits(view, 30, "111")
 
 
 def test_nice_bits() -> None:
@@ -255,7 +553,128 @@ def test_nice_bits() -> None:
     assert nice_bits(b"\x41", to_chars=True) == "01000001  A          "
 
 
+@pytest.mark.parametrize("bit_width", [1, 5, 12, 20, 64])
+def test_packed_int_array(bit_width: int) -> None:
+    values = [(i * 2654435761) & ((1 << bit_width) - 1) for i in range(100)]
+    packed = PackedIntArray(bit_width, values)
+    assert len(packed) == 100
+    assert packed.nbytes == (100 * bit_width + 7) // 8
+    assert packed[7] == values[7] and packed[-1] == values[-1]
+    packed[3] = values[3] = 1
+    assert packed[10:20].tolist() == values[10:20]
+    assert packed[::-3].tolist() == values[::-3]
+    packed[5:8] = values[5:8] = [0, 1, 0]
+    packed[40:50] = values[40:50] = [1]
+    del packed[::4]
+    del values[::4]
+    packed.append(1)
+    values.append(1)
+    assert list(packed) == values
+    copy = PackedIntArray(bit_width)
+    copy.frombytes(packed.tobytes(), len(packed))
+    assert copy == packed
+    with pytest.raises(OverflowError):
+        packed.append(1 << bit_width)
+    with pytest.raises(IndexError):
+        packed[len(values)]
+
+
+def test_packed_int_array_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    values = np.arange(5000) % 4096
+    packed = PackedIntArray.from_numpy(values)
+    assert packed.bit_width == 12
+    assert packed.nbytes == 7500
+    result = packed.to_numpy()
+    assert result.dtype == np.uint16
+    assert (result == values).all()
+
+
+def test_column_store() -> None:
+    timestamps = [1_700_000_000 + i * 3 for i in range(1000)]
+    ids = [(i * 7919) % 1000 for i in range(1000)]
+    deltas = [i % 7 - 3 for i in range(1000)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.bin")
+        ColumnStore.write(path, {"ts": timestamps, "id": ids, "delta": deltas}, row_group_size=100)
+        with ColumnStore(path) as store:
+            assert len(store) == 1000
+            assert store.columns == ["ts", "id", "delta"]
+            assert store.read() == {"ts": timestamps, "id": ids, "delta": deltas}
+            assert len(store.get_statistics()) == 10
+            assert store.get_statistics()[1]["ts"] == (timestamps[100], timestamps[199])
+            low, high = timestamps[250], timestamps[420]
+            result = store.read(["id"], where={"ts": (low, high), "delta": (0, None)})
+            assert result["id"] == [
+                ids[i] for i in range(1000) if low <= timestamps[i] <= high and deltas[i] >= 0
+            ]
+            assert store.read(where={"ts": (None, 0)}) == {"ts": [], "id": [], "delta": []}
+            with pytest.raises(KeyError):
+                store.read(["missing"])
+
+
+def test_binary_filer_roundtrip() -> None:
+    filer = BinaryFiler.configure(
+        {
+            "frame": KnownType(uint8, access=ACCESS(5)),
+            "weight": UnknownType([UnknownType(int)], access=ACCESS(10)),
+            "users": KnownType(fixed_array(8, uint8), access=ACCESS(0)),
+            "name": UnknownType(str, access=ACCESS(3)),
+            "samples": UnknownType([uint16], access=ACCESS(7)),
+        }
+    )
+    assert filer.fields == ["users", "name", "frame", "samples", "weight"]
+    assert filer.fixed_size is None
+    records = [
+        {
+            "frame": i,
+            "weight": list(range(-i, i * 100, 37)),
+            "users": tuple(range(i, i + 8)),
+            "name": "user \u00e9" * i,
+            "samples": [i, 65535],
+        }
+        for i in range(20)
+    ]
+    assert filer.decode(filer.encode(records[3])) == records[3]
+    data = filer.encode_many(records)
+    assert filer.decode_many(data) == records
+    assert filer.decode_many(data, fields=["name", "users"])[4] == {
+        "name": records[4]["name"],
+        "users": records[4]["users"],
+    }
+    with pytest.raises(ValueError):
+        ACCESS(-1)
+    with pytest.raises(TypeError):
+        KnownType(str)
+
+
+def test_binary_filer_fixed_records() -> None:
+    filer = BinaryFiler({"a": KnownType(uint32), "b": KnownType(int16), "c": KnownType(float64)})
+    assert filer.fixed_size == 14
+    records = [{"a": i, "b": -i, "c": i / 4} for i in range(100)]
+    data = filer.encode_many(records)
+    assert len(data) == 1400
+    assert filer.decode_many(data) == records
+    result = filer.benchmark(records[:10], repeat=1)
+    assert result["binaryfiler"]["size"] == 140
+    assert set(result) == {"binaryfiler", "pickle", "json"}
+
+
 def test_human_readables() -> None:
     assert bytes_to_human_readable_binary_iec(1024) == "1.00 KiB"
     assert bytes_to_human_readable_decimal_si(1000) == "1.00 kB"
     assert bits_to_human_readable(8192) == "8.19 Kbps"
+
+
+def test_human_readables_many() -> None:
+    sizes = [0, 1023, 1024, 1536, 10**6, 2**63 - 1, 2.5, float("inf")]
+    assert bytes_to_human_readable_binary_iec_many(sizes) == [
+        bytes_to_human_readable_binary_iec(size) for size in sizes
+    ]
+    assert bytes_to_human_readable_decimal_si_many(sizes) == [
+        bytes_to_human_readable_decimal_si(size) for size in sizes
+    ]
+    assert bits_to_human_readable_many(iter(sizes)) == [
+        bits_to_human_readable(size) for size in sizes
+    ]
+    assert bytes_to_human_readable_binary_iec_many([]) == []
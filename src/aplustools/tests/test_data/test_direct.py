@@ -3,6 +3,9 @@
 from ...data._direct import *
 import pytest
 
+import json
+import io
+
 # Standard typing imports for aps
 import typing_extensions as _te
 import collections.abc as _a
@@ -49,11 +52,37 @@ def test_gen_map() -> None:
 )
 def test_sorters(unsorted: list[int | str], sorted_: list[int | str]) -> None:
     for sorter_str in dir(Sorters):
-        if sorter_str.startswith("_"):
+        if sorter_str.startswith("_") or sorter_str in ("argsort", "benchmark"):
             continue
+        if sorter_str == "radix_sort" and not all(isinstance(x, int) for x in unsorted):
+            continue  # Integers only
         assert getattr(Sorters, sorter_str)(unsorted) == sorted_
 
 
+def test_sorters_large_inputs() -> None:
+    data = [(i * 7919) % 1000 - 500 for i in range(3000)]
+    for sorter_str in ("quick_sort", "intro_sort", "tim_sort", "radix_sort", "numpy_sort"):
+        assert getattr(Sorters, sorter_str)(data) == sorted(data)
+    ordered = list(range(20_000))
+    assert Sorters.quick_sort(ordered) == ordered  # Used to exceed the recursion limit
+    assert Sorters.tim_sort(ordered[::-1]) == ordered
+    assert [data[i] for i in Sorters.argsort(data)] == sorted(data)
+    in_place = data.copy()
+    assert Sorters.sort(in_place, "intro", in_place=True) is in_place
+    assert in_place == sorted(data)
+    for lossy in ([2 ** 60 + 1, 2 ** 60, 0.5], [-1, 2 ** 63 + 1, 2 ** 63]):  # Would be rounded to float64
+        assert Sorters.numpy_sort(lossy) == sorted(lossy)
+        assert [lossy[i] for i in Sorters.argsort(lossy)] == sorted(lossy)
+    with pytest.raises(TypeError):
+        Sorters.radix_sort([1.5])
+
+
+def test_sorters_benchmark() -> None:
+    result = Sorters.benchmark(sizes=(50,), distributions=("random", "sorted"), repeat=1)
+    assert set(result) == {"random", "sorted"}
+    assert {"builtin", "intro", "bubble"} <= set(result["random"][50])
+
+
 class _NonString:
     def __str__(self) -> str:
         raise Exception
@@ -67,6 +96,32 @@ def test_beautify_json():
         beautify_json({"1": _NonString()})
 
 
+def test_dump_beautified_json() -> None:
+    data = {"a": [1, 2.5, None, "x"], "b": [[1], {"c": True}], "d": {}, "e": [], 3: "ü"}
+    buffer = io.StringIO()
+    dump_beautified_json(data, buffer)
+    assert buffer.getvalue() == beautify_json(data)
+    assert buffer.getvalue() == (
+        "{\n"
+        '    "a": [1, 2.5, null, "x"],\n'
+        '    "b": [\n'
+        "        [1],\n"
+        "        {\n"
+        '            "c": true\n'
+        "        }\n"
+        "    ],\n"
+        '    "d": {},\n'
+        '    "e": [],\n'
+        '    "3": "\\u00fc"\n'
+        "}"
+    )
+    assert json.loads(buffer.getvalue())["3"] == "ü"
+    circular: list = []
+    circular.append(circular)
+    with pytest.raises(ValueError):
+        beautify_json({"x": circular})
+
+
 @pytest.mark.parametrize(
     "reduce, min_, max_, expected", [(100, 10, 20, 20), (100, 100, 200, 100)]
 )
@@ -121,18 +176,47 @@ def test_stdlist() -> None:
     assert lst.get(1001, int) == 0
 
 
+@pytest.mark.parametrize("list_type", [StdList, SlottedStdList])
+def test_stdlist_slices(list_type: type[StdList]) -> None:
+    lst = list_type(int, [1, 2, 3])
+    assert lst[2:8:2] == (3, 0, 0)
+    assert len(lst) == 7  # Expanded once to the last index
+    lst[5:15] = 9
+    assert lst[4:16] == (0,) + (9,) * 10 + (0,)
+    lst[10:4:-3] = (1, 2)
+    assert (lst[10], lst[7]) == (1, 2)
+    with pytest.raises(ValueError):
+        lst[0:3] = (1, 2)
+    with pytest.raises(IndexError):
+        list_type(None, [1])[0:5]
+    assert not hasattr(SlottedStdList(int), "__dict__")
+
+
 def test_unnest_iterable() -> None:
     lst = [[[[[[1], 2], 3]], 4], 5]
     assert unnest_iterable(lst, max_depth=4) == [[1], 2, 3, 4, 5]
     assert unnest_iterable(lst, max_depth=5) == [1, 2, 3, 4, 5]
 
 
+def test_iter_unnest() -> None:
+    deep: list = [1]
+    for _ in range(10_000):  # Far beyond the recursion limit
+        deep = [deep, 2]
+    flattened = iter_unnest(deep, max_depth=20_000)
+    assert next(flattened) == 1
+    assert sum(1 for _ in flattened) == 10_000
+    assert list(iter_unnest(([1, [2]], 3), max_depth=1)) == [1, [2], 3]
+
+
 def test_cutoff_iterable() -> None:
     lst = [x for x in range(12_000)]
     assert (
         cutoff_iterable(lst, 7_500, 3, 0, True)
         == "[..[7500].., 7500, 7501, 7502, 7503, ..[4496]..]"
     )
+    assert cutoff_iterable(set(range(100_000)), 1, 1, 1) == "{0, 1, 2, ...}"
+    assert cutoff_iterable({"a": 1, "b": 2}, 0, 0) == "{a: 1, ...}"
+    assert cutoff_iterable((), 0) == "()"
 
 
 def test_cutoff_string() -> None:
@@ -1,6 +1,10 @@
 """TBA"""
 
 import tempfile
+import json
+import threading
+import sqlite3
+import gc
 import os
 
 from ...data.storage import *
@@ -69,3 +73,235 @@ def test_storages(
             gc.collect()
             time.sleep(0.1)
             os.remove(filepath)
+        if os.path.exists(filepath + ".gen"):
+            os.remove(filepath + ".gen")
+
+
+def test_binary_storage_log() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "storage.bin")
+        store = BinaryStorage(filepath, min_compaction_size=256)
+
+        # Stores only append to the log
+        store.store({"a": "1", "b": "2"})
+        size = os.path.getsize(filepath)
+        store.store({"c": "3"})
+        assert os.path.getsize(filepath) == size + 10
+
+        # Superseded records get compacted away once there are enough of them
+        for i in range(100):
+            store.store({"a": str(i) * 4})
+        assert os.path.getsize(filepath) < 256 * 2
+        assert store.retrieve(["a", "b", "c", "d"]) == ["99" * 4, "2", "3", None]
+
+        # A second instance sees the writes of the first and vice versa
+        other = BinaryStorage(filepath, use_sidecar_index=False)
+        assert other.retrieve(["a", "c"]) == ["99" * 4, "3"]
+        other.store({"c": "other"})
+        assert store.retrieve(["c"]) == ["other"]
+
+        store.compact()
+        live = sum(8 + len(k) + len(v) for k, v in (("a", "99" * 4), ("b", "2"), ("c", "other")))
+        assert os.path.getsize(filepath) == 1 + live
+
+        # The sidecar index is used on reopen and ignored once it is stale
+        store.close()
+        assert os.path.exists(filepath + ".idx")
+        reopened = BinaryStorage(filepath)
+        assert reopened.retrieve(["a", "b", "c"]) == ["99" * 4, "2", "other"]
+        other.store({"b": "changed"})
+        assert BinaryStorage(filepath).retrieve(["b"]) == ["changed"]
+
+
+@pytest.mark.parametrize("pool", ["thread", "shared"])
+def test_sqlite3_storage_pool(pool: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "storage.db")
+        store = SQLite3Storage(
+            filepath,
+            use_wal_journal_mode=True,
+            pool=pool,
+            pool_size=2,
+            pragmas={"synchronous": "NORMAL", "cache_size": -2000},
+        )
+        errors = []
+        opened = len(store._connections)
+
+        def _worker(n: int) -> None:
+            try:
+                for i in range(50):
+                    store.store({f"{n}-{i}": str(i)})
+                    assert store.retrieve([f"{n}-{i}", "missing"]) == [str(i), None]
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        if pool == "shared":
+            assert len(store._connections) <= 2
+        else:
+            # The connections of finished threads are released
+            del threads, thread
+            gc.collect()
+            assert len(store._connections) == opened
+
+        # Connections are reopened after closing the pool
+        store.close()
+        assert store.retrieve(["0-49", "3-0"]) == ["49", "0"]
+
+        # A connection that is checked out while the pool gets closed is not put into the new pool
+        with store._connection(filepath, write=False) as conn:
+            store.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        with store._connection(filepath, write=False) as other:
+            assert other is not conn
+            other.execute("SELECT 1")
+        store.close()
+
+        # Closing the pool wakes up checkouts that wait for a free connection
+        store = SQLite3Storage(filepath, pool="shared", pool_size=1)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(store.retrieve(["0-0"])))
+        with store._connection(filepath, write=False):
+            waiter.start()
+            waiter.join(0.1)
+            assert waiter.is_alive()  # The only connection is checked out
+            store.close()
+            waiter.join(5)
+            assert not waiter.is_alive()
+        assert results == [["0"]]
+        store.close()
+
+    with pytest.raises(ValueError):
+        SQLite3Storage(filepath, pool="process")
+    with pytest.raises(ValueError):
+        SQLite3Storage(filepath, pragmas={"synchronous": "OFF; DROP TABLE storage"})
+
+
+def test_json_storage_batched() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "storage.json")
+        store = JSONStorage(filepath, flush_every=3)
+        other = JSONStorage(filepath)
+
+        # Pending stores are visible locally but not written yet
+        store.store({"a": "1"})
+        store.store({"b": "2"})
+        assert store.retrieve(["a", "b"]) == ["1", "2"]
+        assert other.retrieve(["a", "b"]) == [None, None]
+
+        # Writes of other instances are merged with the pending items on flush
+        other.store({"c": "3"})
+        store.store({"a": "changed"})
+        assert other.retrieve(["a", "b", "c"]) == ["changed", "2", "3"]
+        assert store.retrieve(["c"]) == ["3"]
+
+        store.store({"d": "4"})
+        store.flush()
+        assert other.retrieve(["d"]) == ["4"]
+        assert sorted(os.listdir(tmp_dir)) == ["storage.json", "storage.json.gen"]
+
+        with open(filepath, "rb") as f:
+            assert json.loads(f.read()[1:]) == {"a": "changed", "b": "2", "c": "3", "d": "4"}
+
+        # Pending items are flushed when leaving the context manager and on close()
+        batched = JSONStorage(filepath, flush_every=None)
+        with batched:
+            batched.store({"e": "5"})
+            assert other.retrieve(["e"]) == [None]
+        assert other.retrieve(["e"]) == ["5"]
+        batched.store({"f": "6"})
+        batched.close()
+        assert other.retrieve(["e", "f"]) == ["5", "6"]
+        assert batched.retrieve(["f"]) == ["6"]
+
+        # Flushing without pending items restarts the count
+        batched = JSONStorage(filepath, flush_every=2)
+        batched.store({})
+        batched.flush()
+        batched.store({"g": "7"})
+        assert other.retrieve(["g"]) == [None]
+        batched.store({"h": "8"})
+        assert other.retrieve(["g", "h"]) == ["7", "8"]
+
+        # Where open files can't be replaced (Windows) the file is rewritten in place
+        batched._replace_atomically = False
+        batched.store({"i": "9"})
+        batched.store({"a": "again"})
+        assert other.retrieve(["a", "i"]) == ["again", "9"]
+        assert sorted(os.listdir(tmp_dir)) == ["storage.json", "storage.json.gen"]
+
+
+@pytest.mark.parametrize(
+    "storage_cls", [JSONStorage, BinaryStorage, SQLite3Storage, SimpleBinaryStorage]
+)
+def test_batched_storage(storage_cls: _ty.Type[StorageMedium | SimpleStorageMedium]) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "storage")
+        storage = storage_cls(filepath)
+        storage.store({"a": "0"})
+
+        with BatchedStorage(storage, max_pending=3, max_delay=None) as batched:
+            batched.store({"a": "1", "b": "1"})
+            batched.store({"a": "2"})
+            assert batched.pending() == 2
+            assert batched.retrieve(["a", "b", "c"]) == ["2", "1", None]
+            assert storage.retrieve(["a", "b"]) == ["0", None]
+
+            # Reaching max_pending commits everything at once
+            batched.store({"c": "1"})
+            assert batched.pending() == 0
+            assert storage.retrieve(["a", "b", "c"]) == ["2", "1", "1"]
+
+            batched.store({"d": "1"})
+            assert storage.retrieve(["d"]) == [None]
+        assert storage.retrieve(["d"]) == ["1"]
+
+
+def test_storage_generation_stamps() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "storage.bin")
+        reader = BinaryStorage(filepath)
+        writer = BinaryStorage(filepath)
+        keys = [f"key{i}" for i in range(64)]
+        writer.store({key: "0" for key in keys})
+        assert reader.retrieve(keys) == ["0"] * 64
+
+        # Only the cached keys sharing a bucket with the changed key get evicted
+        writer.store({"key0": "1"})
+        assert reader.retrieve(["key0"]) == ["1"]
+        bucket = reader._bucket("key0")
+        assert {key for key in keys if reader._bucket(key) != bucket} <= set(reader._read_cache)
+
+        # The generation doesn't wrap around like the version byte does
+        for i in range(256):
+            writer.store({"key1": str(i)})
+        assert reader._current_version == writer._current_version
+        assert reader.retrieve(["key1", "key2"]) == ["255", "0"]
+        assert reader._generation == writer._generation == 258
+
+
+def test_binary_storage_foreign_appends() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "storage.bin")
+        reader = BinaryStorage(filepath, max_cache_size=1)
+        writer = BinaryStorage(filepath, max_cache_size=1)
+        writer.store({f"key{i}": str(i) for i in range(100)})
+
+        # Appends of other instances only extend the index
+        assert reader.retrieve(["key1"]) == ["1"]
+        index = reader._index
+        writer.store({"key1": "changed", "new": "1"})
+        assert reader.retrieve(["key1", "new", "key2"]) == ["changed", "1", "2"]
+        assert reader._index is index
+
+        # A compaction moves the records, which makes the other instances rebuild their index
+        writer.compact()
+        writer.store({"key3": "after"})
+        assert reader.retrieve(["key1", "key3", "key99"]) == ["changed", "after", "99"]
+        assert reader._index is not index